@@ -2,9 +2,30 @@
 Load and manage strategy configuration from JSON file.
 """
 import json
+import os
 from pathlib import Path
 from typing import Dict, Any
 
+try:
+    import orjson
+except ImportError:  # Optional; stdlib json is used when it isn't installed
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to indented JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _loads(data):
+    """Parse JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class StrategyConfig:
     """Handles loading and accessing strategy configuration"""
     
@@ -13,6 +34,7 @@ class StrategyConfig:
             config_path = Path(__file__).parent / "strategy_config.json"
         
         self.config_path = config_path
+        self._mtime_ns = None  # Modification time of the file as last read or written
         self.config = self._load_config()
         
     def _load_config(self) -> Dict[str, Any]:
@@ -38,18 +60,31 @@ class StrategyConfig:
                 "default_contracts": 1
             }
             
-            with open(self.config_path, 'w') as f:
-                json.dump(default_config, f, indent=2)
+            with open(self.config_path, 'wb') as f:
+                f.write(_dumps(default_config))
+            self._mtime_ns = os.stat(self.config_path).st_mtime_ns
             
             return default_config
         
-        with open(self.config_path, 'r') as f:
-            return json.load(f)
+        with open(self.config_path, 'rb') as f:
+            self._mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+            return _loads(f.read())
     
     def reload(self):
         """Reload configuration from file"""
         self.config = self._load_config()
     
+    def reload_if_changed(self) -> bool:
+        """Reload configuration only if the file changed since it was last read or written"""
+        try:
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime_ns = None
+        if mtime_ns == self._mtime_ns:
+            return False
+        self.reload()
+        return True
+    
     def get_enabled_symbols(self) -> list:
         """Get list of enabled symbols"""
         return [
@@ -109,8 +144,8 @@ class StrategyConfig:
         symbol_rolling = symbol_config.get("rolling", {})
         return symbol_rolling.get("strategy", "forward")
     
-    def update_symbol(self, symbol: str, enabled: bool = None, contracts: int = None):
-        """Update symbol configuration"""
+    def update_symbol(self, symbol: str, enabled: bool = None, contracts: int = None, save: bool = True):
+        """Update symbol configuration, writing it to file unless save is False"""
         if symbol not in self.config["symbols"]:
             self.config["symbols"][symbol] = {}
         
@@ -119,12 +154,20 @@ class StrategyConfig:
         if contracts is not None:
             self.config["symbols"][symbol]["contracts"] = contracts
         
-        self.save()
+        if save:
+            self.save()
     
     def save(self):
-        """Save current configuration to file"""
-        with open(self.config_path, 'w') as f:
-            json.dump(self.config, f, indent=2)
+        """Save current configuration to file, flushed through to disk"""
+        with open(self.config_path, 'wb') as f:
+            f.write(_dumps(self.config))
+            f.flush()
+            os.fsync(f.fileno())
+        self._mtime_ns = os.stat(self.config_path).st_mtime_ns
+    
+    def to_json(self) -> str:
+        """Current configuration as indented JSON text"""
+        return _dumps(self.config).decode()
     
     def __repr__(self):
         return f"StrategyConfig(symbols={len(self.get_enabled_symbols())}, allocation={self.get_balance_allocation():.0%})"
\ No newline at end of file
@@ -9,6 +9,7 @@ EXPIRATION_MAX = _filters['expiration_max_days']
 from .user_agent_mixin import UserAgentMixin 
 from .retry_decorator import retry_on_failure, CircuitBreaker, RetryException
 from alpaca.trading.client import TradingClient
+from alpaca.trading.stream import TradingStream
 from alpaca.data.historical.option import OptionHistoricalDataClient
 from alpaca.data.historical.stock import StockHistoricalDataClient, StockLatestTradeRequest
 from alpaca.data.requests import OptionSnapshotRequest
@@ -39,6 +40,9 @@ class OptionHistoricalDataClientSigned(UserAgentMixin, OptionHistoricalDataClien
 
 class BrokerClient:
     def __init__(self, api_key, secret_key, paper=True):
+        self._api_key = api_key
+        self._secret_key = secret_key
+        self.paper = paper
         self.trade_client = TradingClientSigned(api_key=api_key, secret_key=secret_key, paper=paper)
         self.trading_client = self.trade_client  # Alias for backward compatibility
         self.stock_client = StockHistoricalDataClientSigned(api_key=api_key, secret_key=secret_key)
@@ -51,6 +55,10 @@ class BrokerClient:
             'options': CircuitBreaker(failure_threshold=5, recovery_timeout=30)
         }
 
+    def create_trade_stream(self) -> TradingStream:
+        """Create a trade updates websocket stream using this client's credentials."""
+        return TradingStream(self._api_key, self._secret_key, paper=self.paper)
+
     @retry_on_failure(max_attempts=3, exceptions=API_EXCEPTIONS)
     def get_positions(self):
         """Get all positions with retry logic."""
@@ -83,18 +91,22 @@ class BrokerClient:
             logger.error(f"Failed to get account: {str(e)}")
             raise
     
-    def get_non_margin_buying_power(self) -> float:
-        """Get the non-marginable buying power (cash available for trading) with validation."""
-        account = self.get_account()
+    def get_non_margin_buying_power(self, account=None) -> float:
+        """Get the non-marginable buying power (cash available for trading) with validation.
+        Pass an account already fetched this cycle to skip another request."""
+        if account is None:
+            account = self.get_account()
         # Use non_marginable_buying_power for cash-secured strategies
         buying_power = float(account.non_marginable_buying_power)
         if buying_power < 0:
             raise ValueError(f"Invalid buying power: {buying_power}")
         return buying_power
     
-    def get_options_buying_power(self) -> float:
-        """Get the buying power available for options trading."""
-        account = self.get_account()
+    def get_options_buying_power(self, account=None) -> float:
+        """Get the buying power available for options trading.
+        Pass an account already fetched this cycle to skip another request."""
+        if account is None:
+            account = self.get_account()
         # Use options_buying_power which accounts for existing positions
         buying_power = float(account.options_buying_power)
         if buying_power < 0:
@@ -47,9 +47,18 @@ class WheelDatabase:
             logger.warning(f"Could not enable WAL mode: {str(e)}")
     
     @contextmanager
-    def get_connection(self, max_retries=3):
-        """Thread-safe context manager for database connections with retry logic."""
-        conn = None
+    def get_connection(self, max_retries=3, read_only=False):
+        """Thread-safe context manager for database connections with retry logic.
+        
+        With read_only=True the transaction is deferred, so it reads from a WAL
+        snapshot without taking the write lock other connections need.
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and conn.in_transaction:
+            # Nested use joins the open transaction; the outermost block commits or rolls back
+            yield conn
+            return
+        
         attempt = 0
         last_exception = None
         
@@ -60,16 +69,22 @@ class WheelDatabase:
                     self._local.conn = sqlite3.connect(
                         str(self.db_path),
                         timeout=self.timeout,
-                        check_same_thread=False
+                        check_same_thread=False,
+                        # Room for every query shape, including the optional-filter
+                        # variants, so repeated calls skip re-preparing their SQL
+                        cached_statements=256
                     )
                     self._local.conn.row_factory = sqlite3.Row
                     self._local.conn.execute("PRAGMA journal_mode=WAL")
+                    # In WAL mode NORMAL only syncs at checkpoints; commits stay
+                    # durable across application crashes, not OS crashes or power loss
+                    self._local.conn.execute("PRAGMA synchronous=NORMAL")
                     self._local.conn.execute("PRAGMA busy_timeout=5000")
                 
                 conn = self._local.conn
                 
                 # Begin transaction
-                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("BEGIN" if read_only else "BEGIN IMMEDIATE")
                 
                 try:
                     yield conn
@@ -185,6 +200,7 @@ class WheelDatabase:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_symbol ON positions(symbol)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_positions_status ON positions(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_premiums_symbol ON premiums(symbol)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_premiums_date ON premiums(trade_date)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_history_symbol ON trade_history(symbol)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_trade_history_date ON trade_history(trade_date)")
     
@@ -252,6 +268,39 @@ class WheelDatabase:
                 logger.error(f"Failed to add position for {symbol}: {str(e)}")
                 raise
     
+    def add_positions_bulk(self, positions: List[Dict[str, Any]]) -> int:
+        """
+        Add several new open positions in a single transaction.
+        
+        Unlike add_position this does not look for an existing open position,
+        so callers pass only positions that are not tracked yet.
+        
+        Args:
+            positions: List of dicts using the same keys as add_position's arguments
+            
+        Returns:
+            Number of positions inserted
+        """
+        if not positions:
+            return 0
+        
+        now = datetime.now()
+        rows = [
+            (p['symbol'], p['position_type'], p['quantity'], p['entry_price'], p.get('entry_date') or now)
+            for p in positions
+        ]
+        
+        with self._lock:
+            with self.get_connection() as conn:
+                conn.executemany("""
+                    INSERT INTO positions 
+                    (symbol, position_type, quantity, entry_price, entry_date, status)
+                    VALUES (?, ?, ?, ?, ?, 'open')
+                """, rows)
+        
+        logger.debug(f"Added {len(rows)} positions")
+        return len(rows)
+    
     def close_position(self, position_id, exit_price, exit_date=None, status='closed'):
         """Close an existing position"""
         if exit_date is None:
@@ -359,7 +408,7 @@ class WheelDatabase:
             return []
     
     def get_position_history(self, symbol=None, position_type=None, status=None):
-        """Get position history with optional filters"""
+        """Get position history with optional filters; status may be one status or an iterable of them"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
@@ -372,38 +421,68 @@ class WheelDatabase:
             if position_type:
                 query += " AND position_type = ?"
                 params.append(position_type)
-            if status:
+            if isinstance(status, str):
                 query += " AND status = ?"
                 params.append(status)
+            elif status:
+                statuses = list(status)
+                query += f" AND status IN ({','.join('?' * len(statuses))})"
+                params.extend(statuses)
             
             query += " ORDER BY entry_date DESC"
             
             cursor.execute(query, params)
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_open_symbols(self, position_type) -> set:
+        """Get the set of symbols with an open position of the given type"""
+        with self.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT DISTINCT symbol FROM positions WHERE position_type = ? AND status = 'open'",
+                (position_type,)
+            )
+            return {row[0] for row in cursor.fetchall()}
+    
+    @staticmethod
+    def _premium_filters(symbol=None, option_type=None, days_back=None):
+        """Build the WHERE clause and parameters shared by the premium queries"""
+        query = " WHERE 1=1"
+        params = []
+        
+        if symbol:
+            query += " AND symbol = ?"
+            params.append(symbol)
+        if option_type:
+            query += " AND option_type = ?"
+            params.append(option_type)
+        if days_back:
+            query += " AND trade_date >= datetime('now', '-' || ? || ' days')"
+            params.append(days_back)
+        
+        return query, params
+    
     def get_premium_history(self, symbol=None, option_type=None, days_back=None):
         """Get premium history with optional filters"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
             
-            query = "SELECT * FROM premiums WHERE 1=1"
-            params = []
-            
-            if symbol:
-                query += " AND symbol = ?"
-                params.append(symbol)
-            if option_type:
-                query += " AND option_type = ?"
-                params.append(option_type)
-            if days_back:
-                query += " AND trade_date >= datetime('now', '-' || ? || ' days')"
-                params.append(days_back)
-            
-            query += " ORDER BY trade_date DESC"
-            
-            cursor.execute(query, params)
+            where, params = self._premium_filters(symbol, option_type, days_back)
+            cursor.execute("SELECT * FROM premiums" + where + " ORDER BY trade_date DESC", params)
             return [dict(row) for row in cursor.fetchall()]
     
+    def get_premium_totals(self, symbol=None, days_back=None) -> Dict[str, float]:
+        """Sum premium x contracts for puts and for calls, filtered like get_premium_history"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            where, params = self._premium_filters(symbol, None, days_back)
+            cursor.execute("""
+                SELECT 
+                    TOTAL(CASE WHEN option_type = 'P' THEN premium_collected * contracts END) as total_puts,
+                    TOTAL(CASE WHEN option_type = 'P' THEN NULL ELSE premium_collected * contracts END) as total_calls
+                FROM premiums""" + where, params)
+            return dict(cursor.fetchone())
+    
     def add_trade(self, symbol, trade_type, quantity, price, strike_price=None,
                   expiration_date=None, premium=None, trade_date=None, notes=None):
         """Add a trade to the history"""
@@ -422,6 +501,95 @@ class WheelDatabase:
             
             return cursor.lastrowid
     
+    def add_trades_bulk(self, trades: List[Dict[str, Any]]) -> int:
+        """
+        Add several trades to the history in a single transaction.
+        
+        Args:
+            trades: List of dicts using the same keys as add_trade's arguments
+            
+        Returns:
+            Number of trades inserted
+        """
+        if not trades:
+            return 0
+        
+        now = datetime.now()
+        rows = [
+            (t['symbol'], t['trade_type'], t['quantity'], t['price'], t.get('strike_price'),
+             t.get('expiration_date'), t.get('premium'), t.get('trade_date') or now, t.get('notes'))
+            for t in trades
+        ]
+        
+        with self.get_connection() as conn:
+            conn.executemany("""
+                INSERT INTO trade_history 
+                (symbol, trade_type, quantity, price, strike_price, 
+                 expiration_date, premium, trade_date, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        
+        return len(rows)
+    
+    def add_roll(self, close_trade: Dict[str, Any], premium: Dict[str, Any],
+                 open_trade: Dict[str, Any]) -> int:
+        """
+        Record a roll in a single transaction: the buy to close, the premium
+        collected on the new option, and the sell to open.
+        
+        Args:
+            close_trade: Closing trade, using the same keys as add_trade's arguments
+            premium: New option's premium, using the same keys as add_premium's arguments
+            open_trade: Opening trade, using the same keys as add_trade's arguments
+            
+        Returns:
+            Row id of the premium record
+        """
+        now = datetime.now()
+        trade_rows = [
+            (t['symbol'], t['trade_type'], t['quantity'], t['price'], t.get('strike_price'),
+             t.get('expiration_date'), t.get('premium'), t.get('trade_date') or now, t.get('notes'))
+            for t in (close_trade, open_trade)
+        ]
+        
+        with self._lock:
+            try:
+                with self.get_connection() as conn:
+                    cursor = conn.cursor()
+                    cursor.execute("""
+                        INSERT INTO trade_history 
+                        (symbol, trade_type, quantity, price, strike_price, 
+                         expiration_date, premium, trade_date, notes)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, trade_rows[0])
+                    cursor.execute("""
+                        INSERT INTO premiums 
+                        (symbol, option_type, strike_price, premium_collected, contracts, 
+                         expiration_date, trade_date, status, notes)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (premium['symbol'], premium['option_type'], premium['strike_price'],
+                          premium['premium'], premium.get('contracts', 1),
+                          premium.get('expiration_date'), premium.get('trade_date') or now,
+                          premium.get('status', 'collected'), premium.get('notes')))
+                    row_id = cursor.lastrowid
+                    cursor.execute("""
+                        INSERT INTO trade_history 
+                        (symbol, trade_type, quantity, price, strike_price, 
+                         expiration_date, premium, trade_date, notes)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, trade_rows[1])
+                
+                # Only call premiums count towards the cost basis
+                if premium['option_type'] == 'C':
+                    self.update_cost_basis(premium['symbol'])
+                
+                logger.debug(f"Recorded roll for {premium['symbol']}: ${premium['premium']:.2f}")
+                return row_id
+                
+            except Exception as e:
+                logger.error(f"Failed to record roll for {premium['symbol']}: {str(e)}")
+                raise
+    
     def get_summary_stats(self, symbol=None) -> Optional[Dict[str, Any]]:
         """Get summary statistics for the wheel strategy with error handling."""
         try:
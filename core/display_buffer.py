@@ -0,0 +1,92 @@
+"""
+Buffered terminal output for the multi-line displays.
+"""
+
+import logging
+import threading
+
+
+class DisplayBuffer:
+    """
+    Collect the records logged by display functions on this thread and emit
+    them in one write and flush per handler when the block exits, instead of
+    one per line.
+
+    Records are captured by a filter on each logger, so logging from other
+    threads passes straight through. A nested buffer hands its records to the
+    enclosing one, which writes everything in order when it exits.
+
+    Usage:
+        with DisplayBuffer(elite_display.logger):
+            display_positions_elite(...)
+            display_strategy_matrix(...)
+    """
+    
+    # Buffers open on each thread, innermost last
+    _active = threading.local()
+    
+    def __init__(self, *loggers: logging.Logger):
+        self.loggers = loggers
+        self.records = []
+        self._owner = None
+    
+    @classmethod
+    def _stack(cls) -> list:
+        stack = getattr(cls._active, 'stack', None)
+        if stack is None:
+            stack = cls._active.stack = []
+        return stack
+    
+    def __enter__(self):
+        self._owner = threading.get_ident()
+        self._stack().append(self)
+        for lg in self.loggers:
+            lg.addFilter(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        for lg in self.loggers:
+            lg.removeFilter(self)
+        stack = self._stack()
+        stack.remove(self)
+        if stack:
+            stack[-1].records.extend(self.records)
+            self.records = []
+        else:
+            self.flush()
+        return False
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Logger filter: hold back this thread's records, let other threads' through"""
+        if threading.get_ident() != self._owner:
+            return True
+        # The innermost open buffer keeps records in the order they were logged
+        self._stack()[-1].records.append(record)
+        return False
+    
+    def flush(self):
+        """Write the buffered records to each handler that would have received them"""
+        batches = {}
+        for record in self.records:
+            current = logging.getLogger(record.name)
+            while current:
+                for handler in current.handlers:
+                    if record.levelno >= handler.level:
+                        batches.setdefault(handler, []).append(record)
+                current = current.parent if current.propagate else None
+        self.records = []
+        
+        for handler, records in batches.items():
+            stream = getattr(handler, 'stream', None)
+            if stream is None:
+                for record in records:
+                    handler.handle(record)
+                continue
+            try:
+                text = "".join(handler.format(r) + handler.terminator
+                               for r in records if handler.filter(r))
+                with handler.lock:
+                    stream.write(text)
+                    handler.flush()
+            except Exception:
+                handler.handleError(records[0])
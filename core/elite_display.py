@@ -3,14 +3,24 @@ Elite professional trading terminal display.
 """
 
 import logging
+import time
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from alpaca.trading.enums import AssetClass
 from tabulate import tabulate
+from .utils import parse_option_symbol, parse_option_expiration
 import os
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+# Divider rules are static, so build them once and emit them together
+# with their section title instead of as separate log records
+_RULE78 = "─" * 78
+_RULE74 = "  " + "─" * 74
+
+# Pending order age bars, indexed by number of filled cells (0-10)
+_PROGRESS10 = tuple("█" * i + "░" * (10 - i) for i in range(11))
+
 
 def get_timestamp():
     """Get current timestamp in market time"""
@@ -44,36 +54,48 @@ def format_percentage(value: float, show_sign: bool = True) -> str:
     return f"{value:.2f}%"
 
 
-def parse_option_symbol(symbol: str) -> tuple:
-    """Parse option symbol to extract components"""
-    if len(symbol) < 15:
-        return symbol, None, None
+def summarize_positions(positions: List[Any]) -> Dict[str, Any]:
+    """Compute position totals without rendering anything"""
+    total_pl = 0
+    total_value = 0
+    option_count = 0
+    stock_count = 0
     
-    for i, char in enumerate(symbol):
-        if char.isdigit():
-            underlying = symbol[:i]
-            rest = symbol[i:]
-            if len(rest) >= 15:
-                option_type = rest[6]
-                strike_str = rest[7:]
-                strike = float(strike_str) / 1000
-                return underlying, option_type, strike
-    return symbol, None, None
+    for p in positions:
+        if p.asset_class == AssetClass.US_OPTION:
+            qty = abs(int(p.qty))
+            avg_price = abs(float(p.avg_entry_price))
+            current_price = abs(float(p.current_price)) if p.current_price else avg_price
+            total_pl += (avg_price - current_price) * qty * 100
+            total_value += abs(float(p.market_value))
+            option_count += 1
+        elif p.asset_class == AssetClass.US_EQUITY:
+            total_pl += float(p.unrealized_pl) if p.unrealized_pl else 0
+            total_value += float(p.market_value)
+            stock_count += 1
+    
+    return {
+        'total_pl': total_pl,
+        'total_value': total_value,
+        'option_count': option_count,
+        'stock_count': stock_count
+    }
 
 
 def print_elite_header():
     """Print elite header with timestamp"""
     timestamp = get_timestamp()
-    logger.info("")
-    logger.info("┌" + "─" * 78 + "┐")
-    logger.info(f"│ WHEELFORGE PROFESSIONAL │ {timestamp:>50} │")
-    logger.info("└" + "─" * 78 + "┘")
+    logger.info(f"\n┌{_RULE78}┐\n"
+                f"│ WHEELFORGE PROFESSIONAL │ {timestamp:>50} │\n"
+                f"└{_RULE78}┘")
 
 
 def display_market_overview(account, balance: float, allocated: float, 
                            buying_power: float, portfolio_value: float,
                            allocation_pct: float):
     """Display market overview dashboard"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
     # Calculate metrics
     daily_pl = 0
@@ -90,9 +112,7 @@ def display_market_overview(account, balance: float, allocated: float,
     # Calculate utilization
     utilization = ((portfolio_value - balance) / portfolio_value * 100) if portfolio_value > 0 else 0
     
-    logger.info("")
-    logger.info("PORTFOLIO OVERVIEW")
-    logger.info("─" * 78)
+    logger.info(f"\nPORTFOLIO OVERVIEW\n{_RULE78}")
     
     # First row - key metrics
     logger.info(f"Net Value: {format_currency(portfolio_value):>15}  │  "
@@ -108,74 +128,81 @@ def display_market_overview(account, balance: float, allocated: float,
 def display_positions_elite(positions: List[Any], states: Dict[str, Any], 
                            position_counts: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """Display positions in elite format"""
+    # Callers still need the totals when the rendered output would be dropped
+    if not logger.isEnabledFor(logging.INFO):
+        return summarize_positions(positions)
     
     if not positions:
-        logger.info("")
-        logger.info("POSITIONS")
-        logger.info("─" * 78)
-        logger.info("No active positions")
+        logger.info(f"\nPOSITIONS\n{_RULE78}\nNo active positions")
         return {'total_pl': 0, 'total_value': 0, 'option_count': 0, 'stock_count': 0}
     
-    # Separate and sort positions
-    option_positions = []
-    stock_positions = []
+    # Separate positions, parsing each option symbol once for both sorting and display
+    # Both lists are sized for the worst case up front and trimmed afterwards
+    n = len(positions)
+    option_rows = [None] * n  # (underlying, strike, option_type, position)
+    stock_positions = [None] * n
+    oi = si = 0
     
     for p in positions:
         if p.asset_class == AssetClass.US_EQUITY:
-            stock_positions.append(p)
+            stock_positions[si] = p
+            si += 1
         elif p.asset_class == AssetClass.US_OPTION:
-            option_positions.append(p)
+            try:
+                underlying, option_type, strike = parse_option_symbol(p.symbol)
+            except ValueError:
+                # Not an OCC symbol; show the row unparsed
+                underlying, option_type, strike = p.symbol, None, None
+            option_rows[oi] = (underlying, strike or 0, option_type, p)
+            oi += 1
+    
+    del option_rows[oi:]
+    del stock_positions[si:]
     
     # Sort options by underlying and strike
-    option_positions.sort(key=lambda x: (parse_option_symbol(x.symbol)[0], parse_option_symbol(x.symbol)[2] or 0))
+    option_rows.sort(key=lambda r: (r[0], r[1]))
     
     total_pl = 0
     total_value = 0
     
-    logger.info("")
-    logger.info("ACTIVE POSITIONS")
-    logger.info("─" * 78)
+    logger.info(f"\nACTIVE POSITIONS\n{_RULE78}")
     
-    if option_positions:
+    if option_rows:
         # Group by underlying
         current_underlying = None
+        today = date.today()
         
-        for p in option_positions:
-            qty = int(p.qty)
+        for underlying, strike, option_type, p in option_rows:
+            qty = abs(int(p.qty))
             symbol = p.symbol
-            underlying, option_type, strike = parse_option_symbol(symbol)
             
             # Print underlying header if changed
             if underlying != current_underlying:
-                if current_underlying is not None:
-                    logger.info("")  # Space between symbols
-                logger.info(f"  {underlying}")
-                logger.info("  " + "─" * 74)
+                # Blank line between symbols
+                spacer = "\n" if current_underlying is not None else ""
+                logger.info(f"{spacer}  {underlying}\n{_RULE74}")
                 current_underlying = underlying
             
             avg_price = abs(float(p.avg_entry_price))
             current_price = abs(float(p.current_price)) if p.current_price else avg_price
             market_value = abs(float(p.market_value))
             # For SHORT options: profit when price goes down
-            unrealized_pl = (avg_price - current_price) * abs(qty) * 100
-            pl_pct = (unrealized_pl / (avg_price * abs(qty) * 100) * 100) if avg_price > 0 and qty != 0 else 0
+            unrealized_pl = (avg_price - current_price) * qty * 100
+            pl_pct = (unrealized_pl / (avg_price * qty * 100) * 100) if avg_price > 0 and qty != 0 else 0
             
             # Format based on option type
             opt_type = "PUT" if option_type == 'P' else "CALL"
             
             # Calculate days to expiration
-            # Extract date from symbol (format: AAPL241231P00150000)
-            date_str = symbol[len(underlying):len(underlying)+6]
             try:
-                exp_date = datetime.strptime(date_str, "%y%m%d")
-                dte = (exp_date.date() - datetime.now().date()).days
+                dte = (parse_option_expiration(symbol) - today).days
                 dte_str = f"{dte}d"
-            except:
+            except ValueError:
                 dte_str = "N/A"
             
             # Format the line
             logger.info(f"    {opt_type:>4} ${strike:>6.0f}  │  "
-                       f"Qty: {abs(qty):>2}  │  "
+                       f"Qty: {qty:>2}  │  "
                        f"Entry: ${avg_price:>5.2f}  │  "
                        f"Mark: ${current_price:>5.2f}  │  "
                        f"Value: {format_currency(market_value):>9}  │  "
@@ -186,9 +213,7 @@ def display_positions_elite(positions: List[Any], states: Dict[str, Any],
             total_value += market_value
     
     if stock_positions:
-        logger.info("")
-        logger.info("  SHARES")
-        logger.info("  " + "─" * 74)
+        logger.info(f"\n  SHARES\n{_RULE74}")
         
         for p in stock_positions:
             qty = int(p.qty)
@@ -198,8 +223,8 @@ def display_positions_elite(positions: List[Any], states: Dict[str, Any],
             unrealized_pl = float(p.unrealized_pl) if p.unrealized_pl else 0
             pl_pct = (unrealized_pl / (avg_price * qty) * 100) if avg_price > 0 and qty > 0 else 0
             
-            state = states.get(p.symbol, {})
-            status = state.get('type', 'holding').replace('_', ' ').upper()
+            state = states.get(p.symbol)
+            status = (state.type if state else 'holding').replace('_', ' ').upper()
             
             logger.info(f"  {p.symbol:>6}  │  "
                        f"Qty: {qty:>4}  │  "
@@ -213,14 +238,14 @@ def display_positions_elite(positions: List[Any], states: Dict[str, Any],
             total_value += market_value
     
     # Summary footer
-    logger.info("  " + "─" * 74)
-    logger.info(f"  TOTAL: {format_currency(total_value):>12}  │  "
+    logger.info(f"{_RULE74}\n"
+                f"  TOTAL: {format_currency(total_value):>12}  │  "
                 f"P&L: {format_currency(total_pl, show_sign=True):>12} ({format_percentage(total_pl/total_value*100 if total_value > 0 else 0):>7})")
     
     return {
         'total_pl': total_pl,
         'total_value': total_value,
-        'option_count': len(option_positions),
+        'option_count': len(option_rows),
         'stock_count': len(stock_positions)
     }
 
@@ -229,13 +254,12 @@ def display_strategy_matrix(position_counts: Dict[str, Dict[str, int]],
                            states: Dict[str, Any], max_layers: int, 
                            allowed_symbols: List[str]):
     """Display strategy status matrix"""
-    logger.info("")
-    logger.info("STRATEGY MATRIX")
-    logger.info("─" * 78)
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
-    # Header
-    logger.info(f"  {'Symbol':<8} │ {'State':<12} │ {'Layers':<8} │ {'Puts':>5} │ {'Calls':>6} │ {'Shares':>7} │ {'Action':<20}")
-    logger.info("  " + "─" * 74)
+    logger.info(f"\nSTRATEGY MATRIX\n{_RULE78}\n"
+                f"  {'Symbol':<8} │ {'State':<12} │ {'Layers':<8} │ {'Puts':>5} │ {'Calls':>6} │ {'Shares':>7} │ {'Action':<20}\n"
+                f"{_RULE74}")
     
     # Get all symbols from config
     from config.credentials import strategy_config
@@ -243,7 +267,7 @@ def display_strategy_matrix(position_counts: Dict[str, Dict[str, int]],
     
     for symbol in sorted(all_symbols):
         counts = position_counts.get(symbol, {'puts': 0, 'calls': 0, 'shares': 0})
-        state = states.get(symbol, {})
+        state = states.get(symbol)
         
         puts = counts.get('puts', 0)
         calls = counts.get('calls', 0)
@@ -251,7 +275,7 @@ def display_strategy_matrix(position_counts: Dict[str, Dict[str, int]],
         
         # Determine state
         if puts > 0 or calls > 0 or shares > 0:
-            wheel_state = state.get('type', 'idle').replace('_', ' ').upper()[:12]
+            wheel_state = (state.type if state else 'idle').replace('_', ' ').upper()[:12]
         else:
             wheel_state = "IDLE"
         
@@ -279,57 +303,59 @@ def display_strategy_matrix(position_counts: Dict[str, Dict[str, int]],
 
 def display_performance_dashboard(db):
     """Display performance metrics dashboard"""
-    if not db:
+    if not db or not logger.isEnabledFor(logging.INFO):
+        return
+    
+    summary = db.get_summary_stats()
+    if not summary:
         return
     
     try:
-        summary = db.get_summary_stats()
-        if not summary:
-            return
+        put_premiums = summary['total_put_premiums']
+        call_premiums = summary['total_call_premiums']
+        put_trades = summary['put_trades']
+        call_trades = summary['call_trades']
         
-        logger.info("")
-        logger.info("PERFORMANCE ANALYTICS")
-        logger.info("─" * 78)
-        
-        total_premiums = summary['total_put_premiums'] + summary['total_call_premiums']
-        total_trades = summary['put_trades'] + summary['call_trades']
+        total_premiums = put_premiums + call_premiums
+        total_trades = put_trades + call_trades
         avg_premium = total_premiums / total_trades if total_trades > 0 else 0
-        
-        # Calculate additional metrics
-        put_win_rate = (summary['total_put_premiums'] / (summary['put_trades'] * 100)) * 100 if summary['put_trades'] > 0 else 0
-        
-        # Two column layout
-        logger.info(f"  Gross Premiums: {format_currency(total_premiums):>12}     │     "
-                   f"Total Trades:    {total_trades:>6}")
-        logger.info(f"  Put Premiums:   {format_currency(summary['total_put_premiums']):>12}     │     "
-                   f"Put Trades:      {summary['put_trades']:>6}")
-        logger.info(f"  Call Premiums:  {format_currency(summary['total_call_premiums']):>12}     │     "
-                   f"Call Trades:     {summary['call_trades']:>6}")
-        logger.info(f"  Avg Premium:    {format_currency(avg_premium):>12}     │     "
-                   f"Active Symbols:  {summary['symbols_traded']:>6}")
-        
-    except Exception:
-        pass
+    except (KeyError, TypeError):
+        # Premium sums are NULL until the first premium is recorded
+        return
+    
+    # Two column layout
+    logger.info(f"\nPERFORMANCE ANALYTICS\n{_RULE78}\n"
+                f"  Gross Premiums: {format_currency(total_premiums):>12}     │     "
+                f"Total Trades:    {total_trades:>6}\n"
+                f"  Put Premiums:   {format_currency(put_premiums):>12}     │     "
+                f"Put Trades:      {put_trades:>6}\n"
+                f"  Call Premiums:  {format_currency(call_premiums):>12}     │     "
+                f"Call Trades:     {call_trades:>6}\n"
+                f"  Avg Premium:    {format_currency(avg_premium):>12}     │     "
+                f"Active Symbols:  {summary.get('symbols_traded', 0):>6}")
 
 
 def display_pending_orders_elite(order_manager):
     """Display pending orders in elite format"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     pending_orders = order_manager.get_pending_orders()
     
     if not pending_orders:
         return
     
-    logger.info("")
-    logger.info("PENDING ORDERS")
-    logger.info("─" * 78)
+    logger.info(f"\nPENDING ORDERS\n{_RULE78}")
+    
+    now = time.monotonic()
     
     for order in pending_orders:
-        age_seconds = (datetime.now() - order.created_at).total_seconds()
+        age_seconds = now - order.created_at
         time_left = 60 - age_seconds  # Assuming 60 second max
         
         # Progress bar for order age
-        progress = int((age_seconds / 60) * 10)
-        progress_bar = "█" * progress + "░" * (10 - progress)
+        progress = int(age_seconds * (10 / 60))
+        progress_bar = _PROGRESS10[min(max(progress, 0), 10)]
         
         logger.info(f"  {order.underlying:<6} {order.order_type.upper():<4} "
                    f"${order.strike:>6.0f} @ ${order.limit_price:>5.2f}  │  "
@@ -340,9 +366,10 @@ def display_pending_orders_elite(order_manager):
 def display_cycle_summary(actions_taken: List[str], allowed_symbols: List[str], 
                          buying_power: float, cycle_number: int = 0):
     """Display cycle execution summary"""
-    logger.info("")
-    logger.info("EXECUTION SUMMARY")
-    logger.info("─" * 78)
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
+    logger.info(f"\nEXECUTION SUMMARY\n{_RULE78}")
     
     if actions_taken:
         logger.info("  Actions Executed:")
@@ -358,14 +385,19 @@ def display_cycle_summary(actions_taken: List[str], allowed_symbols: List[str],
             logger.info("    • No opportunities meeting criteria")
 
 
+def display_session_complete():
+    """Display the session complete banner shown at shutdown"""
+    logger.info(f"\nSESSION COMPLETE\n{_RULE78}")
+
+
 def display_footer(next_cycle_seconds: int):
     """Display footer with next action"""
-    logger.info("")
-    logger.info("─" * 78)
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
     # Create a simple progress indicator
     bars = int((60 - next_cycle_seconds) / 60 * 20)
     progress = "▓" * bars + "░" * (20 - bars)
     
-    logger.info(f"Next Cycle: {next_cycle_seconds}s [{progress}]  │  System: ACTIVE  │  Ctrl+C to Exit")
-    logger.info("")
\ No newline at end of file
+    logger.info(f"\n{_RULE78}\n"
+                f"Next Cycle: {next_cycle_seconds}s [{progress}]  │  System: ACTIVE  │  Ctrl+C to Exit\n")
\ No newline at end of file
@@ -1,6 +1,6 @@
 import logging
 import datetime
-from .strategy import filter_underlying, filter_options, score_options, select_options
+from .strategy import filter_underlying, filter_options, score_options, filter_and_score_options, select_options
 from .database import WheelDatabase
 from models.contract import Contract
 from config.credentials import strategy_config
@@ -23,13 +23,16 @@ def sell_puts(client, allowed_symbols, buying_power, position_counts=None, db=No
         return
     option_contracts = client.get_options_contracts(filtered_symbols, 'put')
     snapshots = client.get_option_snapshot([c.symbol for c in option_contracts])
-    put_options = filter_options([Contract.from_contract_snapshot(contract, snapshots.get(contract.symbol, None)) for contract in option_contracts if snapshots.get(contract.symbol, None)])
+    put_options, scores = filter_and_score_options([
+        Contract.from_contract_snapshot(contract, snapshot)
+        for contract in option_contracts
+        if (snapshot := snapshots.get(contract.symbol))
+    ])
     if strat_logger:
         strat_logger.log_put_options([p.to_dict() for p in put_options])
     
     if put_options:
         logger.info("Scoring put options...")
-        scores = score_options(put_options)
         put_options = select_options(put_options, scores, max_per_symbol=strategy_config.get_max_wheel_layers(), position_counts=position_counts)
         for p in put_options:
             buying_power -= 100 * p.strike 
@@ -5,7 +5,9 @@ Works with OrderManager to place and manage limit orders.
 
 import logging
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
+from alpaca.trading.enums import OrderStatus
 from .strategy import filter_underlying, filter_options, score_options, select_options
 from .database import WheelDatabase
 from .order_manager import OrderManager
@@ -15,6 +17,9 @@ import numpy as np
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+# Upper bound on concurrent order lookups when recording fills
+MAX_FILL_LOOKUP_WORKERS = 8
+
 
 def sell_puts_limit(client, order_manager: OrderManager, allowed_symbols, buying_power, 
                    position_counts=None, db=None, strat_logger=None) -> List[str]:
@@ -38,6 +43,11 @@ def sell_puts_limit(client, order_manager: OrderManager, allowed_symbols, buying
     
     logger.info("Scoring put options...")
     order_ids = []
+    allowed = set(allowed_symbols)
+    max_layers = strategy_config.get_max_wheel_layers()
+    
+    # Quote every selected contract in one request rather than one per order
+    snapshots = client.get_option_snapshot([p.symbol for p in selected_puts])
     
     for p in selected_puts:
         # Check if we have enough buying power
@@ -54,7 +64,8 @@ def sell_puts_limit(client, order_manager: OrderManager, allowed_symbols, buying
             quantity=1,
             order_type='put',
             underlying=p.underlying,
-            strike=p.strike
+            strike=p.strike,
+            snapshot=snapshots.get(p.symbol)
         )
         
         if order_id:
@@ -84,13 +95,15 @@ def sell_puts_limit(client, order_manager: OrderManager, allowed_symbols, buying
             if position_counts:
                 symbol_positions = position_counts.get(p.underlying, {})
                 put_count = symbol_positions.get('puts', 0) + 1  # Include pending order
-                max_layers = strategy_config.get_max_wheel_layers()
                 
                 if put_count >= max_layers:
                     logger.info(f"Reached max wheel layers for {p.underlying}")
                     # Remove from allowed symbols for next iteration
-                    if p.underlying in allowed_symbols:
-                        allowed_symbols.remove(p.underlying)
+                    allowed.discard(p.underlying)
+    
+    # Callers read allowed_symbols afterwards, so apply removals in place once
+    if len(allowed) != len(allowed_symbols):
+        allowed_symbols[:] = [s for s in allowed_symbols if s in allowed]
     
     return order_ids
 
@@ -184,52 +197,82 @@ def update_filled_orders(order_manager: OrderManager, db: Optional[WheelDatabase
         Dictionary of order statuses
     """
     results = order_manager.update_pending_orders()
+    _record_fills(order_manager, results, db)
+    return results
+
+
+def record_completed_orders(order_manager: OrderManager, db: Optional[WheelDatabase] = None) -> dict:
+    """
+    Record fills the trade updates stream already reported, without
+    repricing or polling the orders still pending. Used at shutdown.
     
-    if db:
-        # Update database for filled orders
-        for order_id, status in results.items():
-            if status == 'filled':
-                # Get the filled order details
-                try:
-                    order = order_manager.client.trade_client.get_order_by_id(order_id)
-                    if order.status == OrderStatus.FILLED:
-                        # Get pending order details
-                        pending = order_manager.pending_orders.get(order_id)
-                        if pending:
-                            # Update database with actual fill price
-                            fill_price = float(order.filled_avg_price)
-                            
-                            # Update the pending record with actual values
-                            if pending.order_type in ['put', 'call']:
-                                option_type = 'P' if pending.order_type == 'put' else 'C'
-                                
-                                # Find and update the pending record
-                                # This is simplified - you might want to track order IDs in the database
-                                logger.info(f"Order {order_id} filled at ${fill_price:.2f} for {pending.symbol}")
-                                
-                                # Add trade record with actual fill price
-                                if pending.order_type == 'put':
-                                    db.add_trade(
-                                        symbol=pending.underlying,
-                                        trade_type='sell_put',
-                                        quantity=1,
-                                        price=fill_price,
-                                        strike_price=pending.strike,
-                                        expiration_date=pending.expiration,
-                                        premium=fill_price
-                                    )
-                                else:
-                                    db.add_trade(
-                                        symbol=pending.underlying,
-                                        trade_type='sell_call',
-                                        quantity=1,
-                                        price=fill_price,
-                                        strike_price=pending.strike,
-                                        expiration_date=pending.expiration,
-                                        premium=fill_price
-                                    )
-                                    
-                except Exception as e:
-                    logger.error(f"Error updating filled order {order_id}: {str(e)}")
-    
-    return results
\ No newline at end of file
+    Returns:
+        Dictionary of order statuses
+    """
+    results = order_manager.collect_completed()
+    _record_fills(order_manager, results, db)
+    return results
+
+
+def _record_fills(order_manager: OrderManager, results: dict, db: Optional[WheelDatabase]):
+    """Add trade records for the filled orders in results"""
+    if not db:
+        return
+    
+    # Orders finalized by update_pending_orders (or the trade updates stream)
+    # are no longer tracked as pending, but their details are kept here
+    completed = order_manager.last_completed
+    filled = [(order_id, completed[order_id]) for order_id, status in results.items()
+              if status == 'filled' and order_id in completed]
+    if not filled:
+        return
+    
+    # Fills pushed by the stream already carry their price; look up the rest
+    # concurrently, since each lookup is an independent round trip
+    lookup_ids = [order_id for order_id, pending in filled if pending.filled_avg_price is None]
+    
+    def fetch_order(order_id):
+        try:
+            return order_manager.client.trade_client.get_order_by_id(order_id)
+        except Exception as e:
+            logger.error(f"Error updating filled order {order_id}: {str(e)}")
+            return None
+    
+    fetched = {}
+    if lookup_ids:
+        with ThreadPoolExecutor(max_workers=min(MAX_FILL_LOOKUP_WORKERS, len(lookup_ids))) as executor:
+            fetched = dict(zip(lookup_ids, executor.map(fetch_order, lookup_ids)))
+    
+    trades = []
+    for order_id, pending in filled:
+        if pending.order_type not in ('put', 'call'):
+            continue
+        
+        fill_price = pending.filled_avg_price
+        if fill_price is None:
+            order = fetched.get(order_id)
+            if order is None or order.status != OrderStatus.FILLED:
+                continue
+            try:
+                fill_price = float(order.filled_avg_price)
+            except (TypeError, ValueError) as e:
+                logger.error(f"Error updating filled order {order_id}: {str(e)}")
+                continue
+        
+        logger.info(f"Order {order_id} filled at ${fill_price:.2f} for {pending.symbol}")
+        
+        # Add trade record with actual fill price
+        trades.append({
+            'symbol': pending.underlying,
+            'trade_type': 'sell_put' if pending.order_type == 'put' else 'sell_call',
+            'quantity': 1,
+            'price': fill_price,
+            'strike_price': pending.strike,
+            'expiration_date': pending.expiration,
+            'premium': fill_price
+        })
+    
+    try:
+        db.add_trades_bulk(trades)
+    except Exception as e:
+        logger.error(f"Error recording {len(trades)} filled order(s): {str(e)}")
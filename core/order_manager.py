@@ -3,18 +3,65 @@ Order management system for limit orders with automatic repricing.
 Tracks pending orders and updates prices periodically to get fills.
 """
 
+import heapq
 import logging
+import sys
+import threading
 import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from alpaca.trading import OrderStatus, OrderSide, OrderType
+from alpaca.trading.enums import TradeEvent
 from alpaca.trading.requests import LimitOrderRequest, ReplaceOrderRequest
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+# Trade update events after which an order no longer needs managing
+TERMINAL_TRADE_EVENTS = frozenset({TradeEvent.FILL, TradeEvent.CANCELED, TradeEvent.EXPIRED, TradeEvent.REJECTED})
 
-@dataclass
+# Polled order statuses after which an order no longer needs managing
+TERMINAL_ORDER_STATUSES = frozenset({OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.EXPIRED})
+
+# Upper bound on concurrent cancel/replace requests, to stay within API rate limits
+MAX_ORDER_WORKERS = 16
+
+# Stream updates kept for orders not (yet) tracked, in case their submit call
+# is still in flight; most belong to orders placed elsewhere
+MAX_UNCLAIMED_UPDATES = 256
+
+# Seconds an option snapshot is reused before it is fetched again
+QUOTE_CACHE_TTL = 0.5
+
+# Repricing moves one tick per attempt, up to half the spread
+_TICK = 0.01
+_HALF = 0.5
+
+
+def _compute_price(side: str, bid: float, ask: float, attempts: int) -> float:
+    """
+    Limit price for a repricing attempt. Gets more aggressive with each
+    attempt: sells move down from the ask toward the bid, buys move up
+    from the bid toward the ask.
+    """
+    adjustment = attempts * _TICK
+    half_spread = (ask - bid) * _HALF
+    if adjustment > half_spread:
+        adjustment = half_spread
+    if side == 'sell':
+        price = ask - adjustment
+        return round(price if price > bid else bid, 2)
+    price = bid + adjustment
+    return round(price if price < ask else ask, 2)
+
+
+# dataclass(slots=True) needs Python 3.10; older versions fall back to a __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class PendingOrder:
     """Tracks a pending limit order"""
     order_id: str
@@ -23,22 +70,23 @@ class PendingOrder:
     quantity: int
     limit_price: float
     target_price: float  # The price we're targeting (bid for sells, ask for buys)
-    created_at: datetime
-    last_updated: datetime
+    created_at: float  # time.monotonic() when submitted
+    last_updated: float  # time.monotonic() when last priced
     order_type: str  # 'put', 'call', 'stock'
     underlying: str
     strike: Optional[float] = None
     expiration: Optional[datetime] = None
     attempts: int = 0
     max_attempts: int = 10  # Maximum repricing attempts before giving up
+    filled_avg_price: Optional[float] = None  # Set once the order is reported filled
     
-    def should_update(self, update_interval: int = 20) -> bool:
-        """Check if order should be repriced based on time interval"""
-        return (datetime.now() - self.last_updated).total_seconds() >= update_interval
-    
-    def is_expired(self, max_age_minutes: int = 1) -> bool:
+    def is_expired(self, now: float, max_age_minutes: int = 1) -> bool:
         """Check if order has been pending too long"""
-        return (datetime.now() - self.created_at).total_seconds() >= max_age_minutes * 60
+        return now - self.created_at >= max_age_minutes * 60
+    
+    def next_check(self, update_interval: int = 20, max_age_minutes: int = 1) -> float:
+        """Monotonic time at which the order is next due for repricing or expiry"""
+        return min(self.last_updated + update_interval, self.created_at + max_age_minutes * 60)
 
 
 class OrderManager:
@@ -58,11 +106,142 @@ class OrderManager:
         self.max_order_age = max_order_age
         self.pending_orders: Dict[str, PendingOrder] = {}
         
+        # (next check time, order ID) on the time.monotonic() clock,
+        # so each update only touches orders that are due for repricing or expiry
+        self._deadline_heap: List[tuple] = []
+        
+        # Recently fetched option snapshots, symbol -> (time.monotonic(), snapshot)
+        self._quote_cache: Dict[str, tuple] = {}
+        
+        # Orders finalized since the last update_pending_orders call, keyed by
+        # order ID, with the status string to report for them
+        self._completed: Dict[str, tuple] = {}
+        # Orders finalized during the most recent update_pending_orders call
+        self.last_completed: Dict[str, PendingOrder] = {}
+        
+        # Terminal stream updates for order IDs we weren't tracking yet
+        self._unclaimed: "OrderedDict[Any, Any]" = OrderedDict()
+        
+        # Guards pending_orders/_completed/_deadline_heap, which the trade updates stream
+        # thread mutates alongside the main loop
+        self._lock = threading.Lock()
+        self._stream = None
+        self._stream_thread: Optional[threading.Thread] = None
+    
+    @property
+    def stream_active(self) -> bool:
+        """Whether order status changes are being pushed by the trade updates stream"""
+        return self._stream_thread is not None and self._stream_thread.is_alive()
+    
+    def start_stream(self) -> bool:
+        """
+        Subscribe to the trade updates stream so fills and cancels are pushed
+        instead of polled. Falls back to polling if the stream can't be started.
+        
+        Returns:
+            True if the stream was started, False otherwise
+        """
+        if self.stream_active:
+            return True
+        
+        try:
+            self._stream = self.client.create_trade_stream()
+            self._stream.subscribe_trade_updates(self._on_trade_update)
+            self._stream_thread = threading.Thread(
+                target=self._stream.run, name="trade-updates", daemon=True
+            )
+            self._stream_thread.start()
+            logger.info("Subscribed to trade updates stream")
+            return True
+        except Exception as e:
+            logger.warning("Could not start trade updates stream, polling order status instead: %s", e)
+            self._stream = None
+            self._stream_thread = None
+            return False
+    
+    def stop_stream(self):
+        """Stop the trade updates stream if it is running"""
+        if self._stream is None:
+            return
+        try:
+            self._stream.stop()
+        except Exception as e:
+            logger.warning("Error stopping trade updates stream: %s", e)
+        self._stream = None
+        self._stream_thread = None
+    
+    async def _on_trade_update(self, data):
+        """Handle a pushed trade update for one of our orders"""
+        event = data.event
+        if event not in TERMINAL_TRADE_EVENTS:
+            return
+        
+        order = data.order
+        # Work out the result before taking the lock, so the stream thread only
+        # holds it for the dictionary updates the main loop contends on
+        result = self._update_result(data)
+        
+        with self._lock:
+            pending = self.pending_orders.pop(order.id, None)
+            if pending is None and order.replaces:
+                # Replacement order reported before _reprice_order re-keyed it
+                pending = self.pending_orders.pop(order.replaces, None)
+            if pending is None:
+                # May be an order whose submit call hasn't returned yet;
+                # _track claims it from here
+                self._unclaimed[order.id] = data
+                while len(self._unclaimed) > MAX_UNCLAIMED_UPDATES:
+                    self._unclaimed.popitem(last=False)
+                return
+            self._complete_from_update(pending, order.id, result)
+        
+        self._log_update(pending, data)
+    
+    @staticmethod
+    def _update_result(data) -> tuple:
+        """Status string and fill price reported by a terminal stream update"""
+        order = data.order
+        if data.event == TradeEvent.FILL:
+            return 'filled', float(order.filled_avg_price) if order.filled_avg_price else None
+        return str(order.status), None
+    
+    def _complete_from_update(self, pending: PendingOrder, order_id: str, result: tuple):
+        """Record an order the stream reported finished. Caller holds the lock."""
+        status, filled_avg_price = result
+        if status == 'filled':
+            pending.filled_avg_price = filled_avg_price
+        self._completed[order_id] = (status, pending)
+    
+    def _log_update(self, pending: PendingOrder, data):
+        """Log an order the stream reported finished"""
+        order = data.order
+        if data.event == TradeEvent.FILL:
+            # The fill may have moved the market, so don't reuse the old quote
+            self._quote_cache.pop(pending.symbol, None)
+            price = pending.filled_avg_price or 0.0
+            logger.info("Order %s filled: %s @ $%.2f", order.id, pending.symbol, price)
+        else:
+            logger.info("Order %s %s: %s", order.id, order.status, pending.symbol)
+    
+    def _track(self, pending: PendingOrder):
+        """Start tracking a submitted order, unless the stream already reported it finished"""
+        with self._lock:
+            data = self._unclaimed.pop(pending.order_id, None)
+            if data is None:
+                self.pending_orders[pending.order_id] = pending
+                self._schedule(pending)
+            else:
+                self._complete_from_update(pending, data.order.id, self._update_result(data))
+        
+        if data is not None:
+            self._log_update(pending, data)
+    
     def submit_limit_sell(self, symbol: str, quantity: int = 1, 
                           price_adjustment: float = 0.0,
                           order_type: str = 'option',
                           underlying: str = None,
-                          strike: float = None) -> Optional[str]:
+                          strike: float = None,
+                          snapshot: Any = None) -> Optional[str]:
         """
         Submit a limit sell order at or near the bid price.
         
@@ -73,20 +252,22 @@ class OrderManager:
             order_type: 'put', 'call', or 'stock'
             underlying: Underlying symbol for options
             strike: Strike price for options
+            snapshot: Option snapshot for symbol if the caller already fetched it
             
         Returns:
             Order ID if successful, None otherwise
         """
         try:
-            # Get current quote
-            snapshot = self.client.get_option_snapshot(symbol)
-            if not snapshot or symbol not in snapshot:
-                logger.error(f"Could not get snapshot for {symbol}")
+            # Get current quote unless the caller already fetched it
+            if snapshot is None:
+                snapshot = self._get_snapshots([symbol]).get(symbol)
+            if not snapshot:
+                logger.error("Could not get snapshot for %s", symbol)
                 return None
                 
-            quote = snapshot[symbol].latest_quote
+            quote = snapshot.latest_quote
             if not quote:
-                logger.error(f"No quote available for {symbol}")
+                logger.error("No quote available for %s", symbol)
                 return None
             
             # For sells, start at the ask (we want to get filled)
@@ -111,6 +292,7 @@ class OrderManager:
             order = self.client.trade_client.submit_order(req)
             
             # Track the order
+            now = time.monotonic()
             pending = PendingOrder(
                 order_id=order.id,
                 symbol=symbol,
@@ -118,25 +300,27 @@ class OrderManager:
                 quantity=quantity,
                 limit_price=limit_price,
                 target_price=bid_price,  # We're targeting the bid for sells
-                created_at=datetime.now(),
-                last_updated=datetime.now(),
+                created_at=now,
+                last_updated=now,
                 order_type=order_type,
                 underlying=underlying or symbol,
                 strike=strike
             )
+            self._track(pending)
             
-            self.pending_orders[order.id] = pending
-            logger.info(f"Limit sell order placed: {symbol} qty={quantity} @ ${limit_price:.2f} (bid: ${bid_price:.2f}, ask: ${ask_price:.2f})")
+            logger.info("Limit sell order placed: %s qty=%d @ $%.2f (bid: $%.2f, ask: $%.2f)",
+                        symbol, quantity, limit_price, bid_price, ask_price)
             
             return order.id
             
         except Exception as e:
-            logger.error(f"Failed to submit limit sell order for {symbol}: {str(e)}")
+            logger.error("Failed to submit limit sell order for %s: %s", symbol, e)
             return None
     
     def submit_limit_buy(self, symbol: str, quantity: int = 1,
                         price_adjustment: float = 0.0,
-                        order_type: str = 'option') -> Optional[str]:
+                        order_type: str = 'option',
+                        snapshot: Any = None) -> Optional[str]:
         """
         Submit a limit buy order at or near the ask price.
         
@@ -145,20 +329,22 @@ class OrderManager:
             quantity: Number of contracts/shares
             price_adjustment: Price adjustment from ask (negative = more aggressive)
             order_type: 'option' or 'stock'
+            snapshot: Option snapshot for symbol if the caller already fetched it
             
         Returns:
             Order ID if successful, None otherwise
         """
         try:
-            # Get current quote
-            snapshot = self.client.get_option_snapshot(symbol)
-            if not snapshot or symbol not in snapshot:
-                logger.error(f"Could not get snapshot for {symbol}")
+            # Get current quote unless the caller already fetched it
+            if snapshot is None:
+                snapshot = self._get_snapshots([symbol]).get(symbol)
+            if not snapshot:
+                logger.error("Could not get snapshot for %s", symbol)
                 return None
                 
-            quote = snapshot[symbol].latest_quote
+            quote = snapshot.latest_quote
             if not quote:
-                logger.error(f"No quote available for {symbol}")
+                logger.error("No quote available for %s", symbol)
                 return None
             
             # For buys, start at the bid (we want to get filled)
@@ -183,6 +369,7 @@ class OrderManager:
             order = self.client.trade_client.submit_order(req)
             
             # Track the order
+            now = time.monotonic()
             pending = PendingOrder(
                 order_id=order.id,
                 symbol=symbol,
@@ -190,19 +377,20 @@ class OrderManager:
                 quantity=quantity,
                 limit_price=limit_price,
                 target_price=ask_price,  # We're targeting the ask for buys
-                created_at=datetime.now(),
-                last_updated=datetime.now(),
+                created_at=now,
+                last_updated=now,
                 order_type=order_type,
                 underlying=symbol
             )
+            self._track(pending)
             
-            self.pending_orders[order.id] = pending
-            logger.info(f"Limit buy order placed: {symbol} qty={quantity} @ ${limit_price:.2f} (bid: ${bid_price:.2f}, ask: ${ask_price:.2f})")
+            logger.info("Limit buy order placed: %s qty=%d @ $%.2f (bid: $%.2f, ask: $%.2f)",
+                        symbol, quantity, limit_price, bid_price, ask_price)
             
             return order.id
             
         except Exception as e:
-            logger.error(f"Failed to submit limit buy order for {symbol}: {str(e)}")
+            logger.error("Failed to submit limit buy order for %s: %s", symbol, e)
             return None
     
     def update_pending_orders(self) -> Dict[str, str]:
@@ -210,94 +398,202 @@ class OrderManager:
         Check and update all pending orders.
         Reprices orders that haven't filled and are due for update.
         
+        When the trade updates stream is running, fills and cancels have
+        already been applied by it, so only expiry and repricing are handled
+        here. Otherwise each order's status is polled. Only orders whose
+        deadline has passed are considered for expiry or repricing.
+        
         Returns:
-            Dictionary of order_id: status
+            Dictionary of order_id: status for orders finalized or updated
         """
-        results = {}
+        results = self.collect_completed()
         
-        for order_id, pending in list(self.pending_orders.items()):
+        with self._lock:
+            to_poll = list(self.pending_orders.items()) if not self.stream_active else []
+        
+        for order_id, pending in to_poll:
             try:
                 # Get current order status
                 order = self.client.trade_client.get_order_by_id(order_id)
-                
-                # Check if filled or cancelled
-                if order.status in [OrderStatus.FILLED, OrderStatus.CANCELED, OrderStatus.EXPIRED]:
-                    if order.status == OrderStatus.FILLED:
-                        logger.info(f"Order {order_id} filled: {pending.symbol} @ ${order.filled_avg_price:.2f}")
-                        results[order_id] = 'filled'
-                    else:
-                        logger.info(f"Order {order_id} {order.status}: {pending.symbol}")
-                        results[order_id] = str(order.status)
-                    
-                    # Remove from tracking
-                    del self.pending_orders[order_id]
-                    continue
-                
-                # Check if order should be cancelled (too old)
-                if pending.is_expired(self.max_order_age):
-                    logger.warning(f"Order {order_id} expired after {self.max_order_age} minutes, cancelling")
-                    self.client.trade_client.cancel_order_by_id(order_id)
-                    del self.pending_orders[order_id]
-                    results[order_id] = 'expired'
+                self._finalize_polled(order_id, pending, order, results)
+            except Exception as e:
+                logger.error("Error updating order %s: %s", order_id, e)
+                results[order_id] = 'error'
+        
+        # Pop every order whose deadline has passed; entries for orders that
+        # are no longer tracked are dropped
+        now = time.monotonic()
+        expired = []
+        due = []
+        with self._lock:
+            while self._deadline_heap and self._deadline_heap[0][0] <= now:
+                _, order_id = heapq.heappop(self._deadline_heap)
+                pending = self.pending_orders.get(order_id)
+                if pending is None:
                     continue
-                
-                # Check if we should update the price
-                if pending.should_update(self.update_interval):
-                    self._reprice_order(order_id, pending)
-                    results[order_id] = 'repriced'
+                if pending.is_expired(now, self.max_order_age):
+                    expired.append((order_id, pending))
                 else:
-                    results[order_id] = 'pending'
-                    
+                    due.append((order_id, pending))
+        
+        if expired:
+            for order_id, _ in expired:
+                logger.warning("Order %s expired after %s minutes, cancelling", order_id, self.max_order_age)
+            errors = self._cancel_orders([order_id for order_id, _ in expired])
+            for order_id, pending in expired:
+                if errors[order_id] is not None:
+                    logger.error("Error updating order %s: %s", order_id, errors[order_id])
+                    # The cancel fails for good if the order already finished and
+                    # the stream missed it, so check its status before retrying
+                    try:
+                        order = self.client.trade_client.get_order_by_id(order_id)
+                        if self._finalize_polled(order_id, pending, order, results):
+                            continue
+                    except Exception as e:
+                        logger.error("Error updating order %s: %s", order_id, e)
+                    results[order_id] = 'error'
+                    # Its deadline has passed, so the cancel is retried on the next call
+                    with self._lock:
+                        self._schedule(pending)
+                    continue
+                with self._lock:
+                    self.pending_orders.pop(order_id, None)
+                self.last_completed[order_id] = pending
+                results[order_id] = 'expired'
+        
+        if due:
+            # Fetch quotes for every order due for repricing in one request
+            symbols = list({pending.symbol for _, pending in due})
+            try:
+                snapshot = self._get_snapshots(symbols)
             except Exception as e:
-                logger.error(f"Error updating order {order_id}: {str(e)}")
-                results[order_id] = 'error'
+                logger.error("Could not get snapshots for repricing: %s", e)
+                snapshot = {}
+            
+            # Send the replace requests concurrently
+            with ThreadPoolExecutor(max_workers=min(MAX_ORDER_WORKERS, len(due))) as executor:
+                repriced = list(executor.map(
+                    lambda item: self._reprice_order(item[0], item[1], snapshot.get(item[1].symbol)),
+                    due
+                ))
+            
+            # Orders that couldn't be repriced keep their old last_updated and
+            # so are due again on the next call; pending.order_id is the
+            # replacement order's ID if it was re-keyed
+            with self._lock:
+                for (order_id, pending), ok in zip(due, repriced):
+                    self._schedule(pending)
+                    results[order_id] = 'repriced' if ok else 'pending'
         
         return results
     
-    def _reprice_order(self, order_id: str, pending: PendingOrder) -> bool:
+    def collect_completed(self) -> Dict[str, str]:
+        """
+        Take the orders the trade updates stream finalized since the last call,
+        without polling or repricing anything. They are kept in last_completed.
+        
+        Returns:
+            Dictionary of order_id: status for the finalized orders
+        """
+        with self._lock:
+            completed, self._completed = self._completed, {}
+        
+        self.last_completed = {order_id: pending for order_id, (_, pending) in completed.items()}
+        return {order_id: status for order_id, (status, _) in completed.items()}
+    
+    def _finalize_polled(self, order_id: str, pending: PendingOrder, order: Any,
+                         results: Dict[str, str]) -> bool:
+        """
+        Stop tracking an order if its polled status is terminal.
+        
+        Returns:
+            True if the order was finalized, False if it is still open
+        """
+        if order.status not in TERMINAL_ORDER_STATUSES:
+            return False
+        
+        if order.status == OrderStatus.FILLED:
+            pending.filled_avg_price = float(order.filled_avg_price)
+            self._quote_cache.pop(pending.symbol, None)
+            logger.info("Order %s filled: %s @ $%.2f", order_id, pending.symbol, pending.filled_avg_price)
+            results[order_id] = 'filled'
+        else:
+            logger.info("Order %s %s: %s", order_id, order.status, pending.symbol)
+            results[order_id] = str(order.status)
+        
+        # Remove from tracking
+        with self._lock:
+            self.pending_orders.pop(order_id, None)
+        self.last_completed[order_id] = pending
+        return True
+    
+    def _get_snapshots(self, symbols: List[str], ttl: float = QUOTE_CACHE_TTL) -> Dict[str, Any]:
+        """
+        Get option snapshots, reusing any fetched within the last ttl seconds.
+        The rest are fetched in a single request.
+        
+        Returns:
+            Dictionary of symbol: snapshot for the symbols that have one
+        """
+        now = time.monotonic()
+        snapshots = {}
+        missing = []
+        for symbol in symbols:
+            hit = self._quote_cache.get(symbol)
+            if hit and now - hit[0] < ttl:
+                snapshots[symbol] = hit[1]
+            else:
+                missing.append(symbol)
+        
+        if missing:
+            fetched = self.client.get_option_snapshot(missing) or {}
+            # Drop expired quotes so symbols no longer being priced don't pile up;
+            # iterate over a copy since the stream thread may pop fills meanwhile
+            for symbol, hit in list(self._quote_cache.items()):
+                if now - hit[0] >= ttl:
+                    self._quote_cache.pop(symbol, None)
+            for symbol, snapshot in fetched.items():
+                self._quote_cache[symbol] = (now, snapshot)
+                snapshots[symbol] = snapshot
+        
+        return snapshots
+    
+    def _schedule(self, pending: PendingOrder):
+        """Push an order's next deadline onto the heap. Caller holds the lock."""
+        deadline = pending.next_check(self.update_interval, self.max_order_age)
+        heapq.heappush(self._deadline_heap, (deadline, pending.order_id))
+    
+    def _reprice_order(self, order_id: str, pending: PendingOrder, snapshot: Any) -> bool:
         """
         Reprice an existing order to try to get filled.
         
         Args:
             order_id: Order to reprice
             pending: PendingOrder tracking info
+            snapshot: Current option snapshot for the order's symbol
             
         Returns:
             True if successfully repriced, False otherwise
         """
         try:
-            # Get current quote
-            snapshot = self.client.get_option_snapshot(pending.symbol)
-            if not snapshot or pending.symbol not in snapshot:
-                logger.error(f"Could not get snapshot for {pending.symbol}")
+            if not snapshot:
+                logger.error("Could not get snapshot for %s", pending.symbol)
                 return False
             
-            quote = snapshot[pending.symbol].latest_quote
+            quote = snapshot.latest_quote
             if not quote:
-                logger.error(f"No quote available for {pending.symbol}")
+                logger.error("No quote available for %s", pending.symbol)
                 return False
             
             bid_price = float(quote.bid_price)
             ask_price = float(quote.ask_price)
             
             # Calculate new price based on how many attempts we've made
-            # Get more aggressive with each attempt
-            if pending.side == 'sell':
-                # For sells, move toward the bid
-                spread = ask_price - bid_price
-                adjustment = min(pending.attempts * 0.01, spread * 0.5)  # Move up to half spread
-                new_price = max(bid_price, ask_price - adjustment)
-                new_price = round(new_price, 2)
-            else:
-                # For buys, move toward the ask
-                spread = ask_price - bid_price
-                adjustment = min(pending.attempts * 0.01, spread * 0.5)
-                new_price = min(ask_price, bid_price + adjustment)
-                new_price = round(new_price, 2)
+            new_price = _compute_price(pending.side, bid_price, ask_price, pending.attempts)
             
             # Don't reprice if the price hasn't changed
             if new_price == pending.limit_price:
-                logger.debug(f"Price unchanged for {pending.symbol}, skipping update")
+                logger.debug("Price unchanged for %s, skipping update", pending.symbol)
                 return False
             
             # Replace the order with new price
@@ -306,19 +602,34 @@ class OrderManager:
                 limit_price=new_price
             )
             
+            with self._lock:
+                if order_id not in self.pending_orders:
+                    # Filled or cancelled while we were pricing it
+                    return False
             updated_order = self.client.trade_client.replace_order_by_id(order_id, req)
             
+            # Replacing an order gives it a new ID. The stream may already have
+            # finalized the replacement (see _on_trade_update), so only re-key
+            # if the order is still tracked under its old ID.
+            new_order_id = getattr(updated_order, 'id', None) or order_id
+            with self._lock:
+                if new_order_id != order_id and self.pending_orders.get(order_id) is pending:
+                    del self.pending_orders[order_id]
+                    pending.order_id = new_order_id
+                    self.pending_orders[new_order_id] = pending
+            
             # Update tracking
             pending.limit_price = new_price
-            pending.last_updated = datetime.now()
+            pending.last_updated = time.monotonic()
             pending.attempts += 1
             
-            logger.info(f"Repriced order {order_id}: {pending.symbol} @ ${new_price:.2f} (attempt {pending.attempts}, bid: ${bid_price:.2f}, ask: ${ask_price:.2f})")
+            logger.info("Repriced order %s: %s @ $%.2f (attempt %d, bid: $%.2f, ask: $%.2f)",
+                        new_order_id, pending.symbol, new_price, pending.attempts, bid_price, ask_price)
             
             return True
             
         except Exception as e:
-            logger.error(f"Failed to reprice order {order_id}: {str(e)}")
+            logger.error("Failed to reprice order %s: %s", order_id, e)
             return False
     
     def cancel_all_pending(self) -> int:
@@ -329,21 +640,49 @@ class OrderManager:
             Number of orders cancelled
         """
         cancelled = 0
-        for order_id in list(self.pending_orders.keys()):
+        with self._lock:
+            order_ids = list(self.pending_orders.keys())
+        
+        for order_id, error in self._cancel_orders(order_ids).items():
+            if error is not None:
+                logger.error("Failed to cancel order %s: %s", order_id, error)
+                continue
+            with self._lock:
+                self.pending_orders.pop(order_id, None)
+            cancelled += 1
+            logger.info("Cancelled order %s", order_id)
+        
+        return cancelled
+    
+    def _cancel_orders(self, order_ids: List[str]) -> Dict[str, Optional[Exception]]:
+        """
+        Cancel orders concurrently.
+        
+        Returns:
+            Dictionary of order_id: exception raised, or None if cancelled
+        """
+        if not order_ids:
+            return {}
+        
+        def cancel(order_id):
             try:
                 self.client.trade_client.cancel_order_by_id(order_id)
-                del self.pending_orders[order_id]
-                cancelled += 1
-                logger.info(f"Cancelled order {order_id}")
+                return None
             except Exception as e:
-                logger.error(f"Failed to cancel order {order_id}: {str(e)}")
+                return e
         
-        return cancelled
+        with ThreadPoolExecutor(max_workers=min(MAX_ORDER_WORKERS, len(order_ids))) as executor:
+            return dict(zip(order_ids, executor.map(cancel, order_ids)))
     
     def get_pending_orders(self) -> List[PendingOrder]:
         """Get list of all pending orders"""
-        return list(self.pending_orders.values())
+        with self._lock:
+            return list(self.pending_orders.values())
     
     def has_pending_orders(self) -> bool:
         """Check if there are any pending orders"""
-        return len(self.pending_orders) > 0
\ No newline at end of file
+        return len(self.pending_orders) > 0
+    
+    def has_completed_orders(self) -> bool:
+        """Check if any orders were finalized since the last update_pending_orders call"""
+        return len(self._completed) > 0
\ No newline at end of file
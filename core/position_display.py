@@ -3,41 +3,41 @@ Position display utilities for showing current positions and P&L.
 """
 
 import logging
+import time
 from typing import List, Dict, Any
+import numpy as np
 from alpaca.trading.enums import AssetClass
 from tabulate import tabulate
+from .utils import parse_option_symbol
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+# Table headers never change, so build them once
+_STOCK_HEADERS = ("Symbol", "Qty", "Avg Cost", "Current", "Value", "P&L", "P&L%", "State")
+_OPT_HEADERS = ("Underlying", "Type", "Strike", "Qty", "Avg Price", "Current", "Value", "P&L")
+_COUNT_HEADERS = ("Symbol", "Puts", "Calls", "Shares", "Wheel State")
+_TRADE_HEADERS = ("Time", "Symbol", "Type", "Strike", "Premium")
+
+# Pending orders refresh most often, so they skip tabulate entirely
+_PENDING_ROW = "{:<8} {:<6} {:>9} {:>4} {:>8} {:>8} {:>8} {:>6}"
+_PENDING_HEADER = _PENDING_ROW.format("Symbol", "Type", "Strike", "Qty", "Limit", "Target", "Attempts", "Age")
+_PENDING_RULE = "-" * len(_PENDING_HEADER)
 
-def parse_option_symbol(symbol: str) -> tuple:
-    """Parse option symbol to extract underlying, type, and strike"""
-    # Format: AAPL240119C00150000
-    if len(symbol) < 15:
-        return symbol, None, None
-    
-    # Find where the numbers start (date)
-    for i, char in enumerate(symbol):
-        if char.isdigit():
-            underlying = symbol[:i]
-            rest = symbol[i:]
-            
-            # Date is 6 digits, then C/P, then strike
-            if len(rest) >= 15:
-                date = rest[:6]
-                option_type = rest[6]
-                strike_str = rest[7:]
-                strike = float(strike_str) / 1000
-                return underlying, option_type, strike
-    
-    return symbol, None, None
+
+def _float_column(values, count: int) -> np.ndarray:
+    """Build a float array from position fields, with missing/zero values as NaN"""
+    return np.fromiter((float(v) if v else np.nan for v in values), dtype=np.float64, count=count)
 
 
 def display_positions(positions: List[Any], states: Dict[str, Any], 
-                     position_counts: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
+                     position_counts: Dict[str, Dict[str, int]],
+                     verbose: bool = False) -> Dict[str, Any]:
     """
     Display current positions in a formatted table with P&L.
     
+    Args:
+        verbose: Draw full grid tables instead of the lighter simple format
+    
     Returns:
         Dictionary with summary statistics
     """
@@ -60,103 +60,128 @@ def display_positions(positions: List[Any], states: Dict[str, Any],
         elif p.asset_class == AssetClass.US_OPTION:
             option_positions.append(p)
     
+    if not logger.isEnabledFor(logging.INFO):
+        # Nothing will be shown, so only total the P&L and value columns
+        stock_count, option_count = len(stock_positions), len(option_positions)
+        stock_pl = np.nansum(_float_column((p.unrealized_pl for p in stock_positions), stock_count))
+        option_pl = np.nansum(_float_column((p.unrealized_pl for p in option_positions), option_count))
+        stock_value = np.nansum(_float_column((p.market_value for p in stock_positions), stock_count))
+        option_value = np.nansum(np.abs(_float_column((p.market_value for p in option_positions), option_count)))
+        return {
+            'total_pl': float(stock_pl - option_pl),
+            'total_value': float(stock_value + option_value),
+            'option_count': option_count,
+            'stock_count': stock_count
+        }
+    
     total_pl = 0
     total_value = 0
+    tablefmt = "grid" if verbose else "simple"
     
     # Display stock positions
     if stock_positions:
         logger.info("\n📈 STOCK POSITIONS:")
+        n = len(stock_positions)
+        
+        # Do the P&L math column-wise, then format row by row
+        qty = np.fromiter((int(p.qty) for p in stock_positions), dtype=np.int64, count=n)
+        avg_price = np.nan_to_num(_float_column((p.avg_entry_price for p in stock_positions), n))
+        current_price = _float_column((p.current_price for p in stock_positions), n)
+        current_price = np.where(np.isnan(current_price), avg_price, current_price)
+        market_value = np.nan_to_num(_float_column((p.market_value for p in stock_positions), n))
+        unrealized_pl = np.nan_to_num(_float_column((p.unrealized_pl for p in stock_positions), n))
+        cost = qty * avg_price
+        pl_pct = np.divide(unrealized_pl * 100, cost, out=np.zeros(n), where=(qty > 0) & (cost != 0))
+        
         stock_data = []
-        for p in stock_positions:
-            qty = int(p.qty)
-            avg_price = float(p.avg_entry_price)
-            current_price = float(p.current_price) if p.current_price else avg_price
-            market_value = float(p.market_value)
-            unrealized_pl = float(p.unrealized_pl) if p.unrealized_pl else 0
-            pl_pct = (unrealized_pl / (qty * avg_price) * 100) if qty > 0 else 0
-            
+        for p, q, avg, cur, mv, upl, pct in zip(stock_positions, qty.tolist(), avg_price.tolist(),
+                                                 current_price.tolist(), market_value.tolist(),
+                                                 unrealized_pl.tolist(), pl_pct.tolist()):
             # Get wheel state
-            state = states.get(p.symbol, {})
-            wheel_state = state.get('type', 'unknown')
+            state = states.get(p.symbol)
+            wheel_state = state.type if state else 'unknown'
             
             stock_data.append([
                 p.symbol,
-                f"{qty:,}",
-                f"${avg_price:.2f}",
-                f"${current_price:.2f}",
-                f"${market_value:,.2f}",
-                f"${unrealized_pl:+,.2f}",
-                f"{pl_pct:+.1f}%",
+                f"{q:,}",
+                f"${avg:.2f}",
+                f"${cur:.2f}",
+                f"${mv:,.2f}",
+                f"${upl:+,.2f}",
+                f"{pct:+.1f}%",
                 wheel_state
             ])
-            
-            total_pl += unrealized_pl
-            total_value += market_value
         
-        headers = ["Symbol", "Qty", "Avg Cost", "Current", "Value", "P&L", "P&L%", "State"]
-        logger.info("\n" + tabulate(stock_data, headers=headers, tablefmt="grid"))
+        total_pl += float(unrealized_pl.sum())
+        total_value += float(market_value.sum())
+        
+        logger.info("\n" + tabulate(stock_data, headers=_STOCK_HEADERS, tablefmt=tablefmt))
     
     # Display option positions
     if option_positions:
         logger.info("\n📊 OPTION POSITIONS:")
+        n = len(option_positions)
+        
+        # For short options, we show them as negative qty
+        avg_price = np.abs(np.nan_to_num(_float_column((p.avg_entry_price for p in option_positions), n)))
+        current_price = np.abs(_float_column((p.current_price for p in option_positions), n))
+        current_price = np.where(np.isnan(current_price), avg_price, current_price)
+        market_value = np.abs(np.nan_to_num(_float_column((p.market_value for p in option_positions), n)))
+        
+        # For short options, unrealized P&L is reversed (subtracting from 0.0
+        # rather than negating keeps a zero P&L from printing as -0.00)
+        unrealized_pl = 0.0 - np.nan_to_num(_float_column((p.unrealized_pl for p in option_positions), n))
+        
         option_data = []
-        for p in option_positions:
-            qty = int(p.qty)
-            symbol = p.symbol
-            underlying, option_type, strike = parse_option_symbol(symbol)
-            
-            # For short options, we show them as negative qty
-            avg_price = abs(float(p.avg_entry_price))
-            current_price = abs(float(p.current_price)) if p.current_price else avg_price
-            market_value = abs(float(p.market_value))
-            
-            # For short options, unrealized P&L is reversed
-            unrealized_pl = -float(p.unrealized_pl) if p.unrealized_pl else 0
-            
+        for p, avg, cur, mv, upl in zip(option_positions, avg_price.tolist(), current_price.tolist(),
+                                        market_value.tolist(), unrealized_pl.tolist()):
+            try:
+                underlying, option_type, strike = parse_option_symbol(p.symbol)
+            except ValueError:
+                # Not an OCC symbol; show the row unparsed
+                underlying, option_type, strike = p.symbol, None, None
             position_type = "Short Put" if option_type == 'P' else "Short Call"
             
             option_data.append([
                 underlying,
                 position_type,
                 f"${strike:.2f}" if strike else "N/A",
-                f"{qty:,}",
-                f"${avg_price:.2f}",
-                f"${current_price:.2f}",
-                f"${market_value:,.2f}",
-                f"${unrealized_pl:+,.2f}"
+                f"{int(p.qty):,}",
+                f"${avg:.2f}",
+                f"${cur:.2f}",
+                f"${mv:,.2f}",
+                f"${upl:+,.2f}"
             ])
-            
-            total_pl += unrealized_pl
-            total_value += market_value
         
-        headers = ["Underlying", "Type", "Strike", "Qty", "Avg Price", "Current", "Value", "P&L"]
-        logger.info("\n" + tabulate(option_data, headers=headers, tablefmt="grid"))
+        total_pl += float(unrealized_pl.sum())
+        total_value += float(market_value.sum())
+        
+        logger.info("\n" + tabulate(option_data, headers=_OPT_HEADERS, tablefmt=tablefmt))
+    
+    # Display position counts by symbol, skipping symbols with nothing open
+    # and listing the largest exposure first
+    held = []
+    for symbol, counts in (position_counts or {}).items():
+        puts = counts.get('puts', 0)
+        calls = counts.get('calls', 0)
+        shares = counts.get('shares', 0)
+        if puts > 0 or calls > 0 or shares > 0:
+            held.append((symbol, puts, calls, shares))
     
-    # Display position counts by symbol
-    if position_counts:
+    if held:
+        held.sort(key=lambda row: (-(row[1] + row[2] + row[3]), row[0]))
         logger.info("\n🎯 POSITION COUNTS BY SYMBOL:")
-        count_data = []
-        for symbol, counts in position_counts.items():
-            puts = counts.get('puts', 0)
-            calls = counts.get('calls', 0)
-            shares = counts.get('shares', 0)
-            
-            # Get state
-            state = states.get(symbol, {})
-            wheel_state = state.get('type', 'no position')
-            
-            if puts > 0 or calls > 0 or shares > 0:
-                count_data.append([
-                    symbol,
-                    f"{puts}" if puts > 0 else "-",
-                    f"{calls}" if calls > 0 else "-",
-                    f"{shares * 100:,}" if shares > 0 else "-",
-                    wheel_state
-                ])
-        
-        if count_data:
-            headers = ["Symbol", "Puts", "Calls", "Shares", "Wheel State"]
-            logger.info("\n" + tabulate(count_data, headers=headers, tablefmt="grid"))
+        count_data = [
+            [
+                symbol,
+                f"{puts}" if puts > 0 else "-",
+                f"{calls}" if calls > 0 else "-",
+                f"{shares * 100:,}" if shares > 0 else "-",
+                states[symbol].type if symbol in states else 'no position'
+            ]
+            for symbol, puts, calls, shares in held
+        ]
+        logger.info("\n" + tabulate(count_data, headers=_COUNT_HEADERS, tablefmt=tablefmt))
     
     # Display summary
     logger.info("\n💰 POSITION SUMMARY:")
@@ -177,19 +202,20 @@ def display_positions(positions: List[Any], states: Dict[str, Any],
 
 def display_pending_orders(order_manager) -> None:
     """Display pending limit orders"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     pending_orders = order_manager.get_pending_orders()
     
     if not pending_orders:
         return
     
     logger.info("\n⏳ PENDING LIMIT ORDERS:")
-    order_data = []
+    lines = [_PENDING_HEADER, _PENDING_RULE]
+    now = time.monotonic()
     
     for order in pending_orders:
-        age_seconds = (datetime.now() - order.created_at).total_seconds()
-        age_str = f"{int(age_seconds)}s"
-        
-        order_data.append([
+        lines.append(_PENDING_ROW.format(
             order.underlying,
             order.order_type.upper(),
             f"${order.strike:.2f}" if order.strike else "N/A",
@@ -197,16 +223,15 @@ def display_pending_orders(order_manager) -> None:
             f"${order.limit_price:.2f}",
             f"${order.target_price:.2f}",
             order.attempts,
-            age_str
-        ])
+            f"{int(now - order.created_at)}s"
+        ))
     
-    headers = ["Symbol", "Type", "Strike", "Qty", "Limit", "Target", "Attempts", "Age"]
-    logger.info("\n" + tabulate(order_data, headers=headers, tablefmt="grid"))
+    logger.info("\n" + "\n".join(lines))
 
 
 def display_database_stats(db) -> None:
     """Display database statistics"""
-    if not db:
+    if not db or not logger.isEnabledFor(logging.INFO):
         return
     
     try:
@@ -235,10 +260,6 @@ def display_database_stats(db) -> None:
                         f"${trade['premium']:.2f}" if trade.get('premium') else "N/A"
                     ])
                 
-                headers = ["Time", "Symbol", "Type", "Strike", "Premium"]
-                logger.info("\n" + tabulate(trade_data, headers=headers, tablefmt="grid"))
+                logger.info("\n" + tabulate(trade_data, headers=_TRADE_HEADERS, tablefmt="grid"))
     except Exception as e:
         logger.error(f"Error displaying database stats: {str(e)}")
-
-
-from datetime import datetime
\ No newline at end of file
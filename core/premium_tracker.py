@@ -3,9 +3,38 @@ Track premiums collected from options to adjust cost basis for better exit strat
 """
 import json
 import os
+import tempfile
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
+from collections import defaultdict, deque
+
+try:
+    import orjson
+except ImportError:  # Optional; stdlib json is used when it isn't installed
+    orjson = None
+
+# Number of logged transactions after which the log is folded into the snapshot
+SNAPSHOT_EVERY = 500
+
+# Transactions kept in memory per symbol; older ones are moved to the archive
+MAX_TRANSACTIONS = 1000
+
+# Snapshot key holding the sequence number of the last log entry folded into it
+LOG_SEQ_KEY = "_log_seq"
+
+def _dumps(obj, indent=False) -> bytes:
+    """Serialize to JSON bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, default=str, indent=2 if indent else None).encode()
+
+
+def _loads(data):
+    """Parse JSON bytes or str, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 class PremiumTracker:
     """Tracks premiums collected from covered calls and puts to adjust cost basis"""
@@ -15,29 +44,119 @@ class PremiumTracker:
             filepath = Path(__file__).parent.parent / "data" / "premium_history.json"
         self.filepath = filepath
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
+        # New transactions are appended here, one JSON object per line, and
+        # folded into the snapshot file by snapshot()
+        self.log_path = self.filepath.with_name(self.filepath.name + ".log")
+        # Transactions evicted from memory, one NDJSON file per symbol
+        self.archive_dir = self.filepath.parent / "archive"
+        self._log_count = 0
+        self._log_seq = 0  # Sequence number of the last logged transaction
         self.history = self.load_history()
     
     def load_history(self):
-        """Load premium history from file"""
-        if self.filepath.exists():
-            with open(self.filepath, 'r') as f:
-                return json.load(f)
-        return {}
+        """Load the premium history snapshot, then replay the transaction log"""
+        history = _loads(self.filepath.read_bytes()) if self.filepath.exists() else {}
+        snapshot_seq = history.pop(LOG_SEQ_KEY, 0)
+        self._log_seq = snapshot_seq
+        
+        trimmed = False
+        for symbol, data in history.items():
+            transactions = data["transactions"]
+            if len(transactions) > MAX_TRANSACTIONS:
+                self._archive(symbol, transactions[:-MAX_TRANSACTIONS])
+                trimmed = True
+            data["transactions"] = deque(transactions, maxlen=MAX_TRANSACTIONS)
+        if trimmed:
+            # Don't archive the same transactions again on the next load
+            self._write_snapshot(history, snapshot_seq)
+        
+        self._log_count = 0
+        if self.log_path.exists():
+            with open(self.log_path, 'rb') as f:
+                for line in f:
+                    try:
+                        entry = _loads(line)
+                    except ValueError:
+                        # Partial line from an interrupted write
+                        continue
+                    # Entries at or below the snapshot's sequence number are already
+                    # in it, left behind by a crash before the log was truncated
+                    seq = entry.get("seq")
+                    if seq is not None:
+                        if seq <= snapshot_seq:
+                            continue
+                        self._log_seq = max(self._log_seq, seq)
+                    # Transactions evicted here were archived when first added
+                    self._apply(history, entry["symbol"], entry["transaction"])
+                    self._log_count += 1
+        return history
     
     def save_history(self):
         """Save premium history to file"""
-        with open(self.filepath, 'w') as f:
-            json.dump(self.history, f, indent=2, default=str)
+        self.snapshot()
     
-    def add_premium(self, symbol, premium_amount, option_type, strike, expiry, timestamp=None):
-        """Record premium collected from selling an option"""
-        if symbol not in self.history:
-            self.history[symbol] = {
+    def snapshot(self):
+        """Atomically write the full history to the snapshot file and clear the log"""
+        self._write_snapshot(self.history, self._log_seq)
+        self.log_path.write_bytes(b"")
+        self._log_count = 0
+    
+    def _write_snapshot(self, history, log_seq):
+        """Atomically replace the snapshot file with the given history, covering the log up to log_seq"""
+        data = {
+            symbol: {**entry, "transactions": list(entry["transactions"])}
+            for symbol, entry in history.items()
+        }
+        data[LOG_SEQ_KEY] = log_seq
+        fd, tmp_path = tempfile.mkstemp(dir=self.filepath.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_dumps(data, indent=True))
+            os.replace(tmp_path, self.filepath)
+        except Exception:
+            os.unlink(tmp_path)
+            raise
+    
+    def _archive(self, symbol, transactions):
+        """Append transactions to the symbol's archive file"""
+        self.archive_dir.mkdir(exist_ok=True)
+        with open(self.archive_dir / f"{symbol}.ndjson", 'ab') as f:
+            f.write(b"".join(_dumps(transaction) + b"\n" for transaction in transactions))
+    
+    def close(self):
+        """Snapshot the history, folding in the transaction log"""
+        if self._log_count:
+            self.snapshot()
+    
+    @staticmethod
+    def _apply(history, symbol, transaction):
+        """
+        Add a transaction to a history dict and update its totals.
+        
+        Returns:
+            The transaction evicted from memory to make room, or None
+        """
+        if symbol not in history:
+            history[symbol] = {
                 "total_call_premium": 0.0,
                 "total_put_premium": 0.0,
-                "transactions": []
+                "transactions": deque(maxlen=MAX_TRANSACTIONS)
             }
         
+        transactions = history[symbol]["transactions"]
+        evicted = transactions[0] if len(transactions) == transactions.maxlen else None
+        transactions.append(transaction)
+        
+        option_type = transaction["type"]
+        if option_type.upper() == 'C':
+            history[symbol]["total_call_premium"] += transaction["premium"]
+        elif option_type.upper() == 'P':
+            history[symbol]["total_put_premium"] += transaction["premium"]
+        
+        return evicted
+    
+    def add_premium(self, symbol, premium_amount, option_type, strike, expiry, timestamp=None):
+        """Record premium collected from selling an option"""
         if timestamp is None:
             timestamp = datetime.now().isoformat()
         
@@ -49,14 +168,19 @@ class PremiumTracker:
             "expiry": expiry
         }
         
-        self.history[symbol]["transactions"].append(transaction)
+        evicted = self._apply(self.history, symbol, transaction)
         
-        if option_type.upper() == 'C':
-            self.history[symbol]["total_call_premium"] += premium_amount
-        elif option_type.upper() == 'P':
-            self.history[symbol]["total_put_premium"] += premium_amount
-        
-        self.save_history()
+        # Only the new transaction touches disk
+        self._log_seq += 1
+        entry = {"seq": self._log_seq, "symbol": symbol, "transaction": transaction}
+        # Opened per append so no handle is left open between transactions
+        with open(self.log_path, 'ab') as f:
+            f.write(_dumps(entry) + b"\n")
+        if evicted is not None:
+            self._archive(symbol, [evicted])
+        self._log_count += 1
+        if self._log_count >= SNAPSHOT_EVERY:
+            self.snapshot()
     
     def get_total_premium(self, symbol, option_type=None):
         """Get total premium collected for a symbol"""
@@ -102,12 +226,44 @@ class PremiumTracker:
     
     def reset_symbol(self, symbol):
         """Reset premium history for a symbol (use when position is closed)"""
+        # Archived transactions belong to the history being reset; removed first so
+        # a crash before the snapshot can't leave them to resurface later
+        (self.archive_dir / f"{symbol}.ndjson").unlink(missing_ok=True)
         if symbol in self.history:
             del self.history[symbol]
-            self.save_history()
+            self.snapshot()
     
-    def get_history(self, symbol=None):
-        """Get premium history for a symbol or all symbols"""
+    def get_history(self, symbol=None, include_archive=False):
+        """
+        Get premium history for a symbol or all symbols.
+        
+        Args:
+            symbol: Symbol to get history for, or None for all symbols
+            include_archive: Prepend archived transactions to the in-memory ones
+        """
+        if not include_archive:
+            # Transactions are kept in deques; callers get lists
+            if symbol:
+                entry = self.history.get(symbol)
+                return {**entry, "transactions": list(entry["transactions"])} if entry else {}
+            return {
+                sym: {**entry, "transactions": list(entry["transactions"])}
+                for sym, entry in self.history.items()
+            }
+        
+        symbols = [symbol] if symbol else list(self.history)
+        result = {}
+        for sym in symbols:
+            if sym not in self.history:
+                continue
+            archived = []
+            archive_path = self.archive_dir / f"{sym}.ndjson"
+            if archive_path.exists():
+                with open(archive_path, 'rb') as f:
+                    archived = [_loads(line) for line in f if line.strip()]
+            entry = self.history[sym]
+            result[sym] = {**entry, "transactions": archived + list(entry["transactions"])}
+        
         if symbol:
-            return self.history.get(symbol, {})
-        return self.history
\ No newline at end of file
+            return result.get(symbol, {})
+        return result
\ No newline at end of file
@@ -3,63 +3,112 @@ Professional display utilities for a clean, trading terminal appearance.
 """
 
 import logging
+import time
+import re
+import numpy as np
+from types import SimpleNamespace
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from alpaca.trading.enums import AssetClass
 from tabulate import tabulate
+from .utils import parse_option_symbol
 import os
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+# Matches ANSI color codes, which take up no width on screen
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+# Table headers and column alignments ('<' left, '>' right)
+_OPTION_HEADERS = ("Symbol", "Type", "Strike", "Qty", "Avg", "Curr", "Value", "P&L")
+_OPTION_ALIGN = "<<>>>>>>"
+_STOCK_HEADERS = ("Symbol", "Shares", "Avg", "Curr", "Value", "P&L", "Status")
+_STOCK_ALIGN = "<>>>>><"
+_WHEEL_HEADERS = ("Symbol", "Layers", "Puts", "Calls", "Shares", "State", "Status")
+_WHEEL_ALIGN = "<>>>><<"
+_PENDING_HEADERS = ("Symbol", "Type", "Strike", "Qty", "Limit", "Status", "Age")
+_PENDING_ALIGN = "<<>>><>"
+
 # ANSI color codes for terminal
-class Colors:
-    HEADER = '\033[95m'
-    BLUE = '\033[94m'
-    CYAN = '\033[96m'
-    GREEN = '\033[92m'
-    YELLOW = '\033[93m'
-    RED = '\033[91m'
-    ENDC = '\033[0m'
-    BOLD = '\033[1m'
-    UNDERLINE = '\033[4m'
+_COLORS_ON = SimpleNamespace(
+    HEADER='\033[95m',
+    BLUE='\033[94m',
+    CYAN='\033[96m',
+    GREEN='\033[92m',
+    YELLOW='\033[93m',
+    RED='\033[91m',
+    ENDC='\033[0m',
+    BOLD='\033[1m',
+    UNDERLINE='\033[4m',
+)
+_COLORS_OFF = SimpleNamespace(**{name: '' for name in vars(_COLORS_ON)})
+
+# Windows console API constants
+_STD_OUTPUT_HANDLE = -11
+_ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
+
+
+def _supports_ansi() -> bool:
+    """Check whether the terminal understands ANSI color codes"""
+    if os.name != 'nt':
+        return True
     
-    @staticmethod
-    def disable():
-        Colors.HEADER = ''
-        Colors.BLUE = ''
-        Colors.CYAN = ''
-        Colors.GREEN = ''
-        Colors.YELLOW = ''
-        Colors.RED = ''
-        Colors.ENDC = ''
-        Colors.BOLD = ''
-        Colors.UNDERLINE = ''
-
-# Disable colors on Windows if not supported
-if os.name == 'nt':
-    Colors.disable()
+    # Windows 10+ consoles handle ANSI once virtual terminal processing is on
+    try:
+        import ctypes
+        from ctypes import wintypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(_STD_OUTPUT_HANDLE)
+        mode = wintypes.DWORD()
+        # Fails when output is redirected rather than going to a console
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # Keep the flags the console already has
+        return bool(kernel32.SetConsoleMode(handle, mode.value | _ENABLE_VIRTUAL_TERMINAL_PROCESSING))
+    except Exception:
+        return False
+
+
+def _build_formats():
+    """Precompute the colored format strings used by the value formatters"""
+    global _POS_CUR, _NEG_CUR, _POS_PCT, _NEG_PCT
+    _POS_CUR = Colors.GREEN + "+${:,.2f}" + Colors.ENDC
+    _NEG_CUR = Colors.RED + "-${:,.2f}" + Colors.ENDC
+    _POS_PCT = Colors.GREEN + "+{:.1f}%" + Colors.ENDC
+    _NEG_PCT = Colors.RED + "{:.1f}%" + Colors.ENDC
+
+
+def disable_colors():
+    """Switch all display output to plain text"""
+    global Colors
+    Colors = _COLORS_OFF
+    _build_formats()
+
+
+# Colors in use, chosen once at import
+Colors = _COLORS_ON if _supports_ansi() else _COLORS_OFF
+
+_ZERO_CUR = "${:,.2f}"
+_ZERO_PCT = "{:.1f}%"
+_build_formats()
 
 
 def format_currency(value: float, show_sign: bool = False) -> str:
     """Format currency with proper sign and color"""
     if show_sign:
         if value > 0:
-            return f"{Colors.GREEN}+${abs(value):,.2f}{Colors.ENDC}"
+            return _POS_CUR.format(value)
         elif value < 0:
-            return f"{Colors.RED}-${abs(value):,.2f}{Colors.ENDC}"
-        else:
-            return f"${value:,.2f}"
-    return f"${value:,.2f}"
+            return _NEG_CUR.format(-value)
+    return _ZERO_CUR.format(value)
 
 
 def format_percentage(value: float) -> str:
     """Format percentage with color"""
     if value > 0:
-        return f"{Colors.GREEN}+{value:.1f}%{Colors.ENDC}"
+        return _POS_PCT.format(value)
     elif value < 0:
-        return f"{Colors.RED}{value:.1f}%{Colors.ENDC}"
-    else:
-        return f"{value:.1f}%"
+        return _NEG_PCT.format(value)
+    return _ZERO_PCT.format(value)
 
 
 def clear_screen():
@@ -83,30 +132,33 @@ def print_section(title: str):
     logger.info("-" * 40)
 
 
-def parse_option_symbol(symbol: str) -> tuple:
-    """Parse option symbol to extract underlying, type, and strike"""
-    if len(symbol) < 15:
-        return symbol, None, None
+def _render_simple(headers, rows, align: str) -> str:
+    """
+    Render rows of preformatted cells in the style of tabulate's "simple"
+    format. Column widths are measured once, ignoring ANSI color codes.
+    """
+    rows = [[str(cell) for cell in row] for row in rows]
+    lengths = [[len(_ANSI_RE.sub('', cell)) for cell in row] for row in rows]
+    widths = [max(col) for col in zip(map(len, headers), *lengths)]
     
-    for i, char in enumerate(symbol):
-        if char.isdigit():
-            underlying = symbol[:i]
-            rest = symbol[i:]
-            
-            if len(rest) >= 15:
-                date = rest[:6]
-                option_type = rest[6]
-                strike_str = rest[7:]
-                strike = float(strike_str) / 1000
-                return underlying, option_type, strike
+    def render(cells, cell_lengths):
+        return "  ".join(
+            cell + " " * (width - length) if a == "<" else " " * (width - length) + cell
+            for cell, length, width, a in zip(cells, cell_lengths, widths, align)
+        ).rstrip()
     
-    return symbol, None, None
+    lines = [render(headers, map(len, headers)), "  ".join("-" * width for width in widths)]
+    lines.extend(render(row, row_lengths) for row, row_lengths in zip(rows, lengths))
+    return "\n".join(lines)
 
 
 def display_account_summary(account, actual_balance: float, allocated_balance: float, 
                            options_buying_power: float, portfolio_value: float,
                            balance_allocation: float):
     """Display account summary in a clean format"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     print_section("ACCOUNT STATUS")
     
     # Calculate daily P&L if available
@@ -128,77 +180,127 @@ def display_account_summary(account, actual_balance: float, allocated_balance: f
     logger.info(tabulate(data, tablefmt="plain"))
 
 
+def _split_positions(positions: List[Any]) -> tuple:
+    """Partition positions into (options, stocks) in a single pass"""
+    us_equity = AssetClass.US_EQUITY
+    us_option = AssetClass.US_OPTION
+    options = []
+    stocks = []
+    for p in positions:
+        asset_class = p.asset_class
+        if asset_class == us_option:
+            options.append(p)
+        elif asset_class == us_equity:
+            stocks.append(p)
+    return options, stocks
+
+
+def _option_columns(options: List[Any]) -> tuple:
+    """
+    Numeric columns for short option positions as arrays of
+    (quantity, average price, current price, market value, unrealized P&L).
+    """
+    n = len(options)
+    qty = np.abs(np.fromiter((int(p.qty) for p in options), dtype=np.int64, count=n))
+    avg_price = np.abs(np.fromiter((float(p.avg_entry_price) for p in options), dtype=np.float64, count=n))
+    current_price = np.abs(np.fromiter(
+        (float(p.current_price) if p.current_price else np.nan for p in options), dtype=np.float64, count=n
+    ))
+    current_price = np.where(np.isnan(current_price), avg_price, current_price)
+    market_value = np.abs(np.fromiter((float(p.market_value) for p in options), dtype=np.float64, count=n))
+    # For SHORT options: profit when price goes down
+    unrealized_pl = (avg_price - current_price) * qty * 100
+    return qty, avg_price, current_price, market_value, unrealized_pl
+
+
+def _stock_columns(stocks: List[Any]) -> tuple:
+    """
+    Numeric columns for stock positions as arrays of
+    (quantity, average price, current price, market value, unrealized P&L).
+    """
+    n = len(stocks)
+    qty = np.fromiter((int(p.qty) for p in stocks), dtype=np.int64, count=n)
+    avg_price = np.fromiter((float(p.avg_entry_price) for p in stocks), dtype=np.float64, count=n)
+    current_price = np.fromiter(
+        (float(p.current_price) if p.current_price else np.nan for p in stocks), dtype=np.float64, count=n
+    )
+    current_price = np.where(np.isnan(current_price), avg_price, current_price)
+    market_value = np.fromiter((float(p.market_value) for p in stocks), dtype=np.float64, count=n)
+    unrealized_pl = np.fromiter(
+        (float(p.unrealized_pl) if p.unrealized_pl else 0.0 for p in stocks), dtype=np.float64, count=n
+    )
+    return qty, avg_price, current_price, market_value, unrealized_pl
+
+
+def _compute_positions_stats(positions: List[Any]) -> Dict[str, Any]:
+    """Total P&L, value and counts for positions, without formatting any rows"""
+    options, stocks = _split_positions(positions)
+    option_cols = _option_columns(options)
+    stock_cols = _stock_columns(stocks)
+    return {
+        'total_pl': float(option_cols[4].sum() + stock_cols[4].sum()),
+        'total_value': float(option_cols[3].sum() + stock_cols[3].sum()),
+        'option_count': len(options),
+        'stock_count': len(stocks)
+    }
+
+
 def display_positions_professional(positions: List[Any], states: Dict[str, Any], 
                                   position_counts: Dict[str, Dict[str, int]]) -> Dict[str, Any]:
     """Display positions in a professional format"""
     
+    # Callers still get the totals when nothing will be shown
+    if not logger.isEnabledFor(logging.INFO):
+        return _compute_positions_stats(positions)
+    
     if not positions:
         print_section("POSITIONS")
         logger.info("No open positions")
         return {'total_pl': 0, 'total_value': 0, 'option_count': 0, 'stock_count': 0}
     
-    # Separate positions
-    stock_positions = []
-    option_positions = []
-    
-    for p in positions:
-        if p.asset_class == AssetClass.US_EQUITY:
-            stock_positions.append(p)
-        elif p.asset_class == AssetClass.US_OPTION:
-            option_positions.append(p)
+    options, stocks = _split_positions(positions)
+    option_cols = _option_columns(options)
+    stock_cols = _stock_columns(stocks)
     
-    total_pl = 0
-    total_value = 0
+    total_pl = float(option_cols[4].sum() + stock_cols[4].sum())
+    total_value = float(option_cols[3].sum() + stock_cols[3].sum())
     
     # Display options first (more relevant for wheel strategy)
-    if option_positions:
+    if options:
         print_section("OPTION POSITIONS")
         option_data = []
         
-        for p in option_positions:
-            qty = int(p.qty)
-            symbol = p.symbol
-            underlying, option_type, strike = parse_option_symbol(symbol)
-            
-            avg_price = abs(float(p.avg_entry_price))
-            current_price = abs(float(p.current_price)) if p.current_price else avg_price
-            market_value = abs(float(p.market_value))
-            # For SHORT options: profit when price goes down
-            unrealized_pl = (avg_price - current_price) * abs(qty) * 100
-            
+        for p, qty, avg_price, current_price, market_value, unrealized_pl in zip(
+                options, *(col.tolist() for col in option_cols)):
+            try:
+                underlying, option_type, strike = parse_option_symbol(p.symbol)
+            except ValueError:
+                # Not an OCC symbol; show the row unparsed
+                underlying, option_type, strike = p.symbol, None, None
             position_type = "PUT" if option_type == 'P' else "CALL"
             
             option_data.append([
                 underlying,
                 position_type,
-                f"${strike:.0f}",
-                f"{abs(qty)}",
+                f"${strike:.0f}" if strike else "N/A",
+                f"{qty}",
                 f"${avg_price:.2f}",
                 f"${current_price:.2f}",
                 format_currency(market_value),
                 format_currency(unrealized_pl, show_sign=True)
             ])
-            
-            total_pl += unrealized_pl
-            total_value += market_value
         
-        headers = ["Symbol", "Type", "Strike", "Qty", "Avg", "Curr", "Value", "P&L"]
-        logger.info(tabulate(option_data, headers=headers, tablefmt="simple"))
+        logger.info(_render_simple(_OPTION_HEADERS, option_data, _OPTION_ALIGN))
     
     # Display stocks if any
-    if stock_positions:
+    if stocks:
         print_section("STOCK POSITIONS")
         stock_data = []
         
-        for p in stock_positions:
-            qty = int(p.qty)
-            avg_price = float(p.avg_entry_price)
-            current_price = float(p.current_price) if p.current_price else avg_price
-            market_value = float(p.market_value)
-            unrealized_pl = float(p.unrealized_pl) if p.unrealized_pl else 0
-            
-            state = states.get(p.symbol, {})
-            wheel_state = state.get('type', 'holding').replace('_', ' ').title()
+        for p, qty, avg_price, current_price, market_value, unrealized_pl in zip(
+                stocks, *(col.tolist() for col in stock_cols)):
+            state = states.get(p.symbol)
+            wheel_state = (state.type if state else 'holding').replace('_', ' ').title()
             
             stock_data.append([
                 p.symbol,
@@ -209,12 +311,8 @@ def display_positions_professional(positions: List[Any], states: Dict[str, Any],
                 format_currency(unrealized_pl, show_sign=True),
                 wheel_state
             ])
-            
-            total_pl += unrealized_pl
-            total_value += market_value
         
-        headers = ["Symbol", "Shares", "Avg", "Curr", "Value", "P&L", "Status"]
-        logger.info(tabulate(stock_data, headers=headers, tablefmt="simple"))
+        logger.info(_render_simple(_STOCK_HEADERS, stock_data, _STOCK_ALIGN))
     
     # Summary line
     logger.info("")
@@ -225,14 +323,17 @@ def display_positions_professional(positions: List[Any], states: Dict[str, Any],
     return {
         'total_pl': total_pl,
         'total_value': total_value,
-        'option_count': len(option_positions),
-        'stock_count': len(stock_positions)
+        'option_count': len(options),
+        'stock_count': len(stocks)
     }
 
 
 def display_wheel_status(position_counts: Dict[str, Dict[str, int]], 
                         states: Dict[str, Any], max_layers: int):
     """Display wheel strategy status"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     print_section("WHEEL STATUS")
     
     data = []
@@ -243,8 +344,8 @@ def display_wheel_status(position_counts: Dict[str, Dict[str, int]],
         shares = counts.get('shares', 0)
         
         if puts > 0 or calls > 0 or shares > 0:
-            state = states.get(symbol, {})
-            wheel_state = state.get('type', 'idle').replace('_', ' ').title()
+            state = states.get(symbol)
+            wheel_state = (state.type if state else 'idle').replace('_', ' ').title()
             
             # Calculate utilization
             current_layers = max(puts, shares)
@@ -269,14 +370,16 @@ def display_wheel_status(position_counts: Dict[str, Dict[str, int]],
             ])
     
     if data:
-        headers = ["Symbol", "Layers", "Puts", "Calls", "Shares", "State", "Status"]
-        logger.info(tabulate(data, headers=headers, tablefmt="simple"))
+        logger.info(_render_simple(_WHEEL_HEADERS, data, _WHEEL_ALIGN))
     else:
         logger.info("No active positions")
 
 
 def display_pending_orders_professional(order_manager) -> None:
     """Display pending orders in a clean format"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     pending_orders = order_manager.get_pending_orders()
     
     if not pending_orders:
@@ -284,9 +387,10 @@ def display_pending_orders_professional(order_manager) -> None:
     
     print_section("PENDING ORDERS")
     order_data = []
+    now = time.monotonic()
     
     for order in pending_orders:
-        age_seconds = (datetime.now() - order.created_at).total_seconds()
+        age_seconds = now - order.created_at
         
         # Color code based on age
         if age_seconds > 45:
@@ -304,13 +408,12 @@ def display_pending_orders_professional(order_manager) -> None:
             age_str
         ])
     
-    headers = ["Symbol", "Type", "Strike", "Qty", "Limit", "Status", "Age"]
-    logger.info(tabulate(order_data, headers=headers, tablefmt="simple"))
+    logger.info(_render_simple(_PENDING_HEADERS, order_data, _PENDING_ALIGN))
 
 
 def display_performance_summary(db) -> None:
     """Display performance summary"""
-    if not db:
+    if not db or not logger.isEnabledFor(logging.INFO):
         return
     
     try:
@@ -343,6 +446,9 @@ def display_performance_summary(db) -> None:
 def display_cycle_actions(actions_taken: List[str], allowed_symbols: List[str], 
                          buying_power: float):
     """Display what happened in this cycle"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     print_section("CYCLE ACTIVITY")
     
     if actions_taken:
@@ -359,6 +465,9 @@ def display_cycle_actions(actions_taken: List[str], allowed_symbols: List[str],
 
 def display_next_cycle_info(next_cycle_seconds: int):
     """Display when next cycle will run"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    
     logger.info("")
     logger.info("-" * 80)
     logger.info(f"Next cycle in {next_cycle_seconds} seconds | Press Ctrl+C to exit")
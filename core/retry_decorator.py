@@ -3,6 +3,7 @@ Retry decorator for handling API failures and network errors.
 """
 import time
 import logging
+from enum import IntEnum
 from functools import wraps
 from typing import Optional, Tuple, Type, Union
 import random
@@ -13,29 +14,6 @@ class RetryException(Exception):
     """Custom exception for retry failures"""
     pass
 
-def exponential_backoff_with_jitter(
-    attempt: int,
-    base_delay: float = 1.0,
-    max_delay: float = 60.0,
-    jitter: bool = True
-) -> float:
-    """
-    Calculate exponential backoff with optional jitter.
-    
-    Args:
-        attempt: Current attempt number (0-based)
-        base_delay: Base delay in seconds
-        max_delay: Maximum delay in seconds
-        jitter: Whether to add random jitter
-    
-    Returns:
-        Delay in seconds
-    """
-    delay = min(base_delay * (2 ** attempt), max_delay)
-    if jitter:
-        delay = delay * (0.5 + random.random() * 0.5)
-    return delay
-
 def retry_on_failure(
     max_attempts: int = 3,
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
@@ -55,6 +33,12 @@ def retry_on_failure(
         backoff: Whether to use exponential backoff
         jitter: Whether to add jitter to delays
     """
+    # Delay before each retry, worked out once rather than on every failure
+    if backoff:
+        delays = tuple(min(base_delay * (1 << i), max_delay) for i in range(max_attempts))
+    else:
+        delays = (base_delay,) * max_attempts
+    
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -64,7 +48,7 @@ def retry_on_failure(
                 try:
                     result = func(*args, **kwargs)
                     if attempt > 0:
-                        logger.info(f"{func.__name__} succeeded after {attempt + 1} attempts")
+                        logger.info("%s succeeded after %d attempts", func.__name__, attempt + 1)
                     return result
                     
                 except exceptions as e:
@@ -72,22 +56,19 @@ def retry_on_failure(
                     
                     if attempt == max_attempts - 1:
                         logger.error(
-                            f"{func.__name__} failed after {max_attempts} attempts: {str(e)}"
+                            "%s failed after %d attempts: %s", func.__name__, max_attempts, e
                         )
                         raise RetryException(
                             f"Failed after {max_attempts} attempts: {str(e)}"
                         ) from e
                     
-                    if backoff:
-                        delay = exponential_backoff_with_jitter(
-                            attempt, base_delay, max_delay, jitter
-                        )
-                    else:
-                        delay = base_delay
+                    delay = delays[attempt]
+                    if backoff and jitter:
+                        delay = delay * (0.5 + random.random() * 0.5)
                     
                     logger.warning(
-                        f"{func.__name__} attempt {attempt + 1}/{max_attempts} failed: {str(e)}. "
-                        f"Retrying in {delay:.2f} seconds..."
+                        "%s attempt %d/%d failed: %s. Retrying in %.2f seconds...",
+                        func.__name__, attempt + 1, max_attempts, e, delay
                     )
                     time.sleep(delay)
             
@@ -97,6 +78,12 @@ def retry_on_failure(
         return wrapper
     return decorator
 
+class CircuitState(IntEnum):
+    """States of a CircuitBreaker"""
+    CLOSED = 0
+    OPEN = 1
+    HALF_OPEN = 2
+
 class CircuitBreaker:
     """
     Circuit breaker pattern implementation for API calls.
@@ -111,18 +98,19 @@ class CircuitBreaker:
         self.recovery_timeout = recovery_timeout
         self.expected_exception = expected_exception
         self.failure_count = 0
+        # Monotonic clock reading, unaffected by wall-clock adjustments
         self.last_failure_time: Optional[float] = None
-        self.state = "closed"  # closed, open, half-open
+        self.state = CircuitState.CLOSED
         
     def call(self, func, *args, **kwargs):
         """
         Execute function with circuit breaker protection.
         """
-        if self.state == "open":
+        if self.state is CircuitState.OPEN:
             if self.last_failure_time and \
-               time.time() - self.last_failure_time >= self.recovery_timeout:
-                self.state = "half-open"
-                logger.info(f"Circuit breaker entering half-open state for {func.__name__}")
+               time.monotonic() - self.last_failure_time >= self.recovery_timeout:
+                self.state = CircuitState.HALF_OPEN
+                logger.info("Circuit breaker entering half-open state for %s", func.__name__)
             else:
                 raise RetryException(
                     f"Circuit breaker is open for {func.__name__}. "
@@ -131,21 +119,21 @@ class CircuitBreaker:
         
         try:
             result = func(*args, **kwargs)
-            if self.state == "half-open":
-                self.state = "closed"
+            if self.state is CircuitState.HALF_OPEN:
+                self.state = CircuitState.CLOSED
                 self.failure_count = 0
-                logger.info(f"Circuit breaker closed for {func.__name__}")
+                logger.info("Circuit breaker closed for %s", func.__name__)
             return result
             
         except self.expected_exception as e:
             self.failure_count += 1
-            self.last_failure_time = time.time()
+            self.last_failure_time = time.monotonic()
             
             if self.failure_count >= self.failure_threshold:
-                self.state = "open"
+                self.state = CircuitState.OPEN
                 logger.error(
-                    f"Circuit breaker opened for {func.__name__} "
-                    f"after {self.failure_count} failures"
+                    "Circuit breaker opened for %s after %d failures",
+                    func.__name__, self.failure_count
                 )
             
             raise e
@@ -154,4 +142,4 @@ class CircuitBreaker:
         """Reset circuit breaker to closed state."""
         self.failure_count = 0
         self.last_failure_time = None
-        self.state = "closed"
\ No newline at end of file
+        self.state = CircuitState.CLOSED
\ No newline at end of file
@@ -4,33 +4,61 @@ Handles rolling of short puts before expiration.
 """
 
 import logging
-from datetime import datetime, timedelta
+import sys
+import numpy as np
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
 from zoneinfo import ZoneInfo
 from alpaca.trading.enums import AssetClass
-from .utils import parse_option_symbol
+from .utils import parse_option_symbol, parse_option_expiration
 from .strategy import filter_options, score_options
 from models.contract import Contract
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
-def identify_rollable_positions(positions, strategy_config):
+# Expirations are dated in New York time
+_NY_TZ = ZoneInfo("America/New_York")
+
+# dataclass(slots=True) needs Python 3.10; older versions fall back to a __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
+class RollCandidate:
+    """A short put position close enough to expiration to roll"""
+    position: Any
+    underlying: str
+    strike: float
+    expiration: date
+    days_to_expiry: int
+    quantity: int
+
+
+def identify_rollable_positions(positions, strategy_config, rolling_settings=None, rolling_enabled=None):
     """
     Identify short put positions that are candidates for rolling.
     
     Args:
         positions: List of current positions
         strategy_config: Strategy configuration object
+        rolling_settings: Prefetched rolling settings (read from config if omitted)
+        rolling_enabled: Prefetched map of underlying -> rolling enabled;
+            symbols not in it are looked up in the config
         
     Returns:
-        List of tuples (position, underlying, strike, expiration) for rollable positions
+        List of RollCandidate for rollable positions
     """
     rollable = []
-    rolling_settings = strategy_config.get_rolling_settings()
+    if rolling_settings is None:
+        rolling_settings = strategy_config.get_rolling_settings()
+    rolling_enabled = dict(rolling_enabled or {})
     days_before_expiry = rolling_settings.get("days_before_expiry", 1)
     
-    timezone = ZoneInfo("America/New_York")
-    today = datetime.now(timezone).date()
+    # Read per call, so a long-running process picks up the new day
+    today = datetime.now(_NY_TZ).date()
     
+    candidates = []
     for position in positions:
         # Only consider short option positions
         if position.asset_class != AssetClass.US_OPTION:
@@ -46,58 +74,77 @@ def identify_rollable_positions(positions, strategy_config):
             continue
             
         # Check if rolling is enabled for this symbol
-        if not strategy_config.is_rolling_enabled_for_symbol(underlying):
+        enabled = rolling_enabled.get(underlying)
+        if enabled is None:
+            enabled = rolling_enabled[underlying] = strategy_config.is_rolling_enabled_for_symbol(underlying)
+        if not enabled:
             continue
         
         # Get expiration date from position symbol
         # Format: AAPL241220P00150000 -> expiration is 2024-12-20
-        symbol_parts = position.symbol.replace(underlying, '')
-        exp_str = symbol_parts[:6]  # YYMMDD format
-        
         try:
-            exp_year = 2000 + int(exp_str[:2])
-            exp_month = int(exp_str[2:4])
-            exp_day = int(exp_str[4:6])
-            expiration = datetime(exp_year, exp_month, exp_day).date()
-        except (ValueError, IndexError):
+            expiration = parse_option_expiration(position.symbol)
+        except ValueError:
             logger.warning(f"Could not parse expiration from symbol {position.symbol}")
             continue
         
-        # Check if close to expiration
-        days_to_expiry = (expiration - today).days
-        if days_to_expiry <= days_before_expiry:
-            rollable.append({
-                'position': position,
-                'underlying': underlying,
-                'strike': strike,
-                'expiration': expiration,
-                'days_to_expiry': days_to_expiry,
-                'quantity': abs(int(position.qty))
-            })
-            logger.info(f"Identified rollable position: {position.symbol} expires in {days_to_expiry} days")
+        candidates.append((position, underlying, strike, expiration))
+    
+    if not candidates:
+        return rollable
+    
+    # Days to expiry for every candidate in one vector operation
+    expirations = np.array([c[3] for c in candidates], dtype='datetime64[D]')
+    days_to_expiry = (expirations - np.datetime64(today, 'D')).astype(int)
+    
+    # Check if close to expiration
+    for i in np.flatnonzero(days_to_expiry <= days_before_expiry):
+        position, underlying, strike, expiration = candidates[i]
+        days = int(days_to_expiry[i])
+        rollable.append(RollCandidate(
+            position=position,
+            underlying=underlying,
+            strike=strike,
+            expiration=expiration,
+            days_to_expiry=days,
+            quantity=abs(int(position.qty))
+        ))
+        logger.info(f"Identified rollable position: {position.symbol} expires in {days} days")
     
     return rollable
 
-def find_roll_targets(client, rollable_position, strategy_config):
+def find_roll_targets(client, rollable_position, strategy_config, rolling_settings=None,
+                      rolling_strategy=None, option_contracts=None, snapshots=None):
     """
     Find suitable options to roll into.
     
     Args:
         client: Broker client
-        rollable_position: Dict with position details
+        rollable_position: RollCandidate for the position
         strategy_config: Strategy configuration object
+        rolling_settings: Prefetched rolling settings (read from config if omitted)
+        rolling_strategy: Prefetched rolling strategy for the underlying
+            (read from config if omitted)
+        option_contracts: Prefetched put contracts for the underlying
+            (fetched from the client if omitted)
+        snapshots: Prefetched snapshots keyed by option symbol
+            (fetched from the client if omitted)
         
     Returns:
         List of potential roll target contracts sorted by score
     """
-    underlying = rollable_position['underlying']
-    current_strike = rollable_position['strike']
-    rolling_strategy = strategy_config.get_rolling_strategy_for_symbol(underlying)
-    rolling_settings = strategy_config.get_rolling_settings()
+    underlying = rollable_position.underlying
+    current_strike = rollable_position.strike
+    if rolling_strategy is None:
+        rolling_strategy = strategy_config.get_rolling_strategy_for_symbol(underlying)
+    if rolling_settings is None:
+        rolling_settings = strategy_config.get_rolling_settings()
     
     # Get available put options
-    option_contracts = client.get_options_contracts([underlying], 'put')
-    snapshots = client.get_option_snapshot([c.symbol for c in option_contracts])
+    if option_contracts is None:
+        option_contracts = client.get_options_contracts([underlying], 'put')
+    if snapshots is None:
+        snapshots = client.get_option_snapshot([c.symbol for c in option_contracts])
     
     # Convert to Contract objects with market data
     put_options = [
@@ -106,35 +153,34 @@ def find_roll_targets(client, rollable_position, strategy_config):
         if snapshots.get(contract.symbol, None)
     ]
     
-    # Filter based on rolling strategy
-    filtered_options = []
-    for option in put_options:
-        # Skip if not enough premium
-        if option.bid_price < rolling_settings.get("min_premium_to_roll", 0.05):
-            continue
-            
-        # Apply strategy-specific filters
-        if rolling_strategy == "forward":
-            # Roll forward: same or higher strike, later expiration
-            if option.strike >= current_strike and option.dte > rollable_position['days_to_expiry']:
-                filtered_options.append(option)
-        elif rolling_strategy == "down":
-            # Roll down: lower strike, any later expiration
-            if option.strike < current_strike and option.dte > rollable_position['days_to_expiry']:
-                filtered_options.append(option)
-        elif rolling_strategy == "both":
-            # Roll forward or down: any strike, later expiration
-            if option.dte > rollable_position['days_to_expiry']:
-                filtered_options.append(option)
+    # Pick the strategy's filter once, rather than branching per option
+    min_premium = rolling_settings.get("min_premium_to_roll", 0.05)
+    current_dte = rollable_position.days_to_expiry
+    if rolling_strategy == "forward":
+        # Roll forward: same or higher strike, later expiration
+        def keep(o):
+            return o.bid_price >= min_premium and o.strike >= current_strike and o.dte > current_dte
+    elif rolling_strategy == "down":
+        # Roll down: lower strike, any later expiration
+        def keep(o):
+            return o.bid_price >= min_premium and o.strike < current_strike and o.dte > current_dte
+    elif rolling_strategy == "both":
+        # Roll forward or down: any strike, later expiration
+        def keep(o):
+            return o.bid_price >= min_premium and o.dte > current_dte
+    else:
+        return []
+    
+    filtered_options = list(filter(keep, put_options))
     
     # Apply standard option filters
     filtered_options = filter_options(filtered_options)
     
     if filtered_options:
-        # Score and sort options
-        scores = score_options(filtered_options)
-        sorted_options = sorted(zip(filtered_options, scores), key=lambda x: x[1], reverse=True)
-        return [opt for opt, score in sorted_options]
+        # Score and sort options, best first (ties keep their original order)
+        scores = np.asarray(score_options(filtered_options))
+        order = np.argsort(-scores, kind='stable')
+        return [filtered_options[i] for i in order]
     
     return []
 
@@ -144,7 +190,7 @@ def execute_roll(client, rollable_position, target_contract, db=None, strat_logg
     
     Args:
         client: Broker client
-        rollable_position: Dict with current position details
+        rollable_position: RollCandidate for the current position
         target_contract: Contract object to roll into
         db: Database object for tracking
         strat_logger: Strategy logger
@@ -153,8 +199,8 @@ def execute_roll(client, rollable_position, target_contract, db=None, strat_logg
         True if roll was successful, False otherwise
     """
     try:
-        current_symbol = rollable_position['position'].symbol
-        quantity = rollable_position['quantity']
+        current_symbol = rollable_position.position.symbol
+        quantity = rollable_position.quantity
         
         logger.info(f"Rolling {current_symbol} to {target_contract.symbol}")
         
@@ -168,38 +214,37 @@ def execute_roll(client, rollable_position, target_contract, db=None, strat_logg
         
         # Track in database if available
         if db:
-            # Record the closing of the old position
-            db.add_trade(
-                symbol=rollable_position['underlying'],
-                trade_type='buy_to_close',
-                quantity=quantity,
-                price=0,  # Market order, actual price unknown at submission
-                strike_price=rollable_position['strike'],
-                expiration_date=rollable_position['expiration'],
-                premium=0,
-                notes=f"Rolling position to {target_contract.symbol}"
-            )
-            
-            # Record the opening of the new position
-            db.add_premium(
-                symbol=rollable_position['underlying'],
-                option_type='P',
-                strike_price=target_contract.strike,
-                premium=target_contract.bid_price,
-                contracts=quantity,
-                expiration_date=target_contract.expiration,
-                notes=f"Rolled from {current_symbol}, Delta: {target_contract.delta:.3f}, DTE: {target_contract.dte}"
-            )
-            
-            db.add_trade(
-                symbol=rollable_position['underlying'],
-                trade_type='sell_put',
-                quantity=quantity,
-                price=target_contract.bid_price,
-                strike_price=target_contract.strike,
-                expiration_date=target_contract.expiration,
-                premium=target_contract.bid_price,
-                notes=f"Rolled from {current_symbol}"
+            # Record the close, the new premium and the open together
+            db.add_roll(
+                close_trade=dict(
+                    symbol=rollable_position.underlying,
+                    trade_type='buy_to_close',
+                    quantity=quantity,
+                    price=0,  # Market order, actual price unknown at submission
+                    strike_price=rollable_position.strike,
+                    expiration_date=rollable_position.expiration,
+                    premium=0,
+                    notes=f"Rolling position to {target_contract.symbol}"
+                ),
+                premium=dict(
+                    symbol=rollable_position.underlying,
+                    option_type='P',
+                    strike_price=target_contract.strike,
+                    premium=target_contract.bid_price,
+                    contracts=quantity,
+                    expiration_date=target_contract.expiration,
+                    notes=f"Rolled from {current_symbol}, Delta: {target_contract.delta:.3f}, DTE: {target_contract.dte}"
+                ),
+                open_trade=dict(
+                    symbol=rollable_position.underlying,
+                    trade_type='sell_put',
+                    quantity=quantity,
+                    price=target_contract.bid_price,
+                    strike_price=target_contract.strike,
+                    expiration_date=target_contract.expiration,
+                    premium=target_contract.bid_price,
+                    notes=f"Rolled from {current_symbol}"
+                )
             )
         
         # Log to strategy logger if available
@@ -207,10 +252,10 @@ def execute_roll(client, rollable_position, target_contract, db=None, strat_logg
             strat_logger.log_roll({
                 'from_symbol': current_symbol,
                 'to_symbol': target_contract.symbol,
-                'underlying': rollable_position['underlying'],
-                'from_strike': rollable_position['strike'],
+                'underlying': rollable_position.underlying,
+                'from_strike': rollable_position.strike,
                 'to_strike': target_contract.strike,
-                'from_expiration': str(rollable_position['expiration']),
+                'from_expiration': str(rollable_position.expiration),
                 'to_expiration': str(target_contract.expiration),
                 'new_premium': target_contract.bid_price,
                 'quantity': quantity
@@ -223,6 +268,45 @@ def execute_roll(client, rollable_position, target_contract, db=None, strat_logg
         logger.error(f"Failed to roll position: {e}")
         return False
 
+def fetch_roll_chains(client, underlyings):
+    """
+    Fetch put contracts and snapshots for the underlyings being rolled.
+    
+    Tries one batched request first; if it fails, falls back to fetching each
+    underlying on its own so one bad chain does not block the other rolls.
+    
+    Args:
+        client: Broker client
+        underlyings: Underlying symbols with rollable positions
+        
+    Returns:
+        Tuple of (contracts keyed by underlying, snapshots keyed by option symbol).
+        Underlyings whose chain could not be fetched are left out.
+    """
+    try:
+        option_contracts = client.get_options_contracts(underlyings, 'put')
+        snapshots = client.get_option_snapshot([c.symbol for c in option_contracts])
+        contracts_by_underlying = {u: [] for u in underlyings}
+        for contract in option_contracts:
+            contracts_by_underlying.setdefault(contract.underlying_symbol, []).append(contract)
+        return contracts_by_underlying, snapshots
+    except Exception as e:
+        logger.error(f"Batched option chain fetch failed, fetching per underlying: {e}")
+    
+    contracts_by_underlying = {}
+    snapshots = {}
+    for underlying in underlyings:
+        try:
+            option_contracts = client.get_options_contracts([underlying], 'put')
+            snapshots.update(client.get_option_snapshot([c.symbol for c in option_contracts]))
+        except Exception as e:
+            logger.error(f"Error fetching option chain for {underlying}: {e}")
+            continue
+        contracts_by_underlying[underlying] = list(option_contracts)
+    
+    return contracts_by_underlying, snapshots
+
+
 def process_rolls(client, positions, strategy_config, db=None, strat_logger=None):
     """
     Main function to process all potential rolls.
@@ -242,21 +326,46 @@ def process_rolls(client, positions, strategy_config, db=None, strat_logger=None
     if not rolling_settings.get("enabled", False):
         return 0
     
+    # Look up per-symbol rolling config once for every optioned underlying
+    underlyings = {
+        parse_option_symbol(p.symbol)[0]
+        for p in positions if p.asset_class == AssetClass.US_OPTION
+    }
+    rolling_enabled = {u: strategy_config.is_rolling_enabled_for_symbol(u) for u in underlyings}
+    rolling_strategies = {
+        u: strategy_config.get_rolling_strategy_for_symbol(u)
+        for u, enabled in rolling_enabled.items() if enabled
+    }
+    
     # Identify positions to roll
-    rollable_positions = identify_rollable_positions(positions, strategy_config)
+    rollable_positions = identify_rollable_positions(
+        positions, strategy_config, rolling_settings, rolling_enabled
+    )
     
     if not rollable_positions:
         logger.info("No positions identified for rolling")
         return 0
     
+    # Fetch put contracts and their snapshots for all underlyings at once
+    roll_underlyings = list(dict.fromkeys(r.underlying for r in rollable_positions))
+    contracts_by_underlying, snapshots = fetch_roll_chains(client, roll_underlyings)
+    
     successful_rolls = 0
     
     for rollable in rollable_positions:
         # Find potential roll targets
-        targets = find_roll_targets(client, rollable, strategy_config)
+        underlying = rollable.underlying
+        if underlying not in contracts_by_underlying:
+            logger.warning(f"Skipping roll of {rollable.position.symbol}: no option chain for {underlying}")
+            continue
+        targets = find_roll_targets(
+            client, rollable, strategy_config, rolling_settings,
+            rolling_strategies.get(underlying),
+            contracts_by_underlying.get(underlying, []), snapshots
+        )
         
         if not targets:
-            logger.info(f"No suitable roll targets found for {rollable['position'].symbol}")
+            logger.info(f"No suitable roll targets found for {rollable.position.symbol}")
             continue
         
         # Use the highest scored target
@@ -267,7 +376,7 @@ def process_rolls(client, positions, strategy_config, db=None, strat_logger=None
         if execute_roll(client, rollable, target, db, strat_logger):
             successful_rolls += 1
         else:
-            logger.warning(f"Failed to roll {rollable['position'].symbol}")
+            logger.warning(f"Failed to roll {rollable.position.symbol}")
     
     if successful_rolls > 0:
         logger.info(f"Successfully rolled {successful_rolls} position(s)")
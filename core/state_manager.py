@@ -1,7 +1,39 @@
 from .utils import parse_option_symbol
 from .premium_tracker import PremiumTracker
 from alpaca.trading.enums import AssetClass
-from collections import defaultdict
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Mapping, Optional
+import numpy as np
+import sys
+
+# Bound once so the per-position checks are identity tests
+_EQ = AssetClass.US_EQUITY
+_OPT = AssetClass.US_OPTION
+
+# Slots of the [puts, calls, shares] rows counted per underlying
+_PUTS, _CALLS, _SHARES = 0, 1, 2
+_NO_COUNTS = {'puts': 0, 'calls': 0, 'shares': 0}
+
+# dataclass(slots=True) needs Python 3.10; older versions fall back to a __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
+class WheelRow:
+    """Where one underlying is in the wheel. Immutable, so published states can be shared between threads."""
+    type: str  # 'short_put', 'long_shares' or 'short_call'
+    price: Optional[float] = None  # Original entry price of the shares
+    adjusted_price: Optional[float] = None  # Premium-adjusted price
+    qty: Optional[int] = None
+    position_counts: Optional[Mapping[str, int]] = None
+
+    def to_dict(self):
+        d = {f.name: getattr(self, f.name) for f in fields(self)}
+        if self.position_counts is not None:
+            d['position_counts'] = dict(self.position_counts)
+        return d
+
 
 class WheelStateManager:
     """Manager for tracking wheel strategy state"""
@@ -20,105 +52,148 @@ class WheelStateManager:
 
 def calculate_risk(positions):
     """Calculate total risk from all positions"""
-    risk = 0
+    # Per-share exposure and size of each leg, reduced in one dot product
+    exposure = []
+    size = []
     for p in positions:
-        if p.asset_class == AssetClass.US_EQUITY:
-            risk += float(p.avg_entry_price) * abs(int(p.qty))
-        elif p.asset_class == AssetClass.US_OPTION:
+        asset_class = p.asset_class
+        if asset_class is _EQ:
+            exposure.append(float(p.avg_entry_price))
+        elif asset_class is _OPT:
             _, option_type, strike_price = parse_option_symbol(p.symbol)
-            if option_type == 'P':
-                risk += 100 * strike_price * abs(int(p.qty))
+            if option_type != 'P':
+                continue
+            exposure.append(100 * strike_price)
+        else:
+            continue
+        size.append(int(p.qty))
+
+    if not size:
+        return 0
+    return float(np.dot(exposure, np.abs(size)))
+
+def _counts_row(counts, underlying):
+    """Get the [puts, calls, shares] row for an underlying, adding an empty one if needed"""
+    row = counts.get(underlying)
+    if row is None:
+        row = counts[underlying] = [0, 0, 0]
+    return row
 
-    return risk
+def _counts_dict(row):
+    """Materialize a [puts, calls, shares] row in the position_counts shape"""
+    return {'puts': row[_PUTS], 'calls': row[_CALLS], 'shares': row[_SHARES]}
 
 def count_positions_by_symbol(positions):
     """Count the number of positions (puts, calls, shares) for each underlying symbol"""
-    position_counts = defaultdict(lambda: {'puts': 0, 'calls': 0, 'shares': 0})
+    counts = {}
     
     for p in positions:
-        if p.asset_class == AssetClass.US_EQUITY:
-            underlying = p.symbol
-            position_counts[underlying]['shares'] += abs(int(p.qty)) // 100  # Count in lots of 100
-        elif p.asset_class == AssetClass.US_OPTION:
+        asset_class = p.asset_class
+        if asset_class is _EQ:
+            _counts_row(counts, p.symbol)[_SHARES] += abs(int(p.qty)) // 100  # Count in lots of 100
+        elif asset_class is _OPT:
             underlying, option_type, _ = parse_option_symbol(p.symbol)
             if option_type == 'P':
-                position_counts[underlying]['puts'] += abs(int(p.qty))
+                _counts_row(counts, underlying)[_PUTS] += abs(int(p.qty))
             elif option_type == 'C':
-                position_counts[underlying]['calls'] += abs(int(p.qty))
+                _counts_row(counts, underlying)[_CALLS] += abs(int(p.qty))
     
-    return dict(position_counts)
+    return {underlying: _counts_dict(row) for underlying, row in counts.items()}
 
 def update_state(all_positions, premium_tracker=None):    
     """
-    Given the current positions, return a state dictionary describing where in the wheel each symbol is.
+    Given the current positions, return a state dictionary mapping each symbol to a WheelRow describing where in the wheel it is.
     Now supports multiple positions per symbol for averaging down.
     Includes premium-adjusted cost basis for better covered call strikes.
     """
+    return derive_state(all_positions, premium_tracker)[0]
 
-    state = {}
+def derive_state(all_positions, premium_tracker=None):
+    """
+    Build the wheel state, position counts and risk in a single pass over the positions.
+    
+    Returns:
+        (state, position_counts, risk) as update_state, count_positions_by_symbol
+        and calculate_risk would return them
+    """
+    # Wheel type per underlying, and the share details of those holding stock;
+    # the WheelRows are built once both are final
+    types = {}
+    shares = {}
+    # Position counts and risk legs are gathered in the same pass
+    position_counts = {}
+    exposure = []
+    size = []
 
     for p in all_positions:
-        if p.asset_class == AssetClass.US_EQUITY:
-            if int(p.qty) <= 0:
+        asset_class = p.asset_class
+        qty = int(p.qty)
+        if asset_class is _EQ:
+            if qty <= 0:
                 raise ValueError(f"Only long stock positions allowed! Got {p.symbol} with qty {p.qty}")
 
             underlying = p.symbol
-            if underlying in state:
-                if state[underlying]["type"] != "short_call_awaiting_stock":
-                    raise ValueError(f"Unexpected state for {underlying}: {state[underlying]}")
-                state[underlying]["type"] = "short_call"
+            avg_price = float(p.avg_entry_price)
+            _counts_row(position_counts, underlying)[_SHARES] += qty // 100  # Count in lots of 100
+            exposure.append(avg_price)
+            size.append(qty)
+            if underlying in types:
+                if types[underlying] != "short_call_awaiting_stock":
+                    raise ValueError(f"Unexpected state for {underlying}: {types[underlying]}")
+                types[underlying] = "short_call"
             else:
-                avg_price = float(p.avg_entry_price)
-                qty = int(p.qty)
-                
                 # Calculate adjusted cost basis if premium tracker is available
                 if premium_tracker:
                     adjusted_price = premium_tracker.get_adjusted_cost_basis(underlying, avg_price, qty)
                 else:
                     adjusted_price = avg_price
                 
-                state[underlying] = {
-                    "type": "long_shares", 
-                    "price": avg_price,  # Original entry price
-                    "adjusted_price": adjusted_price,  # Premium-adjusted price
-                    "qty": qty
-                }
-
-        elif p.asset_class == AssetClass.US_OPTION:
-            if int(p.qty) >= 0:
+                types[underlying] = "long_shares"
+                shares[underlying] = (avg_price, adjusted_price, qty)
+
+        elif asset_class is _OPT:
+            if qty >= 0:
                 raise ValueError(f"Only short option positions allowed! Got {p.symbol} with qty {p.qty}")
 
-            underlying, option_type, _ = parse_option_symbol(p.symbol)
+            contracts = -qty  # Short positions carry a negative qty
+            underlying, option_type, strike_price = parse_option_symbol(p.symbol)
+            if option_type == 'P':
+                _counts_row(position_counts, underlying)[_PUTS] += contracts
+                exposure.append(100 * strike_price)
+                size.append(contracts)
+            elif option_type == 'C':
+                _counts_row(position_counts, underlying)[_CALLS] += contracts
 
-            if underlying in state:
+            if underlying in types:
                 # Handle multiple puts (allowed for averaging down with max_wheel_layers)
-                if state[underlying]["type"] == "short_put" and option_type == 'P':
+                if types[underlying] == "short_put" and option_type == 'P':
                     # Multiple puts are allowed - keep the short_put state
                     pass
-                elif state[underlying]["type"] == "long_shares" and option_type == 'C':
+                elif types[underlying] == "long_shares" and option_type == 'C':
                     # Shares + covered call = short_call state
-                    state[underlying]["type"] = "short_call"
+                    types[underlying] = "short_call"
                 else:
-                    raise ValueError(f"Unexpected state for {underlying}: {state[underlying]} with option {option_type}")
+                    raise ValueError(f"Unexpected state for {underlying}: {types[underlying]} with option {option_type}")
             else:
                 if option_type == "C":
-                    state[underlying] = {"type": "short_call_awaiting_stock", "price": None}
+                    types[underlying] = "short_call_awaiting_stock"
                 elif option_type == "P":
-                    state[underlying] = {"type": "short_put", "price": None}
+                    types[underlying] = "short_put"
                 else:
                     raise ValueError(f"Unknown option type: {option_type}")
 
-    # Final validation and add position counts
-    position_counts = count_positions_by_symbol(all_positions)
-    
-    for underlying, st in state.items():
-        if st["type"] not in {"short_put", "long_shares", "short_call"}:
-            raise ValueError(f"Invalid final state for {underlying}: {st}")
-        
-        # Add position counts to state
-        if underlying in position_counts:
-            st["position_counts"] = position_counts[underlying]
-        else:
-            st["position_counts"] = {'puts': 0, 'calls': 0, 'shares': 0}
+    counts = {underlying: _counts_dict(row) for underlying, row in position_counts.items()}
+
+    # Final validation, then build each row with its position counts
+    state = {}
+    for underlying, wheel_type in types.items():
+        if wheel_type not in {"short_put", "long_shares", "short_call"}:
+            raise ValueError(f"Invalid final state for {underlying}: {wheel_type}")
         
-    return state
\ No newline at end of file
+        price, adjusted_price, qty = shares.get(underlying, (None, None, None))
+        # Read-only copy, so the row can't be changed through the returned position_counts
+        row_counts = MappingProxyType(dict(counts.get(underlying, _NO_COUNTS)))
+        state[underlying] = WheelRow(wheel_type, price, adjusted_price, qty, row_counts)
+    
+    risk = float(np.dot(exposure, size)) if size else 0
+    return state, counts, risk
\ No newline at end of file
@@ -1,3 +1,7 @@
+import heapq
+from operator import itemgetter
+
+import numpy as np
 from config.config_loader import StrategyConfig
 
 # Load configuration
@@ -17,33 +21,87 @@ def filter_underlying(client, symbols, buying_power_limit):
     """
     resp = client.get_stock_latest_trade(symbols)
 
-    filtered_symbols = [symbol for symbol in resp if 100*resp[symbol].price <= buying_power_limit]
+    # One pass over the quotes, then a single vector comparison
+    items = list(resp.items())
+    prices = np.fromiter((trade.price for _, trade in items), dtype=np.float64, count=len(items))
+    affordable = np.flatnonzero(100 * prices <= buying_power_limit)
+
+    filtered_symbols = [items[i][0] for i in affordable]
 
     return filtered_symbols
 
+def _column(options, attr):
+    """Gather one numeric attribute of every option into a float array, with None as NaN"""
+    values = (getattr(option, attr) for option in options)
+    return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(options))
+
+def _filter_mask(delta, bid, strike, dte, oi, min_strike):
+    """Boolean mask of the options that pass the delta, yield, open interest and strike filters"""
+    abs_delta = np.abs(delta)
+    
+    # Comparisons against NaN are False, so missing values never pass.
+    # The cheap column checks run first so the yield is only computed for survivors
+    mask = delta != 0
+    mask &= abs_delta > DELTA_MIN
+    mask &= abs_delta < DELTA_MAX
+    mask &= oi != 0
+    mask &= oi > OPEN_INTEREST_MIN
+    mask &= strike >= min_strike
+    
+    survivors = np.flatnonzero(mask)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annual_yield = (bid[survivors] / strike[survivors]) * (365 / (dte[survivors] + 1))
+    mask[survivors] = (annual_yield > YIELD_MIN) & (annual_yield < YIELD_MAX)
+    return mask
+
+def _scores(delta, bid, strike, dte):
+    """Annualized return discounted by the probability of assignment"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (1 - np.abs(delta)) * (250 / (dte + 5)) * (bid / strike)
+
 def filter_options(options, min_strike = 0):
     """
     Filter put options based on delta and open interest.
     """
-    filtered_contracts = [contract for contract in options 
-                          if contract.delta 
-                          and abs(contract.delta) > DELTA_MIN 
-                          and abs(contract.delta) < DELTA_MAX
-                          and (contract.bid_price / contract.strike) * (365 / (contract.dte + 1)) > YIELD_MIN
-                          and (contract.bid_price / contract.strike) * (365 / (contract.dte + 1)) < YIELD_MAX
-                          and contract.oi 
-                          and contract.oi > OPEN_INTEREST_MIN
-                          and contract.strike >= min_strike]
+    if not options:
+        return []
     
-    return filtered_contracts
+    mask = _filter_mask(
+        _column(options, 'delta'), _column(options, 'bid_price'), _column(options, 'strike'),
+        _column(options, 'dte'), _column(options, 'oi'), min_strike
+    )
+    return [options[i] for i in np.flatnonzero(mask)]
 
 def score_options(options):
     """
     Score options based on delta, days to expiration, and bid price.  
     The score is the annualized rate of return on selling the contract, discounted by the probability of assignment.
     """
-    scores = [(1 - abs(p.delta)) * (250 / (p.dte + 5)) * (p.bid_price / p.strike) for p in options]
-    return scores
+    return _scores(
+        _column(options, 'delta'), _column(options, 'bid_price'),
+        _column(options, 'strike'), _column(options, 'dte')
+    )
+
+def filter_and_score_options(options, min_strike = 0):
+    """
+    Filter and score options in one pass over the same columns.
+    
+    Returns:
+        (options, scores) for the options that pass filter_options and
+        score above SCORE_MIN, ready for select_options
+    """
+    if not options:
+        return [], np.empty(0)
+    
+    delta = _column(options, 'delta')
+    bid = _column(options, 'bid_price')
+    strike = _column(options, 'strike')
+    dte = _column(options, 'dte')
+    
+    scores = _scores(delta, bid, strike, dte)
+    mask = _filter_mask(delta, bid, strike, dte, _column(options, 'oi'), min_strike) & (scores > SCORE_MIN)
+    keep = np.flatnonzero(mask)
+    return [options[i] for i in keep], scores[keep]
 
 def select_options(options, scores, n=None, max_per_symbol=1, position_counts=None):
     """
@@ -56,44 +114,40 @@ def select_options(options, scores, n=None, max_per_symbol=1, position_counts=No
         max_per_symbol: Maximum positions allowed per symbol
         position_counts: Dict of current position counts by symbol
     """
-    # Filter out low scores
-    filtered = [(option, score) for option, score in zip(options, scores) if score > SCORE_MIN]
-
-    # Group options by underlying and sort by score
+    # Group options by underlying, skipping low scores
     options_by_underlying = {}
-    for option, score in filtered:
+    for option, score in zip(options, scores):
+        if not score > SCORE_MIN:
+            continue
         underlying = option.underlying
         if underlying not in options_by_underlying:
             options_by_underlying[underlying] = []
         options_by_underlying[underlying].append((option, score))
     
-    # Sort options within each underlying by score
-    for underlying in options_by_underlying:
-        options_by_underlying[underlying].sort(key=lambda x: x[1], reverse=True)
-    
     # Select options respecting max_per_symbol limit
     selected_options = []
     if position_counts is None:
         position_counts = {}
     
-    # Sort underlyings by their best option's score
-    sorted_underlyings = sorted(
-        options_by_underlying.keys(),
-        key=lambda u: options_by_underlying[u][0][1],
-        reverse=True
-    )
-    
-    for underlying in sorted_underlyings:
+    # Keep only the best few options per underlying rather than sorting them all;
+    # the heap is ordered by each underlying's best score, ties by first appearance
+    picks_by_underlying = {}
+    heap = []
+    for index, (underlying, candidates) in enumerate(options_by_underlying.items()):
         current_positions = position_counts.get(underlying, {}).get('puts', 0)
-        positions_to_add = min(
-            max_per_symbol - current_positions,
-            len(options_by_underlying[underlying])
-        )
+        slots = max_per_symbol - current_positions
+        top = heapq.nlargest(max(slots, 1), candidates, key=itemgetter(1))
+        picks_by_underlying[underlying] = top[:max(slots, 0)]
+        heap.append((-top[0][1], index, underlying))
+    heapq.heapify(heap)
+    
+    while heap:
+        _, _, underlying = heapq.heappop(heap)
         
-        for i in range(positions_to_add):
+        for option, _ in picks_by_underlying[underlying]:
             if n and len(selected_options) >= n:
                 break
-            selected_options.append(options_by_underlying[underlying][i][0])
+            selected_options.append(option)
         
         if n and len(selected_options) >= n:
             break
@@ -1,15 +1,39 @@
 """
 Thread-safe state management for the wheel strategy.
 """
+import math
 import threading
-from typing import Dict, Any, Optional
-from contextlib import contextmanager
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Tuple, Union
 import logging
-from .state_manager import update_state as _update_state, calculate_risk as _calculate_risk
-from .state_manager import count_positions_by_symbol as _count_positions_by_symbol
+from .state_manager import update_state as _update_state, calculate_risk as _calculate_risk, derive_state as _derive_state
+from .state_manager import count_positions_by_symbol as _count_positions_by_symbol, WheelRow
 
 logger = logging.getLogger(f"strategy.{__name__}")
 
+_NO_POSITIONS = MappingProxyType({'puts': 0, 'calls': 0, 'shares': 0})
+
+def _layers_in_use(position_counts):
+    """
+    Wheel layers each symbol with puts or shares already occupies.
+    
+    Shares count as one layer on top of the open puts. Puts without shares
+    are still waiting for assignment, so they block new layers entirely.
+    """
+    return {
+        symbol: counts['puts'] + 1 if counts['shares'] > 0 else math.inf
+        for symbol, counts in position_counts.items()
+        if counts['puts'] > 0 or counts['shares'] > 0
+    }
+
+def _copy_counts(position_counts):
+    """Copy position counts down to the per-symbol dicts, so callers can't change the cached ones"""
+    return {symbol: counts.copy() for symbol, counts in position_counts.items()}
+
+def _positions_key(positions):
+    """Snapshot of the fields the state is derived from, to spot unchanged positions between ticks"""
+    return tuple((p.symbol, p.qty, p.avg_entry_price) for p in positions)
+
 class ThreadSafeStateManager:
     """
     Thread-safe wrapper for state management operations.
@@ -17,23 +41,17 @@ class ThreadSafeStateManager:
     """
     
     def __init__(self):
-        self._lock = threading.RLock()  # Reentrant lock for nested calls
-        self._state: Dict[str, Any] = {}
+        self._lock = threading.Lock()  # Methods never call each other while holding it
+        self._state: Dict[str, WheelRow] = {}
         self._position_counts: Dict[str, Dict[str, int]] = {}
+        self._layers_in_use: Dict[str, float] = {}  # See _layers_in_use
         self._current_risk: float = 0.0
+        # Positions each cached result was computed from, None when there is none
+        self._state_key = None
+        self._counts_key = None
+        self._risk_key = None
         
-    @contextmanager
-    def _acquire_lock(self, operation_name: str):
-        """Context manager for acquiring lock with logging."""
-        logger.debug(f"Acquiring lock for {operation_name}")
-        self._lock.acquire()
-        try:
-            yield
-        finally:
-            self._lock.release()
-            logger.debug(f"Released lock for {operation_name}")
-    
-    def update_state(self, positions, premium_tracker=None) -> Dict[str, Any]:
+    def update_state(self, positions, premium_tracker=None) -> Dict[str, WheelRow]:
         """
         Thread-safe state update.
         
@@ -44,13 +62,21 @@ class ThreadSafeStateManager:
         Returns:
             Updated state dictionary
         """
-        with self._acquire_lock("update_state"):
-            try:
-                self._state = _update_state(positions, premium_tracker)
-                return self._state.copy()  # Return a copy to prevent external modification
-            except Exception as e:
-                logger.error(f"Error updating state: {str(e)}")
-                raise
+        # Premium-adjusted prices can change without the positions changing
+        key = _positions_key(positions) if premium_tracker is None else None
+        with self._lock:
+            if key is not None and key == self._state_key:
+                return self._state.copy()
+        
+        # Built outside the lock; readers keep seeing the old state until the swap
+        new_state = _update_state(positions, premium_tracker)
+        
+        with self._lock:
+            self._state = new_state
+            self._state_key = key
+        # A plain dict for callers that serialize it; the manager never mutates
+        # a published state, only replaces it
+        return new_state.copy()
     
     def calculate_risk(self, positions) -> float:
         """
@@ -62,13 +88,17 @@ class ThreadSafeStateManager:
         Returns:
             Total risk amount
         """
-        with self._acquire_lock("calculate_risk"):
-            try:
-                self._current_risk = _calculate_risk(positions)
+        key = _positions_key(positions)
+        with self._lock:
+            if key == self._risk_key:
                 return self._current_risk
-            except Exception as e:
-                logger.error(f"Error calculating risk: {str(e)}")
-                raise
+        
+        risk = _calculate_risk(positions)
+        
+        with self._lock:
+            self._current_risk = risk
+            self._risk_key = key
+        return risk
     
     def count_positions_by_symbol(self, positions) -> Dict[str, Dict[str, int]]:
         """
@@ -80,15 +110,52 @@ class ThreadSafeStateManager:
         Returns:
             Dictionary of position counts by symbol
         """
-        with self._acquire_lock("count_positions"):
-            try:
-                self._position_counts = _count_positions_by_symbol(positions)
-                return self._position_counts.copy()  # Return a copy
-            except Exception as e:
-                logger.error(f"Error counting positions: {str(e)}")
-                raise
+        key = _positions_key(positions)
+        with self._lock:
+            if key == self._counts_key:
+                return _copy_counts(self._position_counts)
+        
+        position_counts = _count_positions_by_symbol(positions)
+        layers_in_use = _layers_in_use(position_counts)
+        
+        with self._lock:
+            self._position_counts = position_counts
+            self._layers_in_use = layers_in_use
+            self._counts_key = key
+        return _copy_counts(position_counts)
+    
+    def refresh(self, positions, premium_tracker=None) -> Tuple[float, Dict[str, Dict[str, int]], Dict[str, WheelRow]]:
+        """
+        Thread-safe risk, position count and state update from one pass over the positions.
+        
+        Args:
+            positions: List of current positions
+            premium_tracker: Optional premium tracker for cost basis
+            
+        Returns:
+            (risk, position_counts, states) as calculate_risk, count_positions_by_symbol
+            and update_state return them
+        """
+        key = _positions_key(positions)
+        state_key = key if premium_tracker is None else None
+        with self._lock:
+            if state_key is not None and state_key == self._state_key == self._counts_key == self._risk_key:
+                return self._current_risk, _copy_counts(self._position_counts), self._state.copy()
+        
+        new_state, position_counts, risk = _derive_state(positions, premium_tracker)
+        layers_in_use = _layers_in_use(position_counts)
+        
+        with self._lock:
+            self._state = new_state
+            self._position_counts = position_counts
+            self._layers_in_use = layers_in_use
+            self._current_risk = risk
+            self._state_key = state_key
+            self._counts_key = key
+            self._risk_key = key
+        return risk, _copy_counts(position_counts), new_state.copy()
     
-    def get_state(self, symbol: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    def get_state(self, symbol: Optional[str] = None) -> Union[Mapping[str, WheelRow], WheelRow, None]:
         """
         Get current state for a symbol or all symbols.
         
@@ -96,14 +163,14 @@ class ThreadSafeStateManager:
             symbol: Optional symbol to get state for
             
         Returns:
-            State dictionary or None if not found
+            The symbol's WheelRow (None if not found), or a read-only view of all states
         """
-        with self._acquire_lock("get_state"):
+        with self._lock:
             if symbol:
-                return self._state.get(symbol, {}).copy()
-            return self._state.copy()
+                return self._state.get(symbol)
+            return MappingProxyType(self._state)
     
-    def get_position_count(self, symbol: str) -> Dict[str, int]:
+    def get_position_count(self, symbol: str) -> Mapping[str, int]:
         """
         Get position counts for a specific symbol.
         
@@ -111,10 +178,10 @@ class ThreadSafeStateManager:
             symbol: Symbol to get counts for
             
         Returns:
-            Dictionary with puts, calls, and shares counts
+            Read-only mapping with puts, calls, and shares counts
         """
-        with self._acquire_lock("get_position_count"):
-            return self._position_counts.get(symbol, {'puts': 0, 'calls': 0, 'shares': 0}).copy()
+        with self._lock:
+            return MappingProxyType(self._position_counts.get(symbol, _NO_POSITIONS))
     
     def get_current_risk(self) -> float:
         """
@@ -123,7 +190,7 @@ class ThreadSafeStateManager:
         Returns:
             Current risk amount
         """
-        with self._acquire_lock("get_current_risk"):
+        with self._lock:
             return self._current_risk
     
     def is_position_allowed(self, symbol: str, max_layers: int) -> bool:
@@ -141,51 +208,30 @@ class ThreadSafeStateManager:
         Returns:
             True if position is allowed, False otherwise
         """
-        with self._acquire_lock("is_position_allowed"):
-            counts = self._position_counts.get(symbol, {'puts': 0, 'calls': 0, 'shares': 0})
-            put_count = counts.get('puts', 0)
-            share_lots = counts.get('shares', 0)
-            
-            # First layer: Allow if no positions exist
-            if put_count == 0 and share_lots == 0:
-                return True
-            
-            # Additional layers: Only allow if shares are held (from assignment)
-            # and total layers (including existing puts) is less than max
-            if share_lots > 0:
-                # Count active layers: existing puts + 1 (for the shares)
-                active_layers = put_count + 1
-                return active_layers < max_layers
-            
-            # If we have puts but no shares, don't allow more puts
-            # (waiting for assignment before allowing next layer)
-            return False
+        with self._lock:
+            # Symbols without puts or shares are free to open their first layer
+            return self._layers_in_use.get(symbol, -math.inf) < max_layers
     
     def reset(self):
         """Reset all state data."""
-        with self._acquire_lock("reset"):
+        with self._lock:
             self._state = {}
             self._position_counts = {}
+            self._layers_in_use = {}
             self._current_risk = 0.0
+            self._state_key = None
+            self._counts_key = None
+            self._risk_key = None
             logger.info("State manager reset")
 
-# Global singleton instance
-_state_manager_instance: Optional[ThreadSafeStateManager] = None
-_instance_lock = threading.Lock()
+# Global singleton instance, created at import so callers never race to construct it
+_state_manager_instance = ThreadSafeStateManager()
 
 def get_state_manager() -> ThreadSafeStateManager:
     """
-    Get or create the singleton state manager instance.
+    Get the singleton state manager instance.
     
     Returns:
         ThreadSafeStateManager instance
     """
-    global _state_manager_instance
-    
-    if _state_manager_instance is None:
-        with _instance_lock:
-            if _state_manager_instance is None:
-                _state_manager_instance = ThreadSafeStateManager()
-                logger.info("Created new ThreadSafeStateManager instance")
-    
-    return _state_manager_instance
\ No newline at end of file
+    return _state_manager_instance
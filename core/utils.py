@@ -1,7 +1,21 @@
-import re
 import pytz
-from datetime import datetime
+from functools import lru_cache
+from datetime import date, datetime
 
+# OCC option symbol: underlying, YYMMDD expiry, P/C, strike x 1000.
+# Everything after the underlying has a fixed width, so the fields are sliced from the end
+def _split_option_symbol(symbol):
+    """Split an OCC option symbol into its four fields"""
+    underlying = symbol[:-15]
+    expiry = symbol[-15:-9]
+    option_type = symbol[-9:-8]
+    strike_raw = symbol[-8:]
+    if not (symbol.isascii() and underlying.isalpha() and expiry.isdigit()
+            and option_type in ('P', 'C') and strike_raw.isdigit()):
+        raise ValueError(f"Invalid option symbol format: {symbol}")
+    return underlying, expiry, option_type, strike_raw
+
+@lru_cache(maxsize=4096)
 def parse_option_symbol(symbol):
     """
     Parses OCC-style option symbol.
@@ -9,16 +23,20 @@ def parse_option_symbol(symbol):
     Example:
         'AAPL250516P00207500' -> ('AAPL', 'P', 207.5)
     """
-    match = re.match(r'^([A-Za-z]+)(\d{6})([PC])(\d{8})$', symbol)
-    
-    if match:
-        underlying = match.group(1)
-        option_type = match.group(3)
-        strike_raw = match.group(4)
-        strike_price = int(strike_raw) / 1000.0
-        return underlying, option_type, strike_price
-    else:
-        raise ValueError(f"Invalid option symbol format: {symbol}")
+    underlying, _, option_type, strike_raw = _split_option_symbol(symbol)
+    strike_price = int(strike_raw) / 1000.0
+    return underlying, option_type, strike_price
+
+@lru_cache(maxsize=4096)
+def parse_option_expiration(symbol):
+    """
+    Parses the expiration date from an OCC-style option symbol.
+
+    Example:
+        'AAPL250516P00207500' -> date(2025, 5, 16)
+    """
+    _, expiry, _, _ = _split_option_symbol(symbol)
+    return date(2000 + int(expiry[:2]), int(expiry[2:4]), int(expiry[4:]))
 
 def get_ny_timestamp():
     ny_tz = pytz.timezone("America/New_York")
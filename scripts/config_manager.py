@@ -1,17 +1,66 @@
 #!/usr/bin/env python3
 """
 Interactive configuration manager for the wheel strategy.
+Run with "set KEY=VALUE ..." to change settings without prompting.
 """
+import argparse
+import json
 import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config.config_loader import StrategyConfig
-import json
+
+def parse_assignment(assignment: str):
+    """Split "a.b.c=value" into its key path and value; values are read as JSON, falling back to plain text"""
+    key, sep, raw = assignment.partition("=")
+    keys = key.strip().split(".")
+    if not sep or not all(keys):
+        raise ValueError(f"Expected KEY=VALUE, got {assignment!r}")
+    
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    return keys, value
+
+def apply_assignments(config, assignments):
+    """Apply dotted-key assignments to the in-memory config; the caller saves once afterwards"""
+    parsed = [parse_assignment(a) for a in assignments]
+    
+    for keys, value in parsed:
+        node = config.config
+        for key in keys[:-1]:
+            node = node.setdefault(key, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Cannot set {'.'.join(keys)}: {key} is not a section")
+        node[keys[-1]] = value
 
 def main():
+    parser = argparse.ArgumentParser(description='Manage wheel strategy configuration')
+    subparsers = parser.add_subparsers(dest='command')
+    set_parser = subparsers.add_parser('set', help='Change settings without prompting and save once')
+    set_parser.add_argument('assignments', nargs='+', metavar='KEY=VALUE',
+                            help='Dotted config key and JSON value, e.g. symbols.AAPL.contracts=2')
+    args = parser.parse_args()
+    
     config = StrategyConfig()
     
+    if args.command == 'set':
+        try:
+            apply_assignments(config, args.assignments)
+        except ValueError as e:
+            parser.error(str(e))
+        config.save()
+        print(f"✓ Saved {len(args.assignments)} setting(s)")
+        return
+    
+    interactive(config)
+
+def interactive(config):
+    """Menu-driven editing loop"""
+    unsaved = False  # Edits are kept in memory and written once, on save or exit
+    
     while True:
         print("\n=== Wheel Strategy Configuration ===")
         print(f"Balance Allocation: {config.get_balance_allocation():.0%}")
@@ -48,7 +97,8 @@ def main():
         print("5. Change Default Contracts")
         print("6. Configure Rolling Settings")
         print("7. View Full JSON Config")
-        print("0. Exit")
+        print("8. Save Changes" + (" (unsaved changes)" if unsaved else ""))
+        print("0. Save and Exit")
         
         choice = input("\nEnter choice: ").strip()
         
@@ -71,13 +121,15 @@ def main():
                     "strategy": roll_strategy
                 }
             
-            config.update_symbol(symbol, enabled=True, contracts=contracts)
+            config.update_symbol(symbol, enabled=True, contracts=contracts, save=False)
+            unsaved = True
             print(f"✓ Added/Updated {symbol} with {contracts} contract(s)")
             
         elif choice == "2":
             symbol = input("Enter symbol to remove: ").upper().strip()
             if symbol in config.config["symbols"]:
-                config.update_symbol(symbol, enabled=False)
+                config.update_symbol(symbol, enabled=False, save=False)
+                unsaved = True
                 print(f"✓ Disabled {symbol}")
             else:
                 print(f"Symbol {symbol} not found")
@@ -94,7 +146,7 @@ def main():
                     pct = float(pct) / 100
                     if 0 <= pct <= 1:
                         config.config["balance_settings"]["allocation_percentage"] = pct
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set allocation to {pct:.0%}")
                 except ValueError:
                     print("Invalid input")
@@ -104,7 +156,7 @@ def main():
                     layers = int(layers)
                     if 1 <= layers <= 5:
                         config.config["balance_settings"]["max_wheel_layers"] = layers
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set max wheel layers to {layers}")
                 except ValueError:
                     print("Invalid input")
@@ -124,7 +176,7 @@ def main():
                     if 0 < min_d < max_d < 1:
                         config.config["option_filters"]["delta_min"] = min_d
                         config.config["option_filters"]["delta_max"] = max_d
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set delta range to {min_d:.2f} - {max_d:.2f}")
                 except ValueError:
                     print("Invalid input")
@@ -136,7 +188,7 @@ def main():
                     if 0 <= min_dte < max_dte:
                         config.config["option_filters"]["expiration_min_days"] = min_dte
                         config.config["option_filters"]["expiration_max_days"] = max_dte
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set DTE range to {min_dte} - {max_dte} days")
                 except ValueError:
                     print("Invalid input")
@@ -146,7 +198,7 @@ def main():
                     oi = int(oi)
                     if oi >= 0:
                         config.config["option_filters"]["open_interest_min"] = oi
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set minimum OI to {oi}")
                 except ValueError:
                     print("Invalid input")
@@ -157,7 +209,7 @@ def main():
                 contracts = int(contracts)
                 if contracts > 0:
                     config.config["default_contracts"] = contracts
-                    config.save()
+                    unsaved = True
                     print(f"✓ Set default contracts to {contracts}")
                 else:
                     print("Must be positive")
@@ -175,7 +227,7 @@ def main():
             if sub_choice == "1":
                 current = config.config.get("rolling_settings", {}).get("enabled", False)
                 config.config.setdefault("rolling_settings", {})["enabled"] = not current
-                config.save()
+                unsaved = True
                 print(f"✓ Global rolling {'enabled' if not current else 'disabled'}")
             
             elif sub_choice == "2":
@@ -184,7 +236,7 @@ def main():
                     days = int(days)
                     if 1 <= days <= 7:
                         config.config.setdefault("rolling_settings", {})["days_before_expiry"] = days
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set days before expiry to {days}")
                 except ValueError:
                     print("Invalid input")
@@ -195,7 +247,7 @@ def main():
                     premium = float(premium)
                     if premium >= 0:
                         config.config.setdefault("rolling_settings", {})["min_premium_to_roll"] = premium
-                        config.save()
+                        unsaved = True
                         print(f"✓ Set minimum premium to ${premium:.2f}")
                 except ValueError:
                     print("Invalid input")
@@ -210,24 +262,34 @@ def main():
                             config.config["symbols"][symbol].setdefault("rolling", {})
                             config.config["symbols"][symbol]["rolling"]["enabled"] = True
                             config.config["symbols"][symbol]["rolling"]["strategy"] = strategy
-                            config.save()
+                            unsaved = True
                             print(f"✓ Enabled {strategy} rolling for {symbol}")
                     else:
                         if "rolling" in config.config["symbols"][symbol]:
                             config.config["symbols"][symbol]["rolling"]["enabled"] = False
-                            config.save()
+                            unsaved = True
                             print(f"✓ Disabled rolling for {symbol}")
                 else:
                     print(f"Symbol {symbol} not found")
         
         elif choice == "7":
-            print("\n" + json.dumps(config.config, indent=2))
+            print("\n" + config.to_json())
             input("\nPress Enter to continue...")
             
+        elif choice == "8":
+            if unsaved:
+                config.save()
+                unsaved = False
+            print("✓ Configuration saved")
+            
         elif choice == "0":
+            if unsaved:
+                config.save()
+                print("✓ Configuration saved")
             break
         
-        config.reload()
+        if not unsaved:
+            config.reload_if_changed()  # Pick up edits made outside this session
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
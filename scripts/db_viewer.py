@@ -8,12 +8,12 @@ from pathlib import Path
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from core.database import WheelDatabase
 from datetime import datetime
-from tabulate import tabulate
 
 def view_cost_basis(db, symbol=None):
     """View cost basis information"""
+    from tabulate import tabulate
+    
     print("\n=== COST BASIS ===")
     
     if symbol:
@@ -30,48 +30,56 @@ def view_cost_basis(db, symbol=None):
     else:
         with db.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM cost_basis ORDER BY symbol")
+            # Reduction is computed by SQLite during the scan
+            cursor.execute("""
+                SELECT symbol, shares_owned, avg_cost_per_share, total_premiums_collected,
+                       adjusted_cost_per_share,
+                       COALESCE((avg_cost_per_share - adjusted_cost_per_share) * 100.0
+                                / NULLIF(avg_cost_per_share, 0), 0) as reduction_pct
+                FROM cost_basis ORDER BY symbol
+            """)
             rows = cursor.fetchall()
             
             if rows:
                 headers = ["Symbol", "Shares", "Avg Cost", "Premiums", "Adjusted Cost", "Reduction %"]
-                table_data = []
-                for row in rows:
-                    reduction_pct = ((row['avg_cost_per_share'] - row['adjusted_cost_per_share']) / row['avg_cost_per_share'] * 100)
-                    table_data.append([
-                        row['symbol'],
-                        row['shares_owned'],
-                        f"${row['avg_cost_per_share']:.2f}",
-                        f"${row['total_premiums_collected']:.2f}",
-                        f"${row['adjusted_cost_per_share']:.2f}",
-                        f"{reduction_pct:.1f}%"
-                    ])
-                print(tabulate(table_data, headers=headers, tablefmt="grid"))
+                table_data = [
+                    [symbol, shares, f"${avg_cost:.2f}", f"${premiums:.2f}", f"${adjusted:.2f}", f"{reduction_pct:.1f}%"]
+                    for symbol, shares, avg_cost, premiums, adjusted, reduction_pct in rows
+                ]
+                print(tabulate(table_data, headers=headers, tablefmt="simple"))
             else:
                 print("No cost basis data found")
 
-def view_positions(db, symbol=None, status='open'):
-    """View positions"""
-    print(f"\n=== POSITIONS ({status.upper()}) ===")
+def view_positions(db, symbol=None, statuses=('open',)):
+    """View positions, one table per status from a single query"""
+    from tabulate import tabulate
     
-    positions = db.get_position_history(symbol=symbol, status=status)
+    positions = db.get_position_history(symbol=symbol, status=statuses)
     
-    if positions:
-        headers = ["ID", "Symbol", "Type", "Qty", "Entry Price", "Entry Date", "Status"]
-        table_data = []
-        for pos in positions:
-            table_data.append([
-                pos['id'],
-                pos['symbol'],
-                pos['position_type'],
-                pos['quantity'],
-                f"${pos['entry_price']:.2f}",
-                pos['entry_date'][:10] if pos['entry_date'] else '',
-                pos['status']
-            ])
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
-    else:
-        print(f"No {status} positions found")
+    by_status = {status: [] for status in statuses}
+    for pos in positions:
+        by_status[pos['status']].append(pos)
+    
+    headers = ["ID", "Symbol", "Type", "Qty", "Entry Price", "Entry Date", "Status"]
+    for status, rows in by_status.items():
+        print(f"\n=== POSITIONS ({status.upper()}) ===")
+        
+        if rows:
+            table_data = [
+                [
+                    pos['id'],
+                    pos['symbol'],
+                    pos['position_type'],
+                    pos['quantity'],
+                    f"${pos['entry_price']:.2f}",
+                    pos['entry_date'][:10] if pos['entry_date'] else '',
+                    pos['status']
+                ]
+                for pos in rows
+            ]
+            print(tabulate(table_data, headers=headers, tablefmt="simple"))
+        else:
+            print(f"No {status} positions found")
 
 def view_premiums(db, symbol=None, days_back=30):
     """View premium history"""
@@ -81,12 +89,8 @@ def view_premiums(db, symbol=None, days_back=30):
     
     if premiums:
         headers = ["Date", "Symbol", "Type", "Strike", "Premium", "Contracts", "Status"]
-        table_data = []
-        total_puts = 0
-        total_calls = 0
-        
-        for prem in premiums:
-            table_data.append([
+        table_data = [
+            [
                 prem['trade_date'][:10] if prem['trade_date'] else '',
                 prem['symbol'],
                 prem['option_type'],
@@ -94,14 +98,23 @@ def view_premiums(db, symbol=None, days_back=30):
                 f"${prem['premium_collected']:.2f}",
                 prem['contracts'],
                 prem['status']
-            ])
-            
-            if prem['option_type'] == 'P':
-                total_puts += prem['premium_collected'] * prem['contracts']
-            else:
-                total_calls += prem['premium_collected'] * prem['contracts']
+            ]
+            for prem in premiums
+        ]
+        # Premium history can run to thousands of rows, so skip tabulate
+        # and format every row with one template sized to the widest cell
+        widths = [max(len(str(cell)) for cell in col) for col in zip(headers, *table_data)]
+        row_fmt = "  ".join(f"{{:<{width}}}" for width in widths)
+        print("\n".join([
+            row_fmt.format(*headers).rstrip(),
+            "  ".join("-" * width for width in widths),
+            *(row_fmt.format(*row).rstrip() for row in table_data)
+        ]))
         
-        print(tabulate(table_data, headers=headers, tablefmt="grid"))
+        # Summed in SQLite rather than row by row here
+        totals = db.get_premium_totals(symbol=symbol, days_back=days_back)
+        total_puts = totals['total_puts']
+        total_calls = totals['total_calls']
         print(f"\nTotal Put Premiums: ${total_puts:.2f}")
         print(f"Total Call Premiums: ${total_calls:.2f}")
         print(f"Total All Premiums: ${total_puts + total_calls:.2f}")
@@ -138,6 +151,9 @@ def main():
     
     args = parser.parse_args()
     
+    # Imported after argument parsing so --help stays fast
+    from core.database import WheelDatabase
+    
     # Initialize database
     db = WheelDatabase()
     
@@ -145,21 +161,20 @@ def main():
     if not any([args.positions, args.premiums, args.cost_basis, args.summary, args.all]):
         args.summary = True
     
-    if args.all or args.summary:
-        view_summary(db)
-    
-    if args.all or args.cost_basis:
-        view_cost_basis(db, args.symbol)
-    
-    if args.all or args.positions:
-        if args.status == 'all':
-            view_positions(db, args.symbol, 'open')
-            view_positions(db, args.symbol, 'closed')
-        else:
-            view_positions(db, args.symbol, args.status)
+    statuses = ('open', 'closed') if args.status == 'all' else (args.status,)
+    views = [
+        (args.summary, view_summary, (db,)),
+        (args.cost_basis, view_cost_basis, (db, args.symbol)),
+        (args.positions, view_positions, (db, args.symbol, statuses)),
+        (args.premiums, view_premiums, (db, args.symbol, args.days)),
+    ]
     
-    if args.all or args.premiums:
-        view_premiums(db, args.symbol, args.days)
+    # Every view reuses this thread's connection inside one read transaction,
+    # which doesn't hold the write lock the running strategy needs
+    with db.get_connection(read_only=True):
+        for requested, view, view_args in views:
+            if args.all or requested:
+                view(*view_args)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 from core.broker_client import BrokerClient
 from core.execution import sell_puts, sell_calls
@@ -31,12 +32,13 @@ def main():
     client = BrokerClient(api_key=ALPACA_API_KEY, secret_key=ALPACA_SECRET_KEY, paper=IS_PAPER)
 
     # Get actual account balance
-    actual_balance = client.get_non_margin_buying_power()
+    account = client.get_account()
+    actual_balance = client.get_non_margin_buying_power(account)
     balance_allocation = strategy_config.get_balance_allocation()
     allocated_balance = actual_balance * balance_allocation
     
     # Get actual options buying power from Alpaca (accounts for existing positions)
-    options_buying_power = client.get_options_buying_power()
+    options_buying_power = client.get_options_buying_power(account)
     
     logger.info(f"Account balance: ${actual_balance:.2f}, Allocated for trading: ${allocated_balance:.2f} ({balance_allocation*100:.0f}%)")
     logger.info(f"Options buying power: ${options_buying_power:.2f}")
@@ -59,35 +61,37 @@ def main():
             strat_logger.add_current_positions(positions)
 
         # Use thread-safe state manager
-        current_risk = state_manager.calculate_risk(positions)
-        position_counts = state_manager.count_positions_by_symbol(positions)
-        states = state_manager.update_state(positions)
-        strat_logger.add_state_dict(states)
+        current_risk, position_counts, states = state_manager.refresh(positions)
+        strat_logger.add_state_dict({symbol: state.to_dict() for symbol, state in states.items()})
 
+        long_shares = [(symbol, state) for symbol, state in states.items() if state.type == "long_shares"]
+        
+        # Add positions to database if not already tracked, in one transaction
+        if db:
+            tracked = db.get_open_symbols('stock')
+            db.add_positions_bulk([
+                {'symbol': symbol, 'position_type': 'stock', 'quantity': state.qty, 'entry_price': state.price}
+                for symbol, state in long_shares
+                if symbol not in tracked
+            ])
+        
         # Sell calls on any long shares
-        for symbol, state in states.items():
-            if state["type"] == "long_shares":
-                # Add position to database if not already tracked
-                if db:
-                    existing = db.get_position_history(symbol, 'stock', 'open')
-                    if not existing:
-                        db.add_position(symbol, 'stock', state["qty"], state["price"])
-                
-                sell_calls(client, symbol, state["price"], state["qty"], db, strat_logger)
+        for symbol, state in long_shares:
+            sell_calls(client, symbol, state.price, state.qty, db, strat_logger)
 
         # Determine which symbols can have more positions (thread-safe)
         allowed_symbols = []
         max_layers = strategy_config.get_max_wheel_layers()
         
+        log_layers = logger.isEnabledFor(logging.INFO)
         for symbol in SYMBOLS:
             if state_manager.is_position_allowed(symbol, max_layers):
                 allowed_symbols.append(symbol)
-                symbol_positions = state_manager.get_position_count(symbol)
-                put_count = symbol_positions.get('puts', 0)
-                share_lots = symbol_positions.get('shares', 0)
-                current_layers = max(put_count, share_lots)
-                if current_layers > 0:
-                    logger.info(f"{symbol}: {current_layers}/{max_layers} wheel layers active")
+                if log_layers:
+                    sym_counts = position_counts.get(symbol)
+                    current_layers = max(sym_counts['puts'], sym_counts['shares']) if sym_counts else 0
+                    if current_layers > 0:
+                        logger.info("%s: %d/%d wheel layers active", symbol, current_layers, max_layers)
         
         # Use the actual options buying power from Alpaca, but cap it at our allocated amount
         # This way we respect both Alpaca's risk calculations and our allocation percentage
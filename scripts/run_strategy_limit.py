@@ -9,20 +9,25 @@ import logging
 import time
 import signal
 import sys
-from datetime import datetime, time as dt_time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, time as dt_time
 from zoneinfo import ZoneInfo
 
 from config.credentials import ALPACA_API_KEY, ALPACA_SECRET_KEY, IS_PAPER, strategy_config
 from core.broker_client import BrokerClient
-from core.execution_limit import sell_puts_limit, sell_calls_limit, update_filled_orders
+from core.execution_limit import sell_puts_limit, sell_calls_limit, update_filled_orders, record_completed_orders
 from core.order_manager import OrderManager
 from core.rolling import process_rolls
 from core.database import WheelDatabase
 from core.thread_safe_manager import ThreadSafeStateManager
+from core import elite_display
+from core.display_buffer import DisplayBuffer
 from core.elite_display import (
     print_elite_header, display_market_overview, display_positions_elite,
     display_strategy_matrix, display_pending_orders_elite, 
-    display_performance_dashboard, display_cycle_summary, display_footer
+    display_performance_dashboard, display_cycle_summary, display_session_complete,
+    display_footer
 )
 from strategy_logging.strategy_logger import StrategyLogger
 
@@ -35,24 +40,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Global flag for graceful shutdown
-should_exit = False
+# Set on shutdown; waits on it wake immediately instead of sleeping out their timeout
+shutdown_event = threading.Event()
+
+# Longest single wait on shutdown_event; on Windows Ctrl+C can't interrupt
+# Event.wait, so long waits are taken in steps of this many seconds
+MAX_WAIT_STEP = 60
+
+# Market hours: 9:30 AM - 4:00 PM ET, Monday-Friday
+MARKET_TZ = ZoneInfo("America/New_York")
+MARKET_OPEN = dt_time(9, 30)
+MARKET_CLOSE = dt_time(16, 0)
 
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
-    global should_exit
     logger.info("\nReceived shutdown signal, finishing current operations...")
-    should_exit = True
+    shutdown_event.set()
 
 
 def is_market_open():
     """Check if US market is currently open"""
-    now = datetime.now(ZoneInfo("America/New_York"))
-    
-    # Market hours: 9:30 AM - 4:00 PM ET, Monday-Friday
-    market_open = dt_time(9, 30)
-    market_close = dt_time(16, 0)
+    now = datetime.now(MARKET_TZ)
     
     # Check if it's a weekday
     if now.weekday() >= 5:  # Saturday = 5, Sunday = 6
@@ -60,40 +69,59 @@ def is_market_open():
     
     # Check if within market hours
     current_time = now.time()
-    return market_open <= current_time <= market_close
+    return MARKET_OPEN <= current_time <= MARKET_CLOSE
+
+
+def next_market_open(now):
+    """Get the first weekday market open after now"""
+    next_open = datetime.combine(now.date(), MARKET_OPEN, tzinfo=MARKET_TZ)
+    while next_open <= now or next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    return next_open
 
 
 def wait_for_market_open():
     """Wait until market opens"""
-    while not is_market_open() and not should_exit:
-        now = datetime.now(ZoneInfo("America/New_York"))
-        logger.info(f"Market closed. Current time: {now.strftime('%Y-%m-%d %H:%M:%S %Z')}. Waiting...")
-        time.sleep(60)  # Check every minute
+    while not is_market_open() and not shutdown_event.is_set():
+        now = datetime.now(MARKET_TZ)
+        next_open = next_market_open(now)
+        logger.info(f"Market closed. Current time: {now.strftime('%Y-%m-%d %H:%M:%S %Z')}. "
+                    f"Waiting until {next_open.strftime('%Y-%m-%d %H:%M %Z')}...")
+        # Timestamps keep the wait correct across a daylight saving change
+        shutdown_event.wait(max(0, min(next_open.timestamp() - time.time(), MAX_WAIT_STEP)))
 
 
 def run_strategy_cycle(client, order_manager, state_manager, db, strat_logger):
     """Run one cycle of the strategy"""
-    
+
+    # Pick up config edits made while running; an unchanged file costs one stat
+    strategy_config.reload_if_changed()
+
     # Get enabled symbols
     SYMBOLS = strategy_config.get_enabled_symbols()
     if not SYMBOLS:
         logger.warning("No symbols enabled in configuration")
         return
     
-    # Get account info
-    account = client.get_account()
-    actual_balance = client.get_non_margin_buying_power()
+    # Get account info and current positions, with both requests in flight together
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        account_future = executor.submit(client.get_account)
+        positions_future = executor.submit(client.get_positions)
+        account = account_future.result()
+        positions = positions_future.result()
+    
+    # Balances are read from the one account snapshot
+    actual_balance = client.get_non_margin_buying_power(account)
     balance_allocation = strategy_config.get_balance_allocation()
     allocated_balance = actual_balance * balance_allocation
-    options_buying_power = client.get_options_buying_power()
+    options_buying_power = client.get_options_buying_power(account)
     portfolio_value = float(account.portfolio_value)
     
     # Display market overview
-    display_market_overview(account, actual_balance, allocated_balance,
-                           options_buying_power, portfolio_value, balance_allocation)
+    with DisplayBuffer(elite_display.logger):
+        display_market_overview(account, actual_balance, allocated_balance,
+                               options_buying_power, portfolio_value, balance_allocation)
     
-    # Get current positions
-    positions = client.get_positions()
     if strat_logger:
         strat_logger.add_current_positions(positions)
     
@@ -106,11 +134,9 @@ def run_strategy_cycle(client, order_manager, state_manager, db, strat_logger):
             strat_logger.add_current_positions(positions)
     
     # Update state
-    current_risk = state_manager.calculate_risk(positions)
-    position_counts = state_manager.count_positions_by_symbol(positions)
-    states = state_manager.update_state(positions)
+    current_risk, position_counts, states = state_manager.refresh(positions)
     if strat_logger:
-        strat_logger.add_state_dict(states)
+        strat_logger.add_state_dict({symbol: state.to_dict() for symbol, state in states.items()})
     
     # Track actions taken
     actions_taken = []
@@ -119,53 +145,54 @@ def run_strategy_cycle(client, order_manager, state_manager, db, strat_logger):
     allowed_symbols = []
     max_layers = strategy_config.get_max_wheel_layers()
     
-    # Display positions
-    position_summary = display_positions_elite(positions, states, position_counts)
-    
-    # Display strategy matrix
-    display_strategy_matrix(position_counts, states, max_layers, allowed_symbols)
-    
-    # Display performance dashboard
-    display_performance_dashboard(db)
-    
-    # Display pending orders
-    display_pending_orders_elite(order_manager)
+    # Display the cycle's tables, written to the terminal in one flush
+    with DisplayBuffer(elite_display.logger):
+        # Display positions
+        position_summary = display_positions_elite(positions, states, position_counts)
+        
+        # Display strategy matrix
+        display_strategy_matrix(position_counts, states, max_layers, allowed_symbols)
+        
+        # Display performance dashboard
+        display_performance_dashboard(db)
+        
+        # Display pending orders
+        display_pending_orders_elite(order_manager)
+    
+    # Long shares without a pending call order get a covered call
+    pending_calls = {o.underlying for o in order_manager.get_pending_orders() if o.order_type == 'call'}
+    uncovered = [(symbol, state) for symbol, state in states.items()
+                 if state.type == "long_shares" and symbol not in pending_calls]
+    
+    # Add positions to database if not tracked, in one transaction
+    if db:
+        tracked = db.get_open_symbols('stock')
+        db.add_positions_bulk([
+            {'symbol': symbol, 'position_type': 'stock', 'quantity': state.qty, 'entry_price': state.price}
+            for symbol, state in uncovered
+            if symbol not in tracked
+        ])
     
     # Sell calls on any long shares
-    for symbol, state in states.items():
-        if state["type"] == "long_shares":
-            # Check if we already have a pending call order
-            pending_calls = [o for o in order_manager.get_pending_orders() 
-                           if o.underlying == symbol and o.order_type == 'call']
-            
-            if not pending_calls:
-                # Add position to database if not tracked
-                if db:
-                    existing = db.get_position_history(symbol, 'stock', 'open')
-                    if not existing:
-                        db.add_position(symbol, 'stock', state["qty"], state["price"])
-                
-                # Sell covered call
-                order_id = sell_calls_limit(client, order_manager, symbol, 
-                                           state["price"], state["qty"], db, strat_logger)
-                if order_id:
-                    actions_taken.append(f"Placed call order for {symbol}")
+    for symbol, state in uncovered:
+        order_id = sell_calls_limit(client, order_manager, symbol, 
+                                   state.price, state.qty, db, strat_logger)
+        if order_id:
+            actions_taken.append(f"Placed call order for {symbol}")
     
     # Now populate allowed_symbols with actual logic
+    # Symbols that already have a pending put order are skipped
+    pending_puts = {o.underlying for o in order_manager.get_pending_orders() if o.order_type == 'put'}
+    log_layers = logger.isEnabledFor(logging.INFO)
     for symbol in SYMBOLS:
         if state_manager.is_position_allowed(symbol, max_layers):
-            # Check if we already have pending put orders for this symbol
-            pending_puts = [o for o in order_manager.get_pending_orders() 
-                          if o.underlying == symbol and o.order_type == 'put']
-            
-            if not pending_puts:
+            if symbol not in pending_puts:
                 allowed_symbols.append(symbol)
-                symbol_positions = state_manager.get_position_count(symbol)
-                put_count = symbol_positions.get('puts', 0)
-                share_lots = symbol_positions.get('shares', 0)
-                current_layers = max(put_count, share_lots)
-                if current_layers > 0:
-                    logger.info(f"{symbol}: {current_layers}/{max_layers} wheel layers active")
+                if log_layers:
+                    sym_counts = position_counts.get(symbol)
+                    current_layers = max(sym_counts['puts'], sym_counts['shares']) if sym_counts else 0
+                    if current_layers > 0:
+                        logger.info("%s: %d/%d wheel layers active", symbol, current_layers, max_layers)
     
     # Calculate available buying power
     buying_power = min(options_buying_power, allocated_balance)
@@ -183,7 +210,8 @@ def run_strategy_cycle(client, order_manager, state_manager, db, strat_logger):
             actions_taken.append(f"Placed {len(order_ids)} put order(s)")
     
     # Display cycle summary
-    display_cycle_summary(actions_taken, allowed_symbols, buying_power)
+    with DisplayBuffer(elite_display.logger):
+        display_cycle_summary(actions_taken, allowed_symbols, buying_power)
     
     if strat_logger:
         strat_logger.save()
@@ -241,6 +269,7 @@ def main():
     
     client = BrokerClient(api_key=ALPACA_API_KEY, secret_key=ALPACA_SECRET_KEY, paper=IS_PAPER)
     order_manager = OrderManager(client, args.update_interval, args.max_order_age)
+    order_manager.start_stream()
     state_manager = ThreadSafeStateManager()
     db = WheelDatabase()
     strat_logger = StrategyLogger() if args.strat_log else None
@@ -268,14 +297,14 @@ def main():
         logger.info("Market Status: OPEN")
     
     try:
-        while not should_exit:
+        while not shutdown_event.is_set():
             # Wait for market to open
             if not is_market_open():
                 if args.once:
                     logger.warning("Market is closed and --once flag is set, exiting")
                     break
                 wait_for_market_open()
-                if should_exit:
+                if shutdown_event.is_set():
                     break
             
             current_time = time.time()
@@ -300,7 +329,8 @@ def main():
             
             # Update pending orders
             if current_time - last_update_time >= args.update_interval:
-                if order_manager.has_pending_orders():
+                # Orders the stream already finalized still need their fills recorded
+                if order_manager.has_pending_orders() or order_manager.has_completed_orders():
                     logger.info("Updating pending orders...")
                     
                     try:
@@ -321,15 +351,17 @@ def main():
                     except Exception as e:
                         logger.error(f"Error updating orders: {str(e)}", exc_info=True)
                 else:
-                    # Show periodic status even if no orders (but less frequently)
+                    # Show periodic status even if no orders
                     time_until_next = args.cycle_interval - (current_time - last_cycle_time)
-                    if time_until_next > 0 and int(time_until_next) % 20 == 0:
+                    if time_until_next > 0:
                         logger.info(f"Next cycle in {int(time_until_next)} seconds...")
                 
                 last_update_time = current_time
             
-            # Sleep briefly to avoid busy waiting
-            time.sleep(1)
+            # Sleep until the next cycle or order update is due, or until shutdown;
+            # capped so Ctrl+C is still picked up on Windows
+            next_due = min(last_cycle_time + args.cycle_interval, last_update_time + args.update_interval)
+            shutdown_event.wait(timeout=max(0, min(next_due - time.time(), MAX_WAIT_STEP)))
             
     except KeyboardInterrupt:
         logger.info("\nShutdown requested...")
@@ -344,19 +376,27 @@ def main():
             logger.info("Cancelling pending orders...")
             cancelled = order_manager.cancel_all_pending()
             logger.info(f"Cancelled {cancelled} order(s)")
+        order_manager.stop_stream()
+        
+        # Record fills the stream reported since the last update, including any
+        # that beat the cancels; nothing is repriced this late
+        if order_manager.has_completed_orders():
+            try:
+                record_completed_orders(order_manager, db)
+            except Exception as e:
+                logger.error(f"Error updating orders: {str(e)}", exc_info=True)
         
         # Close database
         if db:
             db.close()
             logger.info("Database connection closed")
         
-        # Print final summary
+        # Print final summary; only display output is buffered, written in one flush
         if db:
-            print_elite_header()
-            logger.info("")
-            logger.info("SESSION COMPLETE")
-            logger.info("─" * 78)
-            display_performance_dashboard(db)
+            with DisplayBuffer(elite_display.logger):
+                print_elite_header()
+                display_session_complete()
+                display_performance_dashboard(db)
         
         logger.info("")
         logger.info("─" * 78)
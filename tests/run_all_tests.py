@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 """Master test runner for all options wheel tests"""
 
+import importlib
 import sys
 import os
 import time
@@ -19,7 +20,7 @@ def run_test_module(module_name, description):
     start_time = time.time()
     
     try:
-        module = __import__(module_name)
+        module = importlib.import_module(module_name)
         result = module.main()
         elapsed = time.time() - start_time
         
@@ -76,9 +77,6 @@ def main():
     for module, description in test_modules:
         result = run_test_module(module, description)
         results.append(result)
-        
-        # Brief pause between test suites
-        time.sleep(0.5)
     
     total_time = time.time() - total_start
     
@@ -386,6 +386,253 @@ def test_concurrent_access():
         print(f"[FAIL] Concurrent access test failed: {e}")
         return False
 
+def test_bulk_trade_insert():
+    """Test recording several trades in one transaction"""
+    print("\n[TEST] Bulk Trade Insert")
+    print("-" * 40)
+    
+    from core.database import WheelDatabase
+    
+    db = WheelDatabase()
+    test_symbol = "TEST_BULK"
+    
+    try:
+        trades = [
+            {'symbol': test_symbol, 'trade_type': 'sell_put', 'quantity': 1,
+             'price': 1.25, 'strike_price': 50.00, 'premium': 1.25},
+            {'symbol': test_symbol, 'trade_type': 'sell_call', 'quantity': 1,
+             'price': 0.80, 'strike_price': 55.00, 'premium': 0.80},
+        ]
+        
+        inserted = db.add_trades_bulk(trades)
+        if inserted != len(trades):
+            print(f"[FAIL] Expected {len(trades)} inserts, got {inserted}")
+            return False
+        
+        with db.get_connection() as conn:
+            cursor = conn.execute(
+                "SELECT trade_type FROM trade_history WHERE symbol = ? ORDER BY id",
+                (test_symbol,)
+            )
+            trade_types = [row[0] for row in cursor.fetchall()]
+        
+        if trade_types == ['sell_put', 'sell_call']:
+            print("[OK] Bulk insert recorded all trades in order")
+        else:
+            print(f"[FAIL] Unexpected trades recorded: {trade_types}")
+            return False
+        
+        if db.add_trades_bulk([]) != 0:
+            print("[FAIL] Empty bulk insert should be a no-op")
+            return False
+        print("[OK] Empty bulk insert is a no-op")
+        
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Bulk trade insert test failed: {e}")
+        return False
+    finally:
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM trade_history WHERE symbol = ?", (test_symbol,))
+
+def test_bulk_position_insert():
+    """Test opening several positions in one transaction"""
+    print("\n[TEST] Bulk Position Insert")
+    print("-" * 40)
+    
+    from core.database import WheelDatabase
+    
+    db = WheelDatabase()
+    test_symbols = ["TEST_BULK_A", "TEST_BULK_B"]
+    
+    try:
+        inserted = db.add_positions_bulk([
+            {'symbol': symbol, 'position_type': 'stock', 'quantity': 100, 'entry_price': 50.00}
+            for symbol in test_symbols
+        ])
+        if inserted != len(test_symbols):
+            print(f"[FAIL] Expected {len(test_symbols)} inserts, got {inserted}")
+            return False
+        
+        opened = [p['symbol'] for symbol in test_symbols
+                  for p in db.get_position_history(symbol, 'stock', 'open')]
+        if sorted(opened) == test_symbols:
+            print("[OK] Bulk insert opened all positions")
+        else:
+            print(f"[FAIL] Unexpected open positions: {opened}")
+            return False
+        
+        if set(test_symbols) <= db.get_open_symbols('stock'):
+            print("[OK] Open symbols include the new positions")
+        else:
+            print("[FAIL] Open symbols are missing the new positions")
+            return False
+
+        with db.get_connection() as conn:
+            conn.execute("UPDATE positions SET status = 'closed' WHERE symbol = ?", (test_symbols[1],))
+        statuses = {p['symbol']: p['status'] for symbol in test_symbols
+                    for p in db.get_position_history(symbol, status=('open', 'closed'))}
+        if statuses == {test_symbols[0]: 'open', test_symbols[1]: 'closed'}:
+            print("[OK] Status list returns open and closed positions")
+        else:
+            print(f"[FAIL] Unexpected positions for status list: {statuses}")
+            return False
+
+        if db.add_positions_bulk([]) != 0:
+            print("[FAIL] Empty bulk insert should be a no-op")
+            return False
+        print("[OK] Empty bulk insert is a no-op")
+        
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Bulk position insert test failed: {e}")
+        return False
+    finally:
+        with db.get_connection() as conn:
+            conn.executemany("DELETE FROM positions WHERE symbol = ?", [(s,) for s in test_symbols])
+
+def test_roll_record():
+    """Test recording a roll's trades and premium in one transaction"""
+    print("\n[TEST] Roll Record")
+    print("-" * 40)
+    
+    from core.database import WheelDatabase
+    
+    db = WheelDatabase()
+    test_symbol = "TEST_ROLL"
+    
+    close_trade = {'symbol': test_symbol, 'trade_type': 'buy_to_close', 'quantity': 1,
+                   'price': 0, 'strike_price': 50.00, 'premium': 0}
+    open_trade = {'symbol': test_symbol, 'trade_type': 'sell_put', 'quantity': 1,
+                  'price': 0.90, 'strike_price': 48.00, 'premium': 0.90}
+    
+    try:
+        # A premium without an expiration is rejected, and nothing is kept
+        try:
+            db.add_roll(close_trade, {'symbol': test_symbol, 'option_type': 'P',
+                                      'strike_price': 48.00, 'premium': 0.90}, open_trade)
+            print("[FAIL] Roll without an expiration should be rejected")
+            return False
+        except Exception:
+            pass
+        
+        with db.get_connection() as conn:
+            leftover = conn.execute(
+                "SELECT COUNT(*) FROM trade_history WHERE symbol = ?", (test_symbol,)
+            ).fetchone()[0]
+        if leftover:
+            print(f"[FAIL] Failed roll left {leftover} trade(s) behind")
+            return False
+        print("[OK] Failed roll was rolled back")
+        
+        row_id = db.add_roll(
+            close_trade,
+            {'symbol': test_symbol, 'option_type': 'P', 'strike_price': 48.00,
+             'premium': 0.90, 'contracts': 1, 'expiration_date': datetime.now().date()},
+            open_trade
+        )
+        
+        with db.get_connection() as conn:
+            trade_types = [row[0] for row in conn.execute(
+                "SELECT trade_type FROM trade_history WHERE symbol = ? ORDER BY id",
+                (test_symbol,)
+            ).fetchall()]
+            premium_ids = [row[0] for row in conn.execute(
+                "SELECT id FROM premiums WHERE symbol = ?", (test_symbol,)
+            ).fetchall()]
+        
+        if trade_types == ['buy_to_close', 'sell_put'] and premium_ids == [row_id]:
+            print("[OK] Roll recorded both trades and the premium")
+        else:
+            print(f"[FAIL] Unexpected roll records: {trade_types}, {premium_ids}")
+            return False
+        
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Roll record test failed: {e}")
+        return False
+    finally:
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM trade_history WHERE symbol = ?", (test_symbol,))
+            conn.execute("DELETE FROM premiums WHERE symbol = ?", (test_symbol,))
+
+def test_premium_totals():
+    """Test summing put and call premiums in SQL"""
+    print("\n[TEST] Premium Totals")
+    print("-" * 40)
+    
+    from core.database import WheelDatabase
+    
+    db = WheelDatabase()
+    test_symbol = "TEST_TOTALS"
+    expiration = datetime.now().date()
+    
+    try:
+        db.add_premium(test_symbol, 'P', 50.00, 1.25, contracts=2, expiration_date=expiration)
+        db.add_premium(test_symbol, 'P', 48.00, 0.50, contracts=1, expiration_date=expiration)
+        db.add_premium(test_symbol, 'C', 55.00, 0.75, contracts=1, expiration_date=expiration)
+        
+        totals = db.get_premium_totals(symbol=test_symbol, days_back=30)
+        if abs(totals['total_puts'] - 3.00) < 1e-9 and abs(totals['total_calls'] - 0.75) < 1e-9:
+            print("[OK] Put and call premiums summed correctly")
+        else:
+            print(f"[FAIL] Unexpected premium totals: {totals}")
+            return False
+        
+        empty = db.get_premium_totals(symbol="TEST_NO_PREMIUMS")
+        if empty != {'total_puts': 0.0, 'total_calls': 0.0}:
+            print(f"[FAIL] Expected zero totals without premiums, got {empty}")
+            return False
+        print("[OK] Symbols without premiums total zero")
+        
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Premium totals test failed: {e}")
+        return False
+    finally:
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM premiums WHERE symbol = ?", (test_symbol,))
+
+def test_nested_connection():
+    """Test that a nested get_connection joins the open transaction"""
+    print("\n[TEST] Nested Connection")
+    print("-" * 40)
+    
+    from core.database import WheelDatabase
+    
+    db = WheelDatabase()
+    test_symbol = "TEST_NESTED"
+    
+    try:
+        try:
+            with db.get_connection() as outer:
+                db.add_position(test_symbol, 'stock', 100, 50.00)
+                with db.get_connection() as inner:
+                    if inner is not outer:
+                        print("[FAIL] Nested block opened a different connection")
+                        return False
+                raise RuntimeError("abort outer transaction")
+        except RuntimeError:
+            pass
+        
+        if db.get_position_history(symbol=test_symbol):
+            print("[FAIL] Nested write survived the outer rollback")
+            return False
+        print("[OK] Nested writes commit or roll back with the outer block")
+        
+        return True
+        
+    except Exception as e:
+        print(f"[FAIL] Nested connection test failed: {e}")
+        return False
+    finally:
+        with db.get_connection() as conn:
+            conn.execute("DELETE FROM positions WHERE symbol = ?", (test_symbol,))
+
 def main():
     """Run all database tests"""
     print("=" * 60)
@@ -401,6 +648,11 @@ def main():
     results.append(("Query Performance", test_query_performance()))
     results.append(("Backup & Restore", test_backup_restore()))
     results.append(("Concurrent Access", test_concurrent_access()))
+    results.append(("Bulk Trade Insert", test_bulk_trade_insert()))
+    results.append(("Bulk Position Insert", test_bulk_position_insert()))
+    results.append(("Roll Record", test_roll_record()))
+    results.append(("Premium Totals", test_premium_totals()))
+    results.append(("Nested Connection", test_nested_connection()))
     
     # Summary
     print("\n" + "=" * 60)
@@ -11,7 +11,7 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.retry_decorator import retry_on_failure, CircuitBreaker, RetryException
+from core.retry_decorator import retry_on_failure, CircuitBreaker, CircuitState, RetryException
 from core.thread_safe_manager import ThreadSafeStateManager
 from core.database import WheelDatabase
 import tempfile
@@ -81,7 +81,7 @@ class TestCircuitBreaker(unittest.TestCase):
                 breaker.call(failing_function)
         
         # Circuit should now be open
-        self.assertEqual(breaker.state, "open")
+        self.assertIs(breaker.state, CircuitState.OPEN)
         
         # Next call should fail immediately
         with self.assertRaises(RetryException):
@@ -104,7 +104,7 @@ class TestCircuitBreaker(unittest.TestCase):
         with self.assertRaises(ConnectionError):
             breaker.call(test_function)
         
-        self.assertEqual(breaker.state, "open")
+        self.assertIs(breaker.state, CircuitState.OPEN)
         
         # Wait for recovery timeout
         time.sleep(0.15)
@@ -112,7 +112,7 @@ class TestCircuitBreaker(unittest.TestCase):
         # Circuit should recover
         result = breaker.call(test_function)
         self.assertEqual(result, "success")
-        self.assertEqual(breaker.state, "closed")
+        self.assertIs(breaker.state, CircuitState.CLOSED)
 
 class TestThreadSafeStateManager(unittest.TestCase):
     """Test thread-safe state manager."""
@@ -181,6 +181,96 @@ class TestThreadSafeStateManager(unittest.TestCase):
         for result in results[1:]:
             self.assertEqual(result, first_result)
 
+    def test_unchanged_positions_reuse_state(self):
+        """Test that state is only rebuilt when the positions change."""
+        mock_positions = [
+            Mock(asset_class=Mock(value="us_equity"), symbol="AAPL", qty=100,
+                 avg_entry_price=150.0, side=Mock(value="long"))
+        ]
+
+        with patch('core.thread_safe_manager._update_state', return_value={'AAPL': {}}) as update:
+            self.manager.update_state(mock_positions)
+            self.manager.update_state(mock_positions)
+            self.assertEqual(update.call_count, 1)
+
+            mock_positions[0].qty = 200
+            self.manager.update_state(mock_positions)
+            self.assertEqual(update.call_count, 2)
+
+            self.manager.reset()
+            self.manager.update_state(mock_positions)
+            self.assertEqual(update.call_count, 3)
+
+    def test_cached_counts_not_shared(self):
+        """Test that changing returned position counts doesn't change the cached ones."""
+        from alpaca.trading.enums import AssetClass
+        positions = [
+            Mock(asset_class=AssetClass.US_EQUITY, symbol="AAPL", qty="100", avg_entry_price="150.0"),
+        ]
+
+        counts = self.manager.count_positions_by_symbol(positions)
+        counts['AAPL']['shares'] = 5
+
+        self.assertEqual(self.manager.count_positions_by_symbol(positions)['AAPL']['shares'], 1)
+        self.assertEqual(self.manager.get_position_count('AAPL')['shares'], 1)
+
+    def test_refresh_matches_separate_calls(self):
+        """Test that one refresh gives the same risk, counts and state as the separate calls."""
+        from alpaca.trading.enums import AssetClass
+        positions = [
+            Mock(asset_class=AssetClass.US_EQUITY, symbol="AAPL", qty="200", avg_entry_price="150.0"),
+            Mock(asset_class=AssetClass.US_OPTION, symbol="AAPL241220C00160000", qty="-2", avg_entry_price="1.0"),
+            Mock(asset_class=AssetClass.US_OPTION, symbol="MSFT241220P00300000", qty="-1", avg_entry_price="2.0"),
+        ]
+
+        risk, counts, states = self.manager.refresh(positions)
+
+        separate = ThreadSafeStateManager()
+        self.assertEqual(risk, separate.calculate_risk(positions))
+        self.assertEqual(counts, separate.count_positions_by_symbol(positions))
+        self.assertEqual(states, separate.update_state(positions))
+        self.assertEqual(states['AAPL'].type, "short_call")
+        self.assertFalse(self.manager.is_position_allowed('MSFT', 2))
+
+    def test_published_state_is_immutable(self):
+        """Test that callers can't change the state the manager hands out."""
+        import dataclasses
+        from alpaca.trading.enums import AssetClass
+        positions = [
+            Mock(asset_class=AssetClass.US_EQUITY, symbol="AAPL", qty="100", avg_entry_price="150.0"),
+        ]
+
+        _, counts, states = self.manager.refresh(positions)
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            states['AAPL'].type = "short_put"
+        with self.assertRaises(TypeError):
+            states['AAPL'].position_counts['shares'] = 5
+        counts['AAPL']['shares'] = 5
+        self.assertEqual(self.manager.get_state('AAPL').position_counts['shares'], 1)
+        self.assertEqual(self.manager.get_position_count('AAPL')['shares'], 1)
+        self.assertEqual(self.manager.count_positions_by_symbol(positions)['AAPL']['shares'], 1)
+        self.assertEqual(states['AAPL'].to_dict()['position_counts'], {'puts': 0, 'calls': 0, 'shares': 1})
+
+    def test_position_allowed_by_layers(self):
+        """Test wheel layer limits from the last position count."""
+        counts = {
+            'PUTS': {'puts': 1, 'calls': 0, 'shares': 0},
+            'SHARES': {'puts': 0, 'calls': 1, 'shares': 1},
+            'LAYERED': {'puts': 1, 'calls': 0, 'shares': 1},
+            'CALLS': {'puts': 0, 'calls': 1, 'shares': 0},
+        }
+
+        with patch('core.thread_safe_manager._count_positions_by_symbol', return_value=counts):
+            self.manager.count_positions_by_symbol([])
+
+        self.assertTrue(self.manager.is_position_allowed('NEW', 2))
+        self.assertTrue(self.manager.is_position_allowed('CALLS', 2))
+        self.assertFalse(self.manager.is_position_allowed('PUTS', 5))
+        self.assertTrue(self.manager.is_position_allowed('SHARES', 2))
+        self.assertFalse(self.manager.is_position_allowed('LAYERED', 2))
+        self.assertTrue(self.manager.is_position_allowed('LAYERED', 3))
+
 class TestDatabaseThreadSafety(unittest.TestCase):
     """Test database thread safety improvements."""
     
@@ -274,6 +364,26 @@ class TestDatabaseThreadSafety(unittest.TestCase):
             expiration_date=date.today() + timedelta(days=30)
         )
         self.assertIsNotNone(result)
+    
+    def test_read_only_transaction_allows_writes(self):
+        """Test that a read-only transaction doesn't block other writers."""
+        from datetime import date, timedelta
+        
+        with self.db.get_connection(read_only=True) as conn:
+            conn.execute("SELECT COUNT(*) FROM premiums").fetchone()
+            
+            # A writer on another thread gets the lock without waiting
+            writer = WheelDatabase(db_path=self.temp_db.name)
+            start_time = time.time()
+            writer.add_premium(
+                symbol="TEST",
+                option_type='P',
+                strike_price=100.0,
+                premium=1.0,
+                expiration_date=date.today() + timedelta(days=30)
+            )
+            self.assertLess(time.time() - start_time, 1.0)
+            writer.close()
 
 class TestBrokerClientValidation(unittest.TestCase):
     """Test broker client API response validation."""
@@ -331,6 +441,356 @@ class TestBrokerClientValidation(unittest.TestCase):
         
         self.assertIn("Invalid buying power", str(context.exception))
 
+class TestOrderManagerConcurrency(unittest.TestCase):
+    """Test order tracking when submits and stream updates overlap."""
+    
+    def setUp(self):
+        from core.order_manager import OrderManager
+        
+        quote = Mock(bid_price=1.00, ask_price=1.20)
+        self.client = Mock()
+        self.client.get_option_snapshot.side_effect = (
+            lambda symbols: {s: Mock(latest_quote=quote) for s in symbols}
+        )
+        self.manager = OrderManager(self.client)
+    
+    def test_fill_reported_before_submit_returns(self):
+        """Test that a fill pushed while submit_order is in flight isn't lost."""
+        import asyncio
+        from alpaca.trading.enums import TradeEvent
+        
+        def submit_order(req):
+            # The stream reports the fill before the REST call returns
+            update = Mock(event=TradeEvent.FILL,
+                          order=Mock(id="order-1", replaces=None, filled_avg_price="1.10"))
+            asyncio.run(self.manager._on_trade_update(update))
+            return Mock(id="order-1")
+        
+        self.client.trade_client.submit_order.side_effect = submit_order
+        
+        order_id = self.manager.submit_limit_sell("TEST250117P00050000", order_type='put')
+        self.assertEqual(order_id, "order-1")
+        self.assertFalse(self.manager.has_pending_orders())
+        
+        results = self.manager.update_pending_orders()
+        self.assertEqual(results.get("order-1"), "filled")
+        self.assertEqual(self.manager.last_completed["order-1"].filled_avg_price, 1.10)
+
+class TestOrderManagerTradeUpdates(unittest.TestCase):
+    """Test how pushed trade updates and polling finalize orders."""
+    
+    def setUp(self):
+        from core.order_manager import OrderManager
+        
+        quote = Mock(bid_price=1.00, ask_price=1.20)
+        self.client = Mock()
+        self.client.get_option_snapshot.side_effect = (
+            lambda symbols: {s: Mock(latest_quote=quote) for s in symbols}
+        )
+        self.client.trade_client.submit_order.return_value = Mock(id="order-1")
+        self.manager = OrderManager(self.client)
+        self.manager.submit_limit_sell("TEST250117P00050000", order_type='put')
+    
+    def push(self, event, order_id="order-1", **fields):
+        """Deliver a fake trade update through the stream handler"""
+        import asyncio
+        
+        order = Mock(id=order_id, replaces=None, **fields)
+        asyncio.run(self.manager._on_trade_update(Mock(event=event, order=order)))
+    
+    def test_fill_event(self):
+        """Test that a fill event finalizes the order with its fill price."""
+        from alpaca.trading.enums import TradeEvent
+        
+        self.push(TradeEvent.FILL, filled_avg_price="1.15")
+        self.assertFalse(self.manager.has_pending_orders())
+        self.assertTrue(self.manager.has_completed_orders())
+        
+        results = self.manager.update_pending_orders()
+        self.assertEqual(results, {"order-1": "filled"})
+        self.assertEqual(self.manager.last_completed["order-1"].filled_avg_price, 1.15)
+        self.assertFalse(self.manager.has_completed_orders())
+    
+    def test_collect_completed_skips_repricing(self):
+        """Test that collecting stream-finalized orders doesn't touch the ones still pending."""
+        from alpaca.trading.enums import TradeEvent
+        
+        self.client.trade_client.submit_order.return_value = Mock(id="order-2")
+        self.manager.submit_limit_sell("TEST250117P00055000", order_type='put')
+        self.push(TradeEvent.FILL, filled_avg_price="1.15")
+        
+        with patch('core.order_manager.time.monotonic', return_value=time.monotonic() + 30):
+            results = self.manager.collect_completed()
+        
+        self.assertEqual(results, {"order-1": "filled"})
+        self.assertIn("order-1", self.manager.last_completed)
+        self.assertTrue(self.manager.has_pending_orders())
+        self.client.trade_client.replace_order_by_id.assert_not_called()
+        self.client.trade_client.get_order_by_id.assert_not_called()
+    
+    def test_partial_fill_keeps_order_pending(self):
+        """Test that a partial fill leaves the order tracked."""
+        from alpaca.trading.enums import TradeEvent
+        
+        self.push(TradeEvent.PARTIAL_FILL, filled_avg_price="1.10")
+        self.assertTrue(self.manager.has_pending_orders())
+        self.assertNotIn("order-1", self.manager._unclaimed)
+    
+    def test_cancel_event(self):
+        """Test that a cancel event finalizes the order without a fill price."""
+        from alpaca.trading.enums import TradeEvent, OrderStatus
+        
+        self.push(TradeEvent.CANCELED, status=OrderStatus.CANCELED)
+        self.assertFalse(self.manager.has_pending_orders())
+        
+        results = self.manager.update_pending_orders()
+        self.assertEqual(results, {"order-1": str(OrderStatus.CANCELED)})
+        self.assertIsNone(self.manager.last_completed["order-1"].filled_avg_price)
+    
+    def test_failed_reprice_reported_pending(self):
+        """Test that an order due for repricing without a quote isn't reported repriced."""
+        self.client.get_option_snapshot.side_effect = None
+        self.client.get_option_snapshot.return_value = {}
+        self.client.trade_client.get_order_by_id.return_value = Mock(status="new")
+        
+        with patch('core.order_manager.time.monotonic', return_value=time.monotonic() + 30):
+            results = self.manager.update_pending_orders()
+        
+        self.assertEqual(results, {"order-1": "pending"})
+        self.client.trade_client.replace_order_by_id.assert_not_called()
+        self.assertTrue(self.manager.has_pending_orders())
+    
+    def test_update_for_untracked_order(self):
+        """Test that an update for an order nobody is waiting on is parked, not applied."""
+        from alpaca.trading.enums import TradeEvent
+        from core.order_manager import MAX_UNCLAIMED_UPDATES
+        
+        for i in range(MAX_UNCLAIMED_UPDATES + 5):
+            self.push(TradeEvent.FILL, order_id=f"other-{i}", filled_avg_price="2.00")
+        
+        self.assertTrue(self.manager.has_pending_orders())
+        self.assertEqual(len(self.manager._unclaimed), MAX_UNCLAIMED_UPDATES)
+        self.client.trade_client.get_order_by_id.return_value = Mock(status="new")
+        self.assertEqual(self.manager.update_pending_orders(), {})
+    
+    def test_falls_back_to_polling(self):
+        """Test that orders are polled when the stream can't be started."""
+        from alpaca.trading.enums import OrderStatus
+        
+        self.client.create_trade_stream.side_effect = ConnectionError("stream down")
+        self.assertFalse(self.manager.start_stream())
+        self.assertFalse(self.manager.stream_active)
+        
+        self.client.trade_client.get_order_by_id.return_value = Mock(
+            status=OrderStatus.FILLED, filled_avg_price="1.05"
+        )
+        results = self.manager.update_pending_orders()
+        
+        self.client.trade_client.get_order_by_id.assert_called_once_with("order-1")
+        self.assertEqual(results, {"order-1": "filled"})
+        self.assertEqual(self.manager.last_completed["order-1"].filled_avg_price, 1.05)
+
+class TestOrderManagerExpiry(unittest.TestCase):
+    """Test cancelling orders that have been pending too long."""
+    
+    def setUp(self):
+        from core.order_manager import OrderManager
+        
+        self.client = Mock()
+        self.client.trade_client.submit_order.return_value = Mock(id="order-1")
+        self.client.trade_client.get_order_by_id.return_value = Mock(status="new")
+        self.client.get_option_snapshot.return_value = {
+            "TEST250117P00050000": Mock(latest_quote=Mock(bid_price=1.00, ask_price=1.20))
+        }
+        self.manager = OrderManager(self.client, max_order_age=0)
+        self.manager.submit_limit_sell("TEST250117P00050000", order_type='put')
+    
+    def test_failed_cancel_is_retried(self):
+        """Test that an expired order whose cancel fails is cancelled on the next call."""
+        self.client.trade_client.cancel_order_by_id.side_effect = [ConnectionError("API unavailable"), None]
+        
+        self.assertEqual(self.manager.update_pending_orders(), {"order-1": "error"})
+        self.assertTrue(self.manager.has_pending_orders())
+        
+        self.assertEqual(self.manager.update_pending_orders(), {"order-1": "expired"})
+        self.assertEqual(self.client.trade_client.cancel_order_by_id.call_count, 2)
+        self.assertFalse(self.manager.has_pending_orders())
+    
+    def test_failed_cancel_of_filled_order(self):
+        """Test that an order whose cancel fails because it already filled is recorded as filled."""
+        from alpaca.trading.enums import OrderStatus
+        
+        self.client.trade_client.cancel_order_by_id.side_effect = ConnectionError("order is filled")
+        self.client.trade_client.get_order_by_id.return_value = Mock(
+            status=OrderStatus.FILLED, filled_avg_price="1.12"
+        )
+        
+        self.assertEqual(self.manager.update_pending_orders(), {"order-1": "filled"})
+        self.assertFalse(self.manager.has_pending_orders())
+        self.assertEqual(self.manager.last_completed["order-1"].filled_avg_price, 1.12)
+
+class TestOrderManagerQuoteCache(unittest.TestCase):
+    """Test the short-lived option snapshot cache."""
+    
+    def test_expired_quotes_pruned(self):
+        """Test that quotes past their ttl are dropped when new ones are fetched."""
+        from core.order_manager import OrderManager
+        
+        client = Mock()
+        client.get_option_snapshot.side_effect = lambda symbols: {s: Mock() for s in symbols}
+        manager = OrderManager(client)
+        
+        with patch('core.order_manager.time.monotonic', return_value=100.0):
+            manager._get_snapshots(["AAA250117P00050000"], ttl=5)
+        with patch('core.order_manager.time.monotonic', return_value=102.0):
+            manager._get_snapshots(["AAA250117P00050000"], ttl=5)
+            self.assertEqual(client.get_option_snapshot.call_count, 1)
+        with patch('core.order_manager.time.monotonic', return_value=110.0):
+            manager._get_snapshots(["BBB250117P00050000"], ttl=5)
+        
+        self.assertEqual(list(manager._quote_cache), ["BBB250117P00050000"])
+
+class TestDisplayBuffer(unittest.TestCase):
+    """Test buffering of display output into one write per handler."""
+    
+    def setUp(self):
+        import io
+        import logging
+        
+        self.stream = io.StringIO()
+        handler = logging.StreamHandler(self.stream)
+        self.loggers = []
+        for name in ("test.display.a", "test.display.b"):
+            lg = logging.getLogger(name)
+            lg.handlers = [handler]
+            lg.setLevel(logging.INFO)
+            lg.propagate = False
+            self.loggers.append(lg)
+    
+    def test_lines_written_on_exit(self):
+        """Test that lines are held until the block exits."""
+        from core.display_buffer import DisplayBuffer
+        
+        lg = self.loggers[0]
+        with DisplayBuffer(lg):
+            lg.info("line 1")
+            lg.info("line %d", 2)
+            self.assertEqual(self.stream.getvalue(), "")
+        self.assertEqual(self.stream.getvalue(), "line 1\nline 2\n")
+    
+    def test_other_threads_pass_through(self):
+        """Test that records from other threads aren't captured."""
+        from core.display_buffer import DisplayBuffer
+        
+        lg = self.loggers[0]
+        with DisplayBuffer(lg):
+            lg.info("buffered")
+            worker = threading.Thread(target=lg.info, args=("from worker",))
+            worker.start()
+            worker.join()
+            self.assertEqual(self.stream.getvalue(), "from worker\n")
+        self.assertEqual(self.stream.getvalue(), "from worker\nbuffered\n")
+    
+    def test_nested_buffers_keep_order(self):
+        """Test that an inner buffer hands its lines to the outer one."""
+        from core.display_buffer import DisplayBuffer
+        
+        outer_lg, inner_lg = self.loggers
+        with DisplayBuffer(outer_lg):
+            outer_lg.info("A")
+            with DisplayBuffer(inner_lg):
+                inner_lg.info("B")
+                outer_lg.info("C")
+            self.assertEqual(self.stream.getvalue(), "")
+            outer_lg.info("D")
+        self.assertEqual(self.stream.getvalue(), "A\nB\nC\nD\n")
+        
+        # Both filters were removed on exit
+        outer_lg.info("E")
+        inner_lg.info("F")
+        self.assertTrue(self.stream.getvalue().endswith("E\nF\n"))
+    
+    def test_exception_info_kept(self):
+        """Test that exc_info on a buffered record still renders the traceback."""
+        from core.display_buffer import DisplayBuffer
+        
+        lg = self.loggers[0]
+        with DisplayBuffer(lg):
+            try:
+                raise ValueError("boom")
+            except ValueError:
+                lg.error("failed", exc_info=True)
+        output = self.stream.getvalue()
+        self.assertIn("Traceback", output)
+        self.assertIn("ValueError: boom", output)
+
+class TestRollChainFetch(unittest.TestCase):
+    """Test that a failed batched chain fetch doesn't block other rolls."""
+    
+    def setUp(self):
+        self.client = Mock()
+        self.client.get_option_snapshot.side_effect = (
+            lambda symbols: {s: Mock() for s in symbols}
+        )
+    
+    def test_batch_success(self):
+        """Test that one batched request covers every underlying."""
+        from core.rolling import fetch_roll_chains
+        
+        self.client.get_options_contracts.return_value = [
+            Mock(symbol="AAA250117P00050000", underlying_symbol="AAA"),
+        ]
+        contracts, snapshots = fetch_roll_chains(self.client, ["AAA", "BBB"])
+        
+        self.client.get_options_contracts.assert_called_once_with(["AAA", "BBB"], 'put')
+        self.assertEqual(len(contracts["AAA"]), 1)
+        self.assertEqual(contracts["BBB"], [])
+        self.assertIn("AAA250117P00050000", snapshots)
+    
+    def test_falls_back_per_underlying(self):
+        """Test that a failed batch retries each underlying and skips the bad one."""
+        from core.rolling import fetch_roll_chains
+        
+        def get_options_contracts(underlyings, contract_type):
+            if len(underlyings) > 1 or underlyings == ["BAD"]:
+                raise ConnectionError("API unavailable")
+            return [Mock(symbol=f"{underlyings[0]}250117P00050000",
+                         underlying_symbol=underlyings[0])]
+        
+        self.client.get_options_contracts.side_effect = get_options_contracts
+        contracts, snapshots = fetch_roll_chains(self.client, ["AAA", "BAD", "CCC"])
+        
+        self.assertEqual(sorted(contracts), ["AAA", "CCC"])
+        self.assertIn("AAA250117P00050000", snapshots)
+        self.assertIn("CCC250117P00050000", snapshots)
+
+class TestDisplayUnparsedSymbols(unittest.TestCase):
+    """Test that option symbols the parser rejects still render."""
+    
+    def setUp(self):
+        from types import SimpleNamespace
+        from alpaca.trading.enums import AssetClass
+        
+        self.positions = [SimpleNamespace(
+            symbol="NOTANOCCSYMBOL", asset_class=AssetClass.US_OPTION, qty="-1",
+            avg_entry_price="1.50", current_price="1.00", market_value="-100.00",
+            unrealized_pl="50.00", unrealized_plpc="0.33", cost_basis="150.00", side="short"
+        )]
+    
+    def test_displays_render_unparsed_row(self):
+        """Test that each display shows the raw symbol instead of raising."""
+        from core import elite_display, position_display, professional_display
+        
+        displays = [
+            (elite_display.display_positions_elite, elite_display.logger),
+            (position_display.display_positions, position_display.logger),
+            (professional_display.display_positions_professional, professional_display.logger),
+        ]
+        for display, lg in displays:
+            with self.assertLogs(lg, level='INFO') as logs:
+                display(self.positions, {}, {})
+            self.assertIn("NOTANOCCSYMBOL", "\n".join(logs.output))
+
 def run_tests():
     """Run all tests."""
     loader = unittest.TestLoader()
@@ -342,6 +802,13 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestThreadSafeStateManager))
     suite.addTests(loader.loadTestsFromTestCase(TestDatabaseThreadSafety))
     suite.addTests(loader.loadTestsFromTestCase(TestBrokerClientValidation))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderManagerConcurrency))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderManagerTradeUpdates))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderManagerExpiry))
+    suite.addTests(loader.loadTestsFromTestCase(TestOrderManagerQuoteCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestDisplayBuffer))
+    suite.addTests(loader.loadTestsFromTestCase(TestDisplayUnparsedSymbols))
+    suite.addTests(loader.loadTestsFromTestCase(TestRollChainFetch))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
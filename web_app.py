@@ -24,6 +24,8 @@ from core.thread_safe_manager import ThreadSafeStateManager
 from core.order_manager import OrderManager
 from core.execution_limit import sell_puts_limit, sell_calls_limit, update_filled_orders
 from core.rolling import process_rolls
+from core.utils import parse_option_symbol, parse_option_expiration
+from alpaca.trading.enums import AssetClass
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -60,6 +62,7 @@ def initialize_components():
     db = WheelDatabase()
     state_manager = ThreadSafeStateManager()
     order_manager = OrderManager(client, update_interval=20, max_order_age=1)
+    order_manager.start_stream()
     
     logger.info("Trading components initialized")
 
@@ -78,10 +81,10 @@ def get_account_data():
     """Get current account data"""
     try:
         account = client.get_account()
-        actual_balance = client.get_non_margin_buying_power()
+        actual_balance = client.get_non_margin_buying_power(account)
         balance_allocation = strategy_config.get_balance_allocation()
         allocated_balance = actual_balance * balance_allocation
-        options_buying_power = client.get_options_buying_power()
+        options_buying_power = client.get_options_buying_power(account)
         
         # Calculate daily P&L
         daily_pl = 0
@@ -114,17 +117,13 @@ def get_positions_data():
     """Get current positions data"""
     try:
         positions = client.get_positions()
-        states = state_manager.update_state(positions)
-        position_counts = state_manager.count_positions_by_symbol(positions)
+        _, position_counts, states = state_manager.refresh(positions)
         
         formatted_positions = []
         
         for p in positions:
-            from alpaca.trading.enums import AssetClass
-            
             if p.asset_class == AssetClass.US_OPTION:
                 # Parse option symbol
-                from core.utils import parse_option_symbol
                 underlying, option_type, strike = parse_option_symbol(p.symbol)
                 
                 qty = abs(int(p.qty))
@@ -140,16 +139,10 @@ def get_positions_data():
                 exp_date_str = None
                 dte = None
                 try:
-                    # Extract date portion after underlying symbol
-                    date_part = p.symbol[len(underlying):len(underlying)+6]  # YYMMDD format
-                    if len(date_part) == 6 and date_part.isdigit():
-                        year = 2000 + int(date_part[:2])
-                        month = int(date_part[2:4])
-                        day = int(date_part[4:6])
-                        exp_date = datetime(year, month, day).date()
-                        exp_date_str = exp_date.strftime('%m/%d/%y')
-                        dte = (exp_date - datetime.now().date()).days
-                except:
+                    exp_date = parse_option_expiration(p.symbol)
+                    exp_date_str = exp_date.strftime('%m/%d/%y')
+                    dte = (exp_date - datetime.now().date()).days
+                except ValueError:
                     pass
                 
                 formatted_positions.append({
@@ -168,7 +161,7 @@ def get_positions_data():
                     'dte': dte
                 })
             elif p.asset_class == AssetClass.US_EQUITY:
-                state = states.get(p.symbol, {})
+                state = states.get(p.symbol)
                 formatted_positions.append({
                     'symbol': p.symbol,
                     'type': 'stock',
@@ -177,13 +170,13 @@ def get_positions_data():
                     'current_price': float(p.current_price) if p.current_price else 0,
                     'market_value': float(p.market_value),
                     'unrealized_pl': float(p.unrealized_pl) if p.unrealized_pl else 0,
-                    'state': state.get('type', 'holding'),
+                    'state': state.type if state else 'holding',
                     'pl_percentage': 0  # Calculate if needed
                 })
         
         return {
             'positions': formatted_positions,
-            'states': states,
+            'states': {symbol: state.to_dict() for symbol, state in states.items()},
             'counts': position_counts
         }
     except Exception as e:
@@ -197,7 +190,7 @@ def get_pending_orders_data():
         
         formatted_orders = []
         for order in pending:
-            age_seconds = (datetime.now() - order.created_at).total_seconds()
+            age_seconds = time.monotonic() - order.created_at
             formatted_orders.append({
                 'id': order.order_id,
                 'underlying': order.underlying,
@@ -313,7 +306,8 @@ def get_strategy_status():
     try:
         symbols = strategy_config.get_enabled_symbols()
         max_layers = strategy_config.get_max_wheel_layers()
-        
+        filters = strategy_config.get_option_filters()
+
         symbol_status = []
         for symbol in symbols:
             pos_count = state_manager.get_position_count(symbol)
@@ -338,10 +332,10 @@ def get_strategy_status():
             'config': {
                 'allocation_percentage': strategy_config.get_balance_allocation() * 100,
                 'max_wheel_layers': max_layers,
-                'delta_min': strategy_config.get_option_filters()['delta_min'],
-                'delta_max': strategy_config.get_option_filters()['delta_max'],
-                'dte_min': strategy_config.get_option_filters()['expiration_min_days'],
-                'dte_max': strategy_config.get_option_filters()['expiration_max_days']
+                'delta_min': filters['delta_min'],
+                'delta_max': filters['delta_max'],
+                'dte_min': filters['expiration_min_days'],
+                'dte_max': filters['expiration_max_days']
             }
         }
     except Exception as e:
@@ -392,45 +386,45 @@ def run_strategy_cycle():
             socketio.emit('roll_executed', {'count': rolls_executed})
         
         # Update state
-        states = state_manager.update_state(positions)
-        position_counts = state_manager.count_positions_by_symbol(positions)
+        _, position_counts, states = state_manager.refresh(positions)
+        
+        # Long shares without a pending call order get a covered call
+        pending_calls = {o.underlying for o in order_manager.get_pending_orders() if o.order_type == 'call'}
+        uncovered = [(symbol, state) for symbol, state in states.items()
+                     if state.type == "long_shares" and symbol not in pending_calls]
+        
+        # Track in database if needed, in one transaction
+        tracked = db.get_open_symbols('stock')
+        db.add_positions_bulk([
+            {'symbol': symbol, 'position_type': 'stock', 'quantity': state.qty, 'entry_price': state.price}
+            for symbol, state in uncovered
+            if symbol not in tracked
+        ])
         
         # Sell calls on long shares
-        for symbol, state in states.items():
-            if state["type"] == "long_shares":
-                pending_calls = [o for o in order_manager.get_pending_orders() 
-                               if o.underlying == symbol and o.order_type == 'call']
-                
-                if not pending_calls:
-                    emit_log('info', f'{symbol}: Found {state["qty"]} shares, preparing covered call')
-                    
-                    # Track in database if needed
-                    existing = db.get_position_history(symbol, 'stock', 'open')
-                    if not existing:
-                        db.add_position(symbol, 'stock', state["qty"], state["price"])
-                    
-                    # Sell covered call
-                    order_id = sell_calls_limit(client, order_manager, symbol, 
-                                               state["price"], state["qty"], db, None)
-                    if order_id:
-                        emit_log('success', f'{symbol}: Covered CALL order placed', True)
-                        socketio.emit('order_placed', {
-                            'type': 'call',
-                            'symbol': symbol,
-                            'order_id': order_id
-                        })
+        for symbol, state in uncovered:
+            emit_log('info', f'{symbol}: Found {state.qty} shares, preparing covered call')
+            
+            # Sell covered call
+            order_id = sell_calls_limit(client, order_manager, symbol, 
+                                       state.price, state.qty, db, None)
+            if order_id:
+                emit_log('success', f'{symbol}: Covered CALL order placed', True)
+                socketio.emit('order_placed', {
+                    'type': 'call',
+                    'symbol': symbol,
+                    'order_id': order_id
+                })
         
         # Determine allowed symbols for puts
         allowed_symbols = []
         max_layers = strategy_config.get_max_wheel_layers()
         
+        # Symbols that already have a pending put order are skipped
+        pending_puts = {o.underlying for o in order_manager.get_pending_orders() if o.order_type == 'put'}
         for symbol in SYMBOLS:
-            if state_manager.is_position_allowed(symbol, max_layers):
-                pending_puts = [o for o in order_manager.get_pending_orders() 
-                              if o.underlying == symbol and o.order_type == 'put']
-                
-                if not pending_puts:
-                    allowed_symbols.append(symbol)
+            if state_manager.is_position_allowed(symbol, max_layers) and symbol not in pending_puts:
+                allowed_symbols.append(symbol)
         
         # Sell puts if possible
         buying_power = account_data['buying_power']